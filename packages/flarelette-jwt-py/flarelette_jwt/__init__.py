@@ -5,6 +5,8 @@ This package provides utilities for JWT signing, verification, and management.
 It includes support for both symmetric (HS512) and asymmetric (EdDSA) algorithms.
 """
 
+from .authz import CompiledPolicy, PermissionRegistry
+from .backend import CryptoBackend, get_crypto_backend, set_crypto_backend
 from .env import (
     ActorClaim,
     AlgType,
@@ -16,6 +18,7 @@ from .env import (
     common,
     mode,
     profile,
+    refresh_env_config,
 )
 from .explicit import (
     AuthUser as AuthUserWithConfig,
@@ -23,6 +26,7 @@ from .explicit import (
 from .explicit import (
     AuthzOptsWithConfig,
     BaseJwtConfig,
+    BatchVerifyResult,
     EdDSASignConfig,
     EdDSAVerifyConfig,
     ES512VerifyConfig,
@@ -30,7 +34,11 @@ from .explicit import (
     JWKSUrlVerifyConfig,
     SignConfig,
     VerifyConfig,
+    VerifyFailure,
+    VerifyStrategy,
     check_auth_with_config,
+    check_auth_with_config_sync,
+    clear_key_cache,
     create_delegated_token_with_config,
     create_eddsa_sign_config,
     create_eddsa_verify_config,
@@ -38,14 +46,31 @@ from .explicit import (
     create_hs512_config,
     create_jwks_url_verify_config,
     create_token_with_config,
+    sign_many_with_config,
     sign_with_config,
+    sign_with_config_sync,
+    verify_many,
     verify_with_config,
+    verify_with_config_sync,
 )
-from .high import AuthUser, check_auth, create_delegated_token, create_token, policy
+from .high import (
+    AuthUser,
+    check_auth,
+    check_auth_sync,
+    create_delegated_token,
+    create_delegated_tokens_for_audiences,
+    create_token,
+    create_tokens_for_audiences,
+    policy,
+)
+from .jwks import clear_jwks_cache
 from .secret import generate_secret, is_valid_base64url_secret
-from .sign import sign
+from .sign import sign, sign_many, sign_sync
+from .template import TokenTemplate
+from .token_cache import DelegatedTokenCache, VerifiedTokenCache
+from .token_manager import TokenManager
 from .util import ParsedJwt, is_expiring_soon, map_scopes_to_permissions, parse
-from .verify import verify
+from .verify import verify, verify_sync
 
 __version__ = "1.11.0"
 
@@ -69,26 +94,44 @@ __all__ = [
     "JWKSUrlVerifyConfig",
     "SignConfig",
     "VerifyConfig",
+    "VerifyStrategy",
+    "VerifyFailure",
+    "BatchVerifyResult",
     "AuthzOptsWithConfig",
     "AuthUserWithConfig",
+    "CompiledPolicy",
+    "PermissionRegistry",
     # Environment-based functions
     "common",
     "mode",
     "profile",
+    "refresh_env_config",
     "check_auth",
     "create_token",
     "create_delegated_token",
+    "create_tokens_for_audiences",
+    "create_delegated_tokens_for_audiences",
     "policy",
     "generate_secret",
     "is_valid_base64url_secret",
     "sign",
+    "sign_many",
     "is_expiring_soon",
     "map_scopes_to_permissions",
     "parse",
     "verify",
+    # Synchronous (native backend) functions
+    "sign_sync",
+    "verify_sync",
+    "check_auth_sync",
+    "sign_with_config_sync",
+    "verify_with_config_sync",
+    "check_auth_with_config_sync",
     # Explicit config functions
     "sign_with_config",
+    "sign_many_with_config",
     "verify_with_config",
+    "verify_many",
     "create_token_with_config",
     "create_delegated_token_with_config",
     "check_auth_with_config",
@@ -97,4 +140,15 @@ __all__ = [
     "create_eddsa_verify_config",
     "create_es512_verify_config",
     "create_jwks_url_verify_config",
+    "TokenTemplate",
+    "TokenManager",
+    # Crypto backends
+    "CryptoBackend",
+    "get_crypto_backend",
+    "set_crypto_backend",
+    # Cache management
+    "VerifiedTokenCache",
+    "DelegatedTokenCache",
+    "clear_key_cache",
+    "clear_jwks_cache",
 ]
@@ -8,14 +8,64 @@ for use with the Flarelette JWT library.
 
 """
 
+from __future__ import annotations
+
 import os
-from collections.abc import Mapping
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+from .env import _env_bindings, refresh_env_config
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping
+    from contextvars import Token
 
 
 def apply_env_bindings(env: Mapping[str, str]) -> None:
     """Copy a Cloudflare Worker `env` mapping into os.environ so the kit can read it.
     This is useful on edge where traditional process envs don't exist.
+
+    Only values that differ from os.environ are written, and the compiled JWT
+    configuration is swapped in one step when anything changed.
     """
+    changed = False
     for k, v in env.items():
-        if isinstance(v, str):
+        if isinstance(v, str) and os.environ.get(k) != v:
             os.environ[k] = v
+            changed = True
+    if changed:
+        refresh_env_config()
+
+
+def bind_env(env: Mapping[str, Any]) -> Token[Mapping[str, Any] | None]:
+    """Bind a Cloudflare Worker `env` mapping to the current context.
+
+    The kit reads JWT_* variables from the bound mapping before os.environ,
+    without copying anything into the process environment. Bindings are
+    context-local, so concurrent requests with different bindings do not see
+    each other's values. The configuration compiled for a mapping is reused
+    while the same mapping object is bound, so its values must not change.
+    Pass the returned token to unbind_env() to restore the previous bindings.
+    """
+    return _env_bindings.set(env)
+
+
+def unbind_env(token: Token[Mapping[str, Any] | None]) -> None:
+    """Restore the bindings that were active before the matching bind_env()."""
+    _env_bindings.reset(token)
+
+
+@contextmanager
+def env_bindings(env: Mapping[str, Any]) -> Iterator[None]:
+    """Scope a Worker `env` mapping to a block, typically one request.
+
+    Example:
+        >>> async def on_fetch(request, env):
+        ...     with env_bindings(env):
+        ...         user = await check_auth(token)
+    """
+    token = bind_env(env)
+    try:
+        yield
+    finally:
+        unbind_env(token)
@@ -0,0 +1,271 @@
+"""
+Compiled Authorization Policies
+
+This module provides CompiledPolicy, an immutable form of the requirements
+built by policy() or passed as AuthzOptsWithConfig. Requirement lists are
+frozen into sets and ordered once, so evaluating a policy per request does
+no list scans and no per-call set construction for the policy side.
+
+PermissionRegistry optionally maps known permission and role strings to bit
+positions; policies compiled against a registry evaluate as integer AND/OR
+on per-token bitmasks.
+
+The module also holds the authorization steps shared by check_auth() and
+check_auth_with_config(): prescreening an unverified token and building the
+AuthUser from a verified payload.
+
+@module authz
+
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, cast
+
+from .util import parse
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Mapping
+
+    from .env import JwtPayload
+    from .high import AuthUser
+
+# (payload claim, True for all-of / False for any-of, required values)
+_Check = tuple[str, bool, frozenset[str]]
+
+# (payload claim, True for all-of / False for any-of, required bits)
+_BitCheck = tuple[str, bool, int]
+
+DEFAULT_MASK_MEMO_SIZE = 1024
+
+
+def _claim_values(value: Any) -> tuple[str, ...]:
+    """Return a permissions or roles claim as a tuple of strings.
+
+    Anything but a list of strings holds no values, so a malformed claim
+    (e.g. ``5`` or ``[{}]``) fails every requirement instead of raising.
+    """
+    if isinstance(value, list) and all(isinstance(v, str) for v in value):
+        return tuple(value)
+    return ()
+
+
+class PermissionRegistry:
+    """Assigns bit positions to permission and role strings.
+
+    Each claim ("permissions", "roles") has its own namespace. Names are
+    registered up front or on demand when a policy is compiled against the
+    registry; bit positions never change once assigned. Values in a token
+    that are not registered get no bit, which is sound because every name a
+    compiled policy requires is registered.
+
+    Masks are memoized per distinct claim value list, so a token (or user)
+    seen before costs one dictionary lookup per claim.
+
+    Example:
+        >>> registry = PermissionRegistry(permissions=['read', 'write'])
+        >>> writers = policy().need_all('write').compile(registry=registry)
+
+    Attributes:
+        memo_size: Maximum number of memoized claim value lists
+    """
+
+    def __init__(
+        self,
+        permissions: Iterable[str] = (),
+        roles: Iterable[str] = (),
+        *,
+        memo_size: int = DEFAULT_MASK_MEMO_SIZE,
+    ) -> None:
+        if memo_size < 1:
+            raise ValueError("memo_size must be >= 1")
+        self.memo_size = memo_size
+        self._bits: dict[str, dict[str, int]] = {}
+        self._memo: dict[tuple[str, tuple[str, ...]], int] = {}
+        self._lock = threading.Lock()
+        self.bits("permissions", permissions)
+        self.bits("roles", roles)
+
+    def __len__(self) -> int:
+        return sum(len(names) for names in self._bits.values())
+
+    def bits(self, claim: str, names: Iterable[str]) -> int:
+        """Return the mask for names under claim, registering unknown ones."""
+        with self._lock:
+            table = self._bits.setdefault(claim, {})
+            mask = 0
+            for name in names:
+                bit = table.get(name)
+                if bit is None:
+                    bit = table[name] = 1 << len(table)
+                    # Memoized masks predate this bit and may lack it
+                    self._memo.clear()
+                mask |= bit
+            return mask
+
+    def mask(self, claim: str, values: Any) -> int:
+        """Return the bitmask of a token's claim values (unknown names ignored).
+
+        A claim that is not a list of strings has no bits set.
+        """
+        names = _claim_values(values)
+        if not names:
+            return 0
+        key = (claim, names)
+        mask = self._memo.get(key)
+        if mask is not None:
+            return mask
+        with self._lock:
+            table = self._bits.get(claim, {})
+            mask = 0
+            for value in key[1]:
+                mask |= table.get(value, 0)
+            if len(self._memo) >= self.memo_size:
+                self._memo.clear()
+            self._memo[key] = mask
+        return mask
+
+
+@dataclass(frozen=True)
+class CompiledPolicy:
+    """Immutable authorization policy, evaluated with set operations.
+
+    Compile once at import time, e.g. ``ADMIN = policy().roles_any('admin')
+    .compile()``, and pass it to check_auth(policy=...) or as the authz_opts
+    of check_auth_with_config(). Requirement checks run cheapest first
+    (fewest required values, roles before permissions on ties); custom
+    predicates always run last, in the order they were added.
+
+    Attributes:
+        require_all_permissions: All permissions that must be present
+        require_any_permission: At least one of these permissions must be present
+        require_roles_all: All roles that must be present
+        require_roles_any: At least one of these roles must be present
+        predicates: Custom validation functions
+        registry: Optional PermissionRegistry; when set, requirements are
+            evaluated as bitmask AND/OR instead of set operations
+    """
+
+    require_all_permissions: frozenset[str] = frozenset()
+    require_any_permission: frozenset[str] = frozenset()
+    require_roles_all: frozenset[str] = frozenset()
+    require_roles_any: frozenset[str] = frozenset()
+    predicates: tuple[Callable[[JwtPayload], bool], ...] = ()
+    registry: PermissionRegistry | None = field(default=None, repr=False, compare=False)
+    _checks: tuple[_Check, ...] = field(init=False, repr=False, compare=False)
+    _bit_checks: tuple[_BitCheck, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        checks: list[_Check] = [
+            ("roles", True, self.require_roles_all),
+            ("roles", False, self.require_roles_any),
+            ("permissions", True, self.require_all_permissions),
+            ("permissions", False, self.require_any_permission),
+        ]
+        # sorted() is stable, so equal sizes keep the roles-first order above
+        ordered = sorted((c for c in checks if c[2]), key=lambda c: len(c[2]))
+        object.__setattr__(self, "_checks", tuple(ordered))
+        bit_checks: tuple[_BitCheck, ...] = ()
+        if self.registry is not None:
+            bit_checks = tuple(
+                (claim, require_all, self.registry.bits(claim, required))
+                for claim, require_all, required in ordered
+            )
+        object.__setattr__(self, "_bit_checks", bit_checks)
+
+    @property
+    def has_requirements(self) -> bool:
+        """True if any permission or role requirement is set."""
+        return bool(self._checks)
+
+    @classmethod
+    def from_options(
+        cls, opts: Mapping[str, Any], registry: PermissionRegistry | None = None
+    ) -> CompiledPolicy:
+        """Compile a policy().build() dict or AuthzOptsWithConfig.
+
+        Args:
+            opts: Requirement lists and predicates
+            registry: Optional PermissionRegistry to evaluate with bitmasks
+        """
+        return cls(
+            require_all_permissions=frozenset(
+                opts.get("require_all_permissions") or ()
+            ),
+            require_any_permission=frozenset(opts.get("require_any_permission") or ()),
+            require_roles_all=frozenset(opts.get("require_roles_all") or ()),
+            require_roles_any=frozenset(opts.get("require_roles_any") or ()),
+            predicates=tuple(opts.get("predicates") or ()),
+            registry=registry,
+        )
+
+    def meets_requirements(self, payload: JwtPayload) -> bool:
+        """Check the permission and role requirements only (no predicates)."""
+        claims = cast("Mapping[str, Any]", payload)
+        if self.registry is not None:
+            return self._meets_bit_requirements(self.registry, claims)
+        have: dict[str, frozenset[Any]] = {}
+        for claim, require_all, required in self._checks:
+            values = have.get(claim)
+            if values is None:
+                values = have[claim] = frozenset(_claim_values(claims.get(claim)))
+            if require_all:
+                if not required <= values:
+                    return False
+            elif required.isdisjoint(values):
+                return False
+        return True
+
+    def _meets_bit_requirements(
+        self, registry: PermissionRegistry, claims: Mapping[str, Any]
+    ) -> bool:
+        masks: dict[str, int] = {}
+        for claim, require_all, required in self._bit_checks:
+            mask = masks.get(claim)
+            if mask is None:
+                mask = masks[claim] = registry.mask(claim, claims.get(claim))
+            if require_all:
+                if mask & required != required:
+                    return False
+            elif not mask & required:
+                return False
+        return True
+
+    def allows(self, payload: JwtPayload) -> bool:
+        """Return True if a verified payload satisfies the whole policy."""
+        if not self.meets_requirements(payload):
+            return False
+        return all(fn(payload) for fn in self.predicates)
+
+
+def _authorize(payload: JwtPayload, rules: CompiledPolicy | None) -> AuthUser | None:
+    """Apply a policy to a verified payload, building the AuthUser on success."""
+    if rules is not None and not rules.allows(payload):
+        return None
+    return {
+        "sub": payload.get("sub"),
+        "permissions": list(_claim_values(payload.get("permissions"))),
+        "roles": list(_claim_values(payload.get("roles"))),
+        "jti": payload.get("jti"),
+        "payload": payload,
+    }
+
+
+def _prescreen(token: str, rules: CompiledPolicy | None) -> bool:
+    """Check permission and role requirements against the unverified payload.
+
+    A policy can only deny, so a token failing here would fail after
+    verification too. Predicates are not run: they may rely on verified
+    claims or have side effects.
+    """
+    if rules is None or not rules.has_requirements:
+        return True
+    try:
+        payload = parse(token)["payload"]
+    except Exception:
+        return False  # Malformed; verification would reject it anyway
+    if not isinstance(payload, dict):
+        return False
+    return rules.meets_requirements(payload)
@@ -0,0 +1,409 @@
+"""
+Crypto Backends for JWT Signing and Verification
+
+This module provides the crypto backends used by sign, verify and the explicit
+configuration API. The WebCrypto backend is used inside Cloudflare Workers
+(Pyodide); the native backend uses the standard library `hmac`/`hashlib`
+modules (and `cryptography` for asymmetric algorithms, when installed) and is
+selected automatically on regular CPython hosts.
+
+@module backend
+
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import importlib
+import sys
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any, Literal, Protocol
+
+if TYPE_CHECKING:
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+KeyUsage = Literal["sign", "verify"]
+
+
+class CryptoBackend(Protocol):
+    """Crypto primitives needed for JWT operations.
+
+    Keys returned by the import methods are opaque to callers and are only
+    passed back to the same backend, so each backend can pre-compute whatever
+    state makes the subsequent operations cheap.
+    """
+
+    name: str
+
+    async def import_hmac_key(self, secret: bytes, usage: KeyUsage) -> Any: ...
+
+    async def hmac_sign(self, key: Any, data: bytes) -> bytes: ...
+
+    async def hmac_verify(self, key: Any, sig: bytes, data: bytes) -> bool: ...
+
+    async def import_verify_key(self, alg: str, jwk: dict[str, Any]) -> Any: ...
+
+    async def verify(self, key: Any, sig: bytes, data: bytes) -> bool: ...
+
+    async def import_sign_key(self, alg: str, jwk: dict[str, Any]) -> Any: ...
+
+    async def sign(self, key: Any, data: bytes) -> bytes: ...
+
+
+def _b64url_decode(s: str) -> bytes:
+    """Decode base64url string (with or without padding)."""
+    return base64.urlsafe_b64decode(s + "=" * (-len(s) % 4))
+
+
+def _ecdsa_curve_name(alg: str) -> str:
+    curves = {
+        "ES256": "P-256",
+        "ES384": "P-384",
+        "ES512": "P-521",
+    }
+    return curves[alg]
+
+
+def _hash_name(alg: str) -> str:
+    hashes = {
+        "RS256": "SHA-256",
+        "RS384": "SHA-384",
+        "RS512": "SHA-512",
+        "ES256": "SHA-256",
+        "ES384": "SHA-384",
+        "ES512": "SHA-512",
+    }
+    return hashes[alg]
+
+
+def _check_eddsa_private_jwk(alg: str, jwk: dict[str, Any]) -> None:
+    if alg != "EdDSA":
+        raise ValueError(f"Unsupported signing algorithm: {alg}")
+    # WebCrypto needs the public half (x) to import an Ed25519 private JWK
+    if (
+        jwk.get("kty") != "OKP"
+        or jwk.get("crv") != "Ed25519"
+        or not jwk.get("d")
+        or not jwk.get("x")
+    ):
+        raise ValueError("EdDSA private JWK must be an Ed25519 key with d and x")
+
+
+def _js_object(value: dict[str, Any]) -> Any:
+    """Convert a dict to a plain JS object on Pyodide.
+
+    to_js() turns dicts into JS Maps by default, whose entries importKey()
+    does not read as JsonWebKey members.
+    """
+    try:
+        from js import Object  # noqa: PLC0415
+        from pyodide.ffi import to_js  # noqa: PLC0415
+    except ImportError:
+        return value
+    return to_js(value, dict_converter=Object.fromEntries)
+
+
+class WebCryptoBackend:
+    """WebCrypto (crypto.subtle) backend for the Workers/Pyodide runtime."""
+
+    name = "webcrypto"
+
+    async def import_hmac_key(self, secret: bytes, usage: KeyUsage) -> Any:
+        from js import crypto  # noqa: PLC0415
+
+        return await crypto.subtle.importKey(
+            "raw",
+            secret,
+            {"name": "HMAC", "hash": "SHA-512"},
+            False,
+            [usage],
+        )
+
+    async def hmac_sign(self, key: Any, data: bytes) -> bytes:
+        from js import crypto  # noqa: PLC0415
+        from pyodide.ffi import to_py  # noqa: PLC0415
+
+        sig = await crypto.subtle.sign({"name": "HMAC"}, key, data)
+        return bytes(to_py(sig))
+
+    async def hmac_verify(self, key: Any, sig: bytes, data: bytes) -> bool:
+        from js import crypto  # noqa: PLC0415
+
+        return bool(await crypto.subtle.verify({"name": "HMAC"}, key, sig, data))
+
+    async def import_verify_key(
+        self, alg: str, jwk: dict[str, Any]
+    ) -> tuple[Any, dict[str, str]]:
+        from js import crypto  # noqa: PLC0415
+
+        if alg == "EdDSA":
+            x_b64 = jwk.get("x")
+            if not x_b64:
+                raise ValueError("EdDSA public JWK must include x")
+            key = await crypto.subtle.importKey(
+                "raw", _b64url_decode(x_b64), {"name": "Ed25519"}, False, ["verify"]
+            )
+            return key, {"name": "Ed25519"}
+
+        if alg.startswith("RS"):
+            key = await crypto.subtle.importKey(
+                "jwk",
+                _js_object(jwk),
+                {"name": "RSASSA-PKCS1-v1_5", "hash": _hash_name(alg)},
+                False,
+                ["verify"],
+            )
+            return key, {"name": "RSASSA-PKCS1-v1_5"}
+
+        if alg.startswith("ES"):
+            key = await crypto.subtle.importKey(
+                "jwk",
+                _js_object(jwk),
+                {"name": "ECDSA", "namedCurve": _ecdsa_curve_name(alg)},
+                False,
+                ["verify"],
+            )
+            return key, {"name": "ECDSA", "hash": _hash_name(alg)}
+
+        raise ValueError(f"Unsupported verification algorithm: {alg}")
+
+    async def verify(
+        self, key: tuple[Any, dict[str, str]], sig: bytes, data: bytes
+    ) -> bool:
+        from js import crypto  # noqa: PLC0415
+
+        crypto_key, algorithm = key
+        return bool(await crypto.subtle.verify(algorithm, crypto_key, sig, data))
+
+    async def import_sign_key(self, alg: str, jwk: dict[str, Any]) -> Any:
+        from js import crypto  # noqa: PLC0415
+
+        _check_eddsa_private_jwk(alg, jwk)
+        return await crypto.subtle.importKey(
+            "jwk", _js_object(jwk), {"name": "Ed25519"}, False, ["sign"]
+        )
+
+    async def sign(self, key: Any, data: bytes) -> bytes:
+        from js import crypto  # noqa: PLC0415
+        from pyodide.ffi import to_py  # noqa: PLC0415
+
+        sig = await crypto.subtle.sign({"name": "Ed25519"}, key, data)
+        return bytes(to_py(sig))
+
+
+# Pre-loaded native verification key: checks (signature, signing input)
+NativeVerifyKey = Callable[[bytes, bytes], bool]
+
+_NATIVE_INSTALL_HINT = (
+    "Native asymmetric verification requires the 'cryptography' package: "
+    "pip install 'flarelette-jwt[native]'"
+)
+_NATIVE_SIGN_INSTALL_HINT = (
+    "Native EdDSA signing requires the 'cryptography' package: "
+    "pip install 'flarelette-jwt[native]'"
+)
+
+# JOSE curve names and coordinate sizes (bytes) for ES* algorithms
+_ES_CURVES = {
+    "ES256": ("P-256", 32),
+    "ES384": ("P-384", 48),
+    "ES512": ("P-521", 66),
+}
+
+
+class NativeBackend:
+    """Standard-library backend for CPython hosts outside Workers.
+
+    HS512 keys are pre-keyed `hmac` objects: importing runs the HMAC key
+    schedule once and each operation only copies that state. Asymmetric keys
+    (EdDSA, ES*, RS*) and Ed25519 signing keys are loaded once into
+    `cryptography` key objects, which requires the optional `native` extra.
+    """
+
+    name = "native"
+
+    async def import_hmac_key(self, secret: bytes, usage: KeyUsage) -> Any:
+        return self.import_hmac_key_sync(secret, usage)
+
+    async def hmac_sign(self, key: Any, data: bytes) -> bytes:
+        return self.hmac_sign_sync(key, data)
+
+    async def hmac_verify(self, key: Any, sig: bytes, data: bytes) -> bool:
+        return self.hmac_verify_sync(key, sig, data)
+
+    async def import_verify_key(self, alg: str, jwk: dict[str, Any]) -> Any:
+        return self.import_verify_key_sync(alg, jwk)
+
+    async def verify(self, key: Any, sig: bytes, data: bytes) -> bool:
+        return self.verify_sync(key, sig, data)
+
+    async def import_sign_key(self, alg: str, jwk: dict[str, Any]) -> Any:
+        return self.import_sign_key_sync(alg, jwk)
+
+    async def sign(self, key: Any, data: bytes) -> bytes:
+        return self.sign_sync(key, data)
+
+    def import_hmac_key_sync(
+        self, secret: bytes, usage: KeyUsage  # noqa: ARG002
+    ) -> hmac.HMAC:
+        # HMAC keys are symmetric, so one key object serves both usages
+        return hmac.new(secret, digestmod=hashlib.sha512)
+
+    def hmac_sign_sync(self, key: hmac.HMAC, data: bytes) -> bytes:
+        mac = key.copy()
+        mac.update(data)
+        return mac.digest()
+
+    def hmac_verify_sync(self, key: hmac.HMAC, sig: bytes, data: bytes) -> bool:
+        return hmac.compare_digest(self.hmac_sign_sync(key, data), sig)
+
+    def import_verify_key_sync(self, alg: str, jwk: dict[str, Any]) -> NativeVerifyKey:
+        try:
+            from cryptography.exceptions import InvalidSignature  # noqa: PLC0415
+            from cryptography.hazmat.primitives import hashes  # noqa: PLC0415
+            from cryptography.hazmat.primitives.asymmetric import (  # noqa: PLC0415
+                ec,
+                padding,
+                rsa,
+            )
+            from cryptography.hazmat.primitives.asymmetric.ed25519 import (  # noqa: PLC0415
+                Ed25519PublicKey,
+            )
+            from cryptography.hazmat.primitives.asymmetric.utils import (  # noqa: PLC0415
+                encode_dss_signature,
+            )
+        except ImportError as exc:
+            raise RuntimeError(_NATIVE_INSTALL_HINT) from exc
+
+        hash_algs: dict[str, hashes.HashAlgorithm] = {
+            "SHA-256": hashes.SHA256(),
+            "SHA-384": hashes.SHA384(),
+            "SHA-512": hashes.SHA512(),
+        }
+
+        if alg == "EdDSA":
+            x_b64 = jwk.get("x")
+            if not x_b64 or jwk.get("crv", "Ed25519") != "Ed25519":
+                raise ValueError("EdDSA public JWK must be an Ed25519 key with x")
+            ed_key = Ed25519PublicKey.from_public_bytes(_b64url_decode(x_b64))
+
+            def verify_eddsa(sig: bytes, data: bytes) -> bool:
+                try:
+                    ed_key.verify(sig, data)
+                except InvalidSignature:
+                    return False
+                return True
+
+            return verify_eddsa
+
+        if alg in ("RS256", "RS384", "RS512"):
+            if jwk.get("kty") != "RSA" or not jwk.get("n") or not jwk.get("e"):
+                raise ValueError("RSA public JWK must include n and e")
+            rsa_key = rsa.RSAPublicNumbers(
+                int.from_bytes(_b64url_decode(jwk["e"]), "big"),
+                int.from_bytes(_b64url_decode(jwk["n"]), "big"),
+            ).public_key()
+            rsa_padding = padding.PKCS1v15()
+            rsa_hash = hash_algs[_hash_name(alg)]
+
+            def verify_rsa(sig: bytes, data: bytes) -> bool:
+                try:
+                    rsa_key.verify(sig, data, rsa_padding, rsa_hash)
+                except InvalidSignature:
+                    return False
+                return True
+
+            return verify_rsa
+
+        if alg in _ES_CURVES:
+            crv, size = _ES_CURVES[alg]
+            if jwk.get("kty") != "EC" or jwk.get("crv") != crv:
+                raise ValueError(f"{alg} public JWK must be an EC key on {crv}")
+            curves: dict[str, ec.EllipticCurve] = {
+                "P-256": ec.SECP256R1(),
+                "P-384": ec.SECP384R1(),
+                "P-521": ec.SECP521R1(),
+            }
+            ec_key = ec.EllipticCurvePublicKey.from_encoded_point(
+                curves[crv],
+                b"\x04"
+                + _b64url_decode(jwk["x"]).rjust(size, b"\0")
+                + _b64url_decode(jwk["y"]).rjust(size, b"\0"),
+            )
+            ecdsa = ec.ECDSA(hash_algs[_hash_name(alg)])
+
+            def verify_ecdsa(sig: bytes, data: bytes) -> bool:
+                # JOSE signatures are raw r || s; cryptography expects DER
+                if len(sig) != 2 * size:
+                    return False
+                der = encode_dss_signature(
+                    int.from_bytes(sig[:size], "big"), int.from_bytes(sig[size:], "big")
+                )
+                try:
+                    ec_key.verify(der, data, ecdsa)
+                except InvalidSignature:
+                    return False
+                return True
+
+            return verify_ecdsa
+
+        raise ValueError(f"Unsupported verification algorithm: {alg}")
+
+    def verify_sync(self, key: NativeVerifyKey, sig: bytes, data: bytes) -> bool:
+        return key(sig, data)
+
+    def import_sign_key_sync(self, alg: str, jwk: dict[str, Any]) -> Ed25519PrivateKey:
+        _check_eddsa_private_jwk(alg, jwk)
+        try:
+            from cryptography.hazmat.primitives.asymmetric.ed25519 import (  # noqa: PLC0415
+                Ed25519PrivateKey,
+            )
+        except ImportError as exc:
+            raise RuntimeError(_NATIVE_SIGN_INSTALL_HINT) from exc
+
+        return Ed25519PrivateKey.from_private_bytes(_b64url_decode(jwk["d"]))
+
+    def sign_sync(self, key: Ed25519PrivateKey, data: bytes) -> bytes:
+        return key.sign(data)
+
+
+WEBCRYPTO = WebCryptoBackend()
+NATIVE = NativeBackend()
+
+_backend_override: CryptoBackend | None = None
+# Set once importing `js` has failed, so CPython hosts do not retry the
+# (comparatively slow) failing import on every call
+_js_unavailable = False
+
+
+def _webcrypto_available() -> bool:
+    global _js_unavailable
+    module = sys.modules.get("js")
+    if module is None:
+        if _js_unavailable:
+            return False
+        try:
+            module = importlib.import_module("js")
+        except ImportError:
+            _js_unavailable = True
+            return False
+    return hasattr(module, "crypto")
+
+
+def get_crypto_backend() -> CryptoBackend:
+    """Get the crypto backend for the current runtime.
+
+    Returns the backend set with set_crypto_backend(), otherwise WebCrypto
+    when the Workers `js` module is available and the native backend elsewhere.
+    """
+    if _backend_override is not None:
+        return _backend_override
+    return WEBCRYPTO if _webcrypto_available() else NATIVE
+
+
+def set_crypto_backend(backend: CryptoBackend | None) -> None:
+    """Force a crypto backend, or pass None to restore automatic selection."""
+    global _backend_override
+    _backend_override = backend
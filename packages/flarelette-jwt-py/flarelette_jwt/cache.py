@@ -0,0 +1,61 @@
+"""
+Bounded In-Memory Caches
+
+This module provides the small LRU cache used to keep per-isolate state
+(imported CryptoKeys, fetched key sets) between requests.
+
+@module cache
+
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Generic, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class LruCache(Generic[K, V]):
+    """Least-recently-used mapping bounded by entry count.
+
+    Lookups refresh an entry's recency; inserting beyond ``max_entries``
+    evicts the least recently used entry. Not thread-safe: intended for the
+    single-threaded Workers isolate and asyncio event loops.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        self.max_entries = max_entries
+        self._data: OrderedDict[K, V] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def get(self, key: K) -> V | None:
+        """Return the cached value for key (marking it recently used), or None."""
+        try:
+            self._data.move_to_end(key)
+        except KeyError:
+            return None
+        return self._data[key]
+
+    def set(self, key: K, value: V) -> None:
+        """Insert or replace a value, evicting the oldest entry when full."""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def pop(self, key: K) -> V | None:
+        """Remove and return the value for key, or None if absent."""
+        return self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._data.clear()
@@ -9,9 +9,17 @@ It supports both symmetric (HS512) and asymmetric (EdDSA) algorithms.
 """
 
 import base64
+import hashlib
+import json
 import os
+from collections.abc import Mapping
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import cached_property
 from typing import Any, Literal, TypedDict
 
+from .cache import LruCache
+
 # JWT algorithm types
 # Only two algorithms supported by design:
 # - HS512: Symmetric signing for trusted producer-consumer pairs (shared secret)
@@ -138,32 +146,101 @@ class JwtCommonConfig(TypedDict):
     ttl_seconds: int
 
 
-def mode(role: str) -> AlgType:
-    """Detect JWT algorithm mode from environment variables based on role.
-
-    Args:
-        role: Either "producer" (signing) or "consumer" (verification)
-
-    Returns:
-        AlgType: Either "HS512" or "EdDSA"
+# Environment variables that make up the JWT configuration
+_ENV_VARS = (
+    "JWT_ISS",
+    "JWT_AUD",
+    "JWT_LEEWAY",
+    "JWT_TTL_SECONDS",
+    "JWT_SECRET",
+    "JWT_SECRET_NAME",
+    "JWT_PRIVATE_JWK",
+    "JWT_PRIVATE_JWK_NAME",
+    "JWT_PRIVATE_JWK_PATH",
+    "JWT_KID",
+    "JWT_PUBLIC_JWK",
+    "JWT_PUBLIC_JWK_NAME",
+    "JWT_JWKS_URL",
+    "JWT_JWKS_URL_NAME",
+    "JWT_JWKS_CACHE_TTL_SECONDS",
+)
+
+# *_NAME variables naming another variable that holds the actual value
+_INDIRECT_VARS = (
+    "JWT_SECRET_NAME",
+    "JWT_PRIVATE_JWK_NAME",
+    "JWT_PUBLIC_JWK_NAME",
+    "JWT_JWKS_URL_NAME",
+)
+
+
+# Request-scoped Worker env bindings, consulted before os.environ.
+# Set via adapters.env_bindings(); each asyncio task sees its own bindings.
+_env_bindings: ContextVar[Mapping[str, Any] | None] = ContextVar(
+    "flarelette_jwt_env_bindings", default=None
+)
+
+
+def _getenv(name: str) -> str | None:
+    bindings = _env_bindings.get()
+    if bindings is not None:
+        value = bindings.get(name)
+        if isinstance(value, str):
+            return value
+    return os.getenv(name)
+
+
+def _read_env() -> dict[str, str | None]:
+    """Read the raw values of every variable the JWT configuration depends on."""
+    values = {name: _getenv(name) for name in _ENV_VARS}
+    for name_var in _INDIRECT_VARS:
+        target = values[name_var]
+        if target and target not in values:
+            values[target] = _getenv(target)
+    return values
+
+
+@dataclass(frozen=True, eq=False)
+class EnvConfig:
+    """Immutable JWT configuration compiled from one snapshot of the environment.
+
+    Derived values (parsed integers, the decoded HS512 secret, the parsed
+    public JWK) are computed on first use and then reused for every token
+    signed or verified under the same environment. Configuration errors are
+    never cached, so they are raised on every access, as before.
     """
 
-    # Producers use private keys to sign
-    if role == "producer" and (
-        os.getenv("JWT_PRIVATE_JWK")
-        or os.getenv("JWT_PRIVATE_JWK_PATH")
-        or os.getenv("JWT_PRIVATE_JWK_NAME")
-    ):
-        return "EdDSA"
-
-    # Consumers use public keys or JWKS to verify
-    if role == "consumer":
-        has_hs512 = bool(os.getenv("JWT_SECRET") or os.getenv("JWT_SECRET_NAME"))
+    values: dict[str, str | None]
+
+    def get(self, name: str) -> str | None:
+        return self.values.get(name)
+
+    def _get_indirect(self, name_var: str, direct_var: str) -> str | None:
+        name = self.get(name_var)
+        if name and self.get(name):
+            return self.get(name)
+        return self.get(direct_var)
+
+    @cached_property
+    def producer_alg(self) -> AlgType:
+        # Producers use private keys to sign
+        if (
+            self.get("JWT_PRIVATE_JWK")
+            or self.get("JWT_PRIVATE_JWK_PATH")
+            or self.get("JWT_PRIVATE_JWK_NAME")
+        ):
+            return "EdDSA"
+        return "HS512"
+
+    @cached_property
+    def consumer_alg(self) -> AlgType:
+        # Consumers use public keys or JWKS to verify
+        has_hs512 = bool(self.get("JWT_SECRET") or self.get("JWT_SECRET_NAME"))
         has_asymmetric = bool(
-            os.getenv("JWT_PUBLIC_JWK")
-            or os.getenv("JWT_PUBLIC_JWK_NAME")
-            or os.getenv("JWT_JWKS_URL")
-            or os.getenv("JWT_JWKS_URL_NAME")
+            self.get("JWT_PUBLIC_JWK")
+            or self.get("JWT_PUBLIC_JWK_NAME")
+            or self.get("JWT_JWKS_URL")
+            or self.get("JWT_JWKS_URL_NAME")
         )
 
         if has_hs512 and has_asymmetric:
@@ -175,8 +252,163 @@ def mode(role: str) -> AlgType:
 
         if has_asymmetric:
             return "EdDSA"
+        return "HS512"
+
+    def mode(self, role: str) -> AlgType:
+        if role == "producer":
+            return self.producer_alg
+        if role == "consumer":
+            return self.consumer_alg
+        return "HS512"
+
+    def _get_default(self, name: str, default: str) -> str:
+        value = self.get(name)
+        return default if value is None else value
+
+    @cached_property
+    def common(self) -> JwtCommonConfig:
+        return {
+            "iss": self._get_default("JWT_ISS", ""),
+            "aud": self._get_default("JWT_AUD", ""),
+            "leeway": int(self._get_default("JWT_LEEWAY", "90")),
+            "ttl_seconds": int(self._get_default("JWT_TTL_SECONDS", "900")),
+        }
+
+    @cached_property
+    def hs_secret(self) -> bytes:
+        return _decode_hs_secret(
+            self._get_indirect("JWT_SECRET_NAME", "JWT_SECRET") or ""
+        )
+
+    @cached_property
+    def private_jwk(self) -> dict[str, Any]:
+        # JWT_PRIVATE_JWK_PATH is read once per snapshot; call
+        # refresh_env_config() after replacing the key file in place
+        jwk_str = self._get_indirect("JWT_PRIVATE_JWK_NAME", "JWT_PRIVATE_JWK")
+        path = self.get("JWT_PRIVATE_JWK_PATH")
+        if not jwk_str and path:
+            with open(path, encoding="utf-8") as f:
+                jwk_str = f.read()
+        if not jwk_str:
+            raise RuntimeError(
+                "JWT_PRIVATE_JWK(_NAME) or JWT_PRIVATE_JWK_PATH required for EdDSA signing"
+            )
+        jwk: dict[str, Any] = json.loads(jwk_str)
+        return jwk
+
+    @cached_property
+    def kid(self) -> str | None:
+        return self.get("JWT_KID") or None
+
+    @cached_property
+    def public_jwk_string(self) -> str | None:
+        return self._get_indirect("JWT_PUBLIC_JWK_NAME", "JWT_PUBLIC_JWK")
+
+    @cached_property
+    def public_jwk(self) -> dict[str, Any] | None:
+        jwk_str = self.public_jwk_string
+        if not jwk_str:
+            return None
+        jwk: dict[str, Any] = json.loads(jwk_str)
+        return jwk
+
+    @cached_property
+    def jwks_url(self) -> str | None:
+        return self._get_indirect("JWT_JWKS_URL_NAME", "JWT_JWKS_URL")
+
+    @cached_property
+    def verify_identity(self) -> tuple[str, ...]:
+        """Identify the verification key material, for result caching."""
+        if self.consumer_alg == "HS512":
+            return ("HS512", hashlib.sha256(self.hs_secret).hexdigest())
+        return ("asymmetric", self.public_jwk_string or "", self.jwks_url or "")
+
+    @cached_property
+    def sign_identity(self) -> tuple[str, ...]:
+        """Identify the signing key material, for minted-token caching."""
+        if self.producer_alg == "HS512":
+            return ("HS512", hashlib.sha256(self.hs_secret).hexdigest())
+        jwk = json.dumps(self.private_jwk, sort_keys=True, separators=(",", ":"))
+        return ("EdDSA", hashlib.sha256(jwk.encode()).hexdigest(), self.kid or "")
+
+    @cached_property
+    def jwks_cache_ttl(self) -> int:
+        ttl = self.get("JWT_JWKS_CACHE_TTL_SECONDS")
+        if not ttl:
+            return 300
+        try:
+            parsed = int(ttl)
+        except ValueError:
+            parsed = -1
+        if parsed < 0:
+            raise RuntimeError("JWT_JWKS_CACHE_TTL_SECONDS must be a positive number")
+        return parsed
+
+
+# The compiled configuration for the process environment. Read without a
+# lock on every call; apply_env_bindings()/refresh_env_config() replace it in
+# one assignment, so a caller sees either the old snapshot or the new one.
+_current_config: EnvConfig | None = None
+
+# Compiled configurations for request-scoped bindings, keyed by the identity
+# of the bound mapping. Each entry holds the mapping itself, so its id cannot
+# be reused by another mapping while the entry is cached. Worker env objects
+# are fixed for the lifetime of an isolate, so one entry serves every request.
+ENV_CONFIG_CACHE_SIZE = 8
+_bound_configs: LruCache[int, tuple[Mapping[str, Any], EnvConfig]] = LruCache(
+    ENV_CONFIG_CACHE_SIZE
+)
+
+
+def env_config() -> EnvConfig:
+    """Get the compiled JWT configuration for the current environment.
+
+    Returns the current snapshot without reading any variables. Changes made
+    to os.environ after the snapshot was compiled take effect on the next
+    apply_env_bindings() or refresh_env_config() call. Within env_bindings(),
+    the snapshot compiled for the bound mapping is used.
+    """
+    bindings = _env_bindings.get()
+    if bindings is None:
+        return _current_config or refresh_env_config()
+    entry = _bound_configs.get(id(bindings))
+    if entry is not None and entry[0] is bindings:
+        return entry[1]
+    compiled = EnvConfig(_read_env())
+    _bound_configs.set(id(bindings), (bindings, compiled))
+    return compiled
+
+
+def refresh_env_config() -> EnvConfig:
+    """Recompile the JWT configuration from the environment and make it current.
+
+    Snapshots compiled for bound mappings also fall back to os.environ, so
+    they are dropped and recompiled on next use.
+    """
+    global _current_config
+    _bound_configs.clear()
+    bindings = _env_bindings.get()
+    compiled = EnvConfig(_read_env())
+    if bindings is None:
+        _current_config = compiled
+    else:
+        # The unbound snapshot cannot be read through the bindings; it is
+        # recompiled on next use outside them
+        _current_config = None
+        _bound_configs.set(id(bindings), (bindings, compiled))
+    return compiled
+
+
+def mode(role: str) -> AlgType:
+    """Detect JWT algorithm mode from environment variables based on role.
+
+    Args:
+        role: Either "producer" (signing) or "consumer" (verification)
 
-    return "HS512"
+    Returns:
+        AlgType: Either "HS512" or "EdDSA"
+    """
+    return env_config().mode(role)
 
 
 def common() -> JwtCommonConfig:
@@ -185,11 +417,13 @@ def common() -> JwtCommonConfig:
     Returns:
         JwtCommonConfig: Configuration with iss, aud, leeway, ttl_seconds
     """
+    # Copy so callers cannot mutate the shared compiled configuration
+    cfg = env_config().common
     return {
-        "iss": os.getenv("JWT_ISS", ""),
-        "aud": os.getenv("JWT_AUD", ""),
-        "leeway": int(os.getenv("JWT_LEEWAY", "90")),
-        "ttl_seconds": int(os.getenv("JWT_TTL_SECONDS", "900")),
+        "iss": cfg["iss"],
+        "aud": cfg["aud"],
+        "leeway": cfg["leeway"],
+        "ttl_seconds": cfg["ttl_seconds"],
     }
 
 
@@ -204,8 +438,9 @@ def profile(role: str) -> dict[str, Any]:
     Returns:
         dict containing alg, iss, aud, leeway_seconds, and ttl_seconds
     """
-    alg = mode(role)
-    cfg = common()
+    config = env_config()
+    alg = config.mode(role)
+    cfg = config.common
 
     return {
         "alg": alg,
@@ -216,15 +451,7 @@ def profile(role: str) -> dict[str, Any]:
     }
 
 
-def _get_indirect(name_var: str, direct_var: str) -> str | None:
-    name = os.getenv(name_var)
-    if name and os.getenv(name):
-        return os.getenv(name)
-    return os.getenv(direct_var)
-
-
-def get_hs_secret_bytes() -> bytes:
-    s = _get_indirect("JWT_SECRET_NAME", "JWT_SECRET") or ""
+def _decode_hs_secret(s: str) -> bytes:
     if not s:
         raise RuntimeError(
             "JWT secret missing: set JWT_SECRET_NAME -> bound secret, or JWT_SECRET"
@@ -251,9 +478,18 @@ def get_hs_secret_bytes() -> bytes:
     return b
 
 
+def get_hs_secret_bytes() -> bytes:
+    return env_config().hs_secret
+
+
 def get_public_jwk_string() -> str | None:
-    return _get_indirect("JWT_PUBLIC_JWK_NAME", "JWT_PUBLIC_JWK")
+    return env_config().public_jwk_string
 
 
 def get_jwks_url() -> str | None:
-    return _get_indirect("JWT_JWKS_URL_NAME", "JWT_JWKS_URL")
+    return env_config().jwks_url
+
+
+def get_jwks_cache_ttl() -> int:
+    """Get the JWKS cache TTL in seconds from JWT_JWKS_CACHE_TTL_SECONDS (default: 300)."""
+    return env_config().jwks_cache_ttl
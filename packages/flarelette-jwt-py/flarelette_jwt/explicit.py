@@ -11,17 +11,32 @@ environments or when working with multiple JWT configurations.
 
 from __future__ import annotations
 
+import asyncio
 import base64
+import hashlib
 import json
 import time
-from typing import TYPE_CHECKING, Any, Literal, TypedDict, TypeGuard
-from urllib.parse import urlparse
-from urllib.request import urlopen
+from functools import partial
+from typing import TYPE_CHECKING, Any, Literal, NamedTuple, TypedDict, TypeGuard
+
+from .authz import CompiledPolicy, _authorize, _prescreen
+from .backend import NATIVE, CryptoBackend, KeyUsage, get_crypto_backend
+from .cache import LruCache
+from .jwks import _resolve_jwk_from_url, _resolve_jwk_from_url_sync
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Awaitable, Callable, Sequence
 
     from .env import JwtHeader, JwtPayload
+    from .token_cache import (
+        DelegatedTokenCache,
+        RejectReason,
+        TokenCacheKey,
+        VerifiedTokenCache,
+    )
+
+    # (header, payload, signing input, signature) of a compact JWS
+    DecodedToken = tuple[JwtHeader, JwtPayload, bytes, bytes]
 
 
 class BaseJwtConfig(TypedDict, total=False):
@@ -92,11 +107,43 @@ class ES512VerifyConfig(BaseJwtConfig):
 
 
 class JWKSUrlVerifyConfig(BaseJwtConfig):
-    """Asymmetric verification configuration backed by a remote JWKS URL."""
+    """Asymmetric verification configuration backed by a remote JWKS URL.
+
+    Attributes:
+        alg: Expected token algorithm
+        jwks_url: HTTPS URL of the JWKS endpoint
+        cache_ttl: Seconds to cache the fetched JWKS (default: 300, 0 disables)
+        max_stale: Seconds past cache_ttl to keep serving cached keys while a
+            background refresh runs (stale-while-revalidate); None disables
+        fetch_timeout: Seconds before a JWKS HTTP fetch is abandoned (default: 5)
+    """
 
     alg: Literal["EdDSA", "ES256", "ES384", "ES512", "RS256", "RS384", "RS512"]
     jwks_url: str
     cache_ttl: int | None
+    max_stale: int | None
+    fetch_timeout: float | None
+
+
+# Order of the signature and claim checks in verify_with_config()
+VerifyStrategy = Literal["signature_first", "claims_first"]
+
+# Why verify_many() rejected a token
+VerifyFailure = Literal[
+    "malformed", "invalid_signature", "expired", "invalid_claims", "unknown_key"
+]
+
+
+class BatchVerifyResult(TypedDict):
+    """Outcome for one token passed to verify_many().
+
+    Attributes:
+        payload: Verified payload, or None if the token was rejected
+        reason: Why the token was rejected, or None if it was accepted
+    """
+
+    payload: JwtPayload | None
+    reason: VerifyFailure | None
 
 
 # Union types for convenience
@@ -113,6 +160,30 @@ ASYMMETRIC_VERIFY_ALGS = {
     "RS512",
 }
 
+# Imported HMAC keys, keyed by (backend, secret fingerprint, usage).
+# importKey costs an FFI round trip plus a key schedule, so keys are imported
+# once per isolate and reused until evicted or cleared.
+HMAC_KEY_CACHE_SIZE = 32
+_hmac_key_cache: LruCache[tuple[str, bytes, str], Any] = LruCache(HMAC_KEY_CACHE_SIZE)
+
+# Imported public verification keys, keyed by (backend, alg, RFC 7638 JWK
+# thumbprint).
+VERIFY_KEY_CACHE_SIZE = 64
+_verify_key_cache: LruCache[tuple[str, str, str], Any] = LruCache(VERIFY_KEY_CACHE_SIZE)
+
+# Imported private signing keys, keyed by (backend, alg, fingerprint of the
+# full private JWK) so cache keys never hold the private key material.
+SIGN_KEY_CACHE_SIZE = 8
+_sign_key_cache: LruCache[tuple[str, str, bytes], Any] = LruCache(SIGN_KEY_CACHE_SIZE)
+
+# Required public members per key type for RFC 7638 thumbprints
+_THUMBPRINT_MEMBERS = {
+    "EC": ("crv", "kty", "x", "y"),
+    "OKP": ("crv", "kty", "x"),
+    "RSA": ("e", "kty", "n"),
+    "oct": ("k", "kty"),
+}
+
 
 def _b64url(b: bytes) -> str:
     """Encode bytes to base64url without padding."""
@@ -124,121 +195,207 @@ def _b64url_decode(s: str) -> bytes:
     return base64.urlsafe_b64decode(s + "=" * (-len(s) % 4))
 
 
-def _validate_jwks_url(url: str) -> None:
-    parsed = urlparse(url)
-    if not parsed.scheme or not parsed.netloc:
-        raise ValueError("JWT_JWKS_URL must be a valid URL")
-    if parsed.scheme == "https":
-        return
-    if parsed.scheme == "http" and parsed.hostname in {"localhost", "127.0.0.1", "::1"}:
-        return
-    raise ValueError("JWT_JWKS_URL must use HTTPS (except localhost for testing)")
+def _secret_fingerprint(secret: bytes) -> bytes:
+    """Fingerprint a shared secret so cache keys never hold the raw secret."""
+    return hashlib.sha256(secret).digest()
 
 
-def _ecdsa_curve_name(alg: str) -> str:
-    curves = {
-        "ES256": "P-256",
-        "ES384": "P-384",
-        "ES512": "P-521",
-    }
-    return curves[alg]
+async def _import_hmac_key(
+    secret: bytes, usage: KeyUsage, backend: CryptoBackend | None = None
+) -> Any:
+    """Import an HS512 key for the given usage, reusing a cached key."""
+    backend = backend or get_crypto_backend()
+    cache_key = (backend.name, _secret_fingerprint(secret), usage)
+    key = _hmac_key_cache.get(cache_key)
+    if key is not None:
+        return key
 
+    key = await backend.import_hmac_key(secret, usage)
+    _hmac_key_cache.set(cache_key, key)
+    return key
 
-def _hash_name(alg: str) -> str:
-    hashes = {
-        "RS256": "SHA-256",
-        "RS384": "SHA-384",
-        "RS512": "SHA-512",
-        "ES256": "SHA-256",
-        "ES384": "SHA-384",
-        "ES512": "SHA-512",
-    }
-    return hashes[alg]
 
+def _import_hmac_key_sync(secret: bytes, usage: KeyUsage) -> Any:
+    """Import an HS512 key on the native backend, reusing a cached key."""
+    cache_key = (NATIVE.name, _secret_fingerprint(secret), usage)
+    key = _hmac_key_cache.get(cache_key)
+    if key is None:
+        key = NATIVE.import_hmac_key_sync(secret, usage)
+        _hmac_key_cache.set(cache_key, key)
+    return key
 
-async def _fetch_jwks_from_url(url: str) -> list[dict[str, Any]]:
-    _validate_jwks_url(url)
 
-    text: str
-    try:
-        from js import fetch as js_fetch  # noqa: PLC0415
-    except ImportError:
-        js_fetch = None
-
-    if js_fetch is not None:
-        response = await js_fetch(url)
-        if not response.ok:
-            raise ValueError(
-                f"JWKS HTTP fetch returned {response.status}: {response.statusText}"
-            )
-        text = await response.text()
+def _jwk_thumbprint(jwk: dict[str, Any]) -> str:
+    """Compute the RFC 7638 SHA-256 thumbprint of a JWK.
+
+    Keys with an unknown kty (or missing required members) fall back to a
+    digest of the full canonical JWK so distinct keys never share an entry.
+    """
+    members = _THUMBPRINT_MEMBERS.get(jwk.get("kty", ""))
+    if members and all(isinstance(jwk.get(m), str) for m in members):
+        canonical = {m: jwk[m] for m in members}
     else:
-        with urlopen(url) as response:  # noqa: S310
-            status = getattr(response, "status", response.getcode())
-            if status < 200 or status >= 300:
-                raise ValueError(f"JWKS HTTP fetch returned {status}")
-            text = response.read().decode("utf-8")
+        canonical = jwk
+    digest = hashlib.sha256(
+        json.dumps(canonical, sort_keys=True, separators=(",", ":")).encode()
+    ).digest()
+    return _b64url(digest)
 
-    data = json.loads(text)
-    keys = data.get("keys")
-    if not isinstance(keys, list):
-        raise ValueError("Invalid JWKS response: missing keys array")
-    return keys
 
+def clear_key_cache() -> None:
+    """Drop all cached CryptoKeys.
 
-def _find_jwk_by_kid(
-    kid: str | None, jwks: list[dict[str, Any]]
-) -> dict[str, Any] | None:
-    if not kid:
-        return None
-    for jwk in jwks:
-        if jwk.get("kid") == kid:
-            return jwk
-    return None
+    Call after rotating a secret or key so the previous key material is not
+    retained by the isolate.
+    """
+    _hmac_key_cache.clear()
+    _verify_key_cache.clear()
+    _sign_key_cache.clear()
 
 
 async def _import_verify_key(
-    alg: str, jwk: dict[str, Any]
-) -> tuple[Any, dict[str, str]]:
-    from js import crypto  # noqa: PLC0415
+    alg: str, jwk: dict[str, Any], backend: CryptoBackend | None = None
+) -> Any:
+    backend = backend or get_crypto_backend()
+    cache_key = (backend.name, alg, _jwk_thumbprint(jwk))
+    cached = _verify_key_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    imported = await backend.import_verify_key(alg, jwk)
+    _verify_key_cache.set(cache_key, imported)
+    return imported
+
+
+def _import_verify_key_sync(alg: str, jwk: dict[str, Any]) -> Any:
+    cache_key = (NATIVE.name, alg, _jwk_thumbprint(jwk))
+    imported = _verify_key_cache.get(cache_key)
+    if imported is None:
+        imported = NATIVE.import_verify_key_sync(alg, jwk)
+        _verify_key_cache.set(cache_key, imported)
+    return imported
+
+
+def _private_jwk_fingerprint(jwk: dict[str, Any]) -> bytes:
+    return _secret_fingerprint(
+        json.dumps(jwk, sort_keys=True, separators=(",", ":")).encode()
+    )
+
+
+async def _import_sign_key(
+    alg: str, jwk: dict[str, Any], backend: CryptoBackend | None = None
+) -> Any:
+    """Import a private signing key, reusing a cached key."""
+    backend = backend or get_crypto_backend()
+    cache_key = (backend.name, alg, _private_jwk_fingerprint(jwk))
+    key = _sign_key_cache.get(cache_key)
+    if key is None:
+        key = await backend.import_sign_key(alg, jwk)
+        _sign_key_cache.set(cache_key, key)
+    return key
 
+
+def _import_sign_key_sync(alg: str, jwk: dict[str, Any]) -> Any:
+    cache_key = (NATIVE.name, alg, _private_jwk_fingerprint(jwk))
+    key = _sign_key_cache.get(cache_key)
+    if key is None:
+        key = NATIVE.import_sign_key_sync(alg, jwk)
+        _sign_key_cache.set(cache_key, key)
+    return key
+
+
+def _eddsa_header(kid: str | None) -> dict[str, Any]:
+    header: dict[str, Any] = {"alg": "EdDSA", "typ": "JWT"}
+    if kid:
+        header["kid"] = kid
+    return header
+
+
+def _decode_token(token: str) -> DecodedToken | None:
+    """Split a compact JWS into (header, payload, signing input, signature).
+
+    Returns:
+        The decoded parts, or None if the token is malformed
+    """
     try:
-        from pyodide.ffi import to_js  # noqa: PLC0415
-    except ImportError:
-
-        def to_js(value: Any) -> Any:
-            return value
-
-    if alg == "EdDSA":
-        x_b64 = jwk.get("x")
-        if not x_b64:
-            raise ValueError("EdDSA public JWK must include x")
-        key = await crypto.subtle.importKey(
-            "raw", _b64url_decode(x_b64), {"name": "Ed25519"}, False, ["verify"]
-        )
-        return key, {"name": "Ed25519"}
-
-    if alg.startswith("RS"):
-        key = await crypto.subtle.importKey(
-            "jwk",
-            to_js(jwk),
-            {"name": "RSASSA-PKCS1-v1_5", "hash": _hash_name(alg)},
-            False,
-            ["verify"],
-        )
-        return key, {"name": "RSASSA-PKCS1-v1_5"}
-
-    if alg.startswith("ES"):
-        key = await crypto.subtle.importKey(
-            "jwk",
-            to_js(jwk),
-            {"name": "ECDSA", "namedCurve": _ecdsa_curve_name(alg)},
-            False,
-            ["verify"],
-        )
-        return key, {"name": "ECDSA", "hash": _hash_name(alg)}
+        h_b64, p_b64, s_b64 = token.split(".")
+        header: JwtHeader = json.loads(_b64url_decode(h_b64))
+        payload: JwtPayload = json.loads(_b64url_decode(p_b64))
+        sig = _b64url_decode(s_b64)
+    except Exception:
+        return None
+    # Claims are read before the signature is checked (claims_first), so
+    # anything but a JSON object is rejected here rather than crashing later
+    if not isinstance(header, dict) or not isinstance(payload, dict):
+        return None
+    # alg and kid key caches and verify_many groups, so they must be hashable
+    if not isinstance(header.get("alg"), str | None):
+        return None
+    if not isinstance(header.get("kid"), str | None):
+        return None
+    return header, payload, f"{h_b64}.{p_b64}".encode(), sig
 
-    raise ValueError(f"Unsupported verification algorithm: {alg}")
+
+def _claims_valid(
+    payload: JwtPayload, iss: str, aud: str | list[str], leeway: int
+) -> bool:
+    """Check iss, aud, exp and nbf (falling back to iat) against now.
+
+    Malformed time claims (e.g. a non-numeric or infinite exp) fail the check.
+    """
+    now = int(time.time())
+    if payload.get("iss") != iss:
+        return False
+    if payload.get("aud") != aud:
+        return False
+    try:
+        exp = int(payload.get("exp", 0))
+        nbf = int(payload.get("nbf", payload.get("iat", 0)))
+    except (TypeError, ValueError, OverflowError):
+        return False
+    return exp + leeway >= now and now + leeway >= nbf
+
+
+def _is_expired(payload: JwtPayload, leeway: int) -> bool:
+    try:
+        return int(time.time()) > int(payload.get("exp", 0)) + leeway
+    except (TypeError, ValueError, OverflowError):
+        return False
+
+
+def _claims_body(
+    payload: JwtPayload, iss: str, aud: str | list[str], ttl: int
+) -> dict[str, Any]:
+    """Fill in iss, aud, iat and exp defaults for a token being signed."""
+    now = int(time.time())
+    body = dict(payload)
+    body.setdefault("iss", iss)
+    body.setdefault("aud", aud)
+    body.setdefault("iat", now)
+    body.setdefault("exp", now + ttl)
+    return body
+
+
+def _encode_signing_input(header: dict[str, Any], body: dict[str, Any]) -> str:
+    h = _b64url(json.dumps(header, separators=(",", ":")).encode())
+    p = _b64url(json.dumps(body, separators=(",", ":")).encode())
+    return f"{h}.{p}"
+
+
+def _audience_signing_inputs(
+    header: dict[str, Any],
+    body: dict[str, Any],
+    audiences: Sequence[str | list[str]],
+) -> list[str]:
+    """Encode header and shared claims once, splicing in each audience."""
+    h = _b64url(json.dumps(header, separators=(",", ":")).encode())
+    shared = {k: v for k, v in body.items() if k != "aud"}
+    prefix = json.dumps(shared, separators=(",", ":"))[:-1]
+    prefix += ',"aud":' if shared else '"aud":'
+    return [
+        f"{h}.{_b64url((prefix + json.dumps(aud, separators=(',', ':')) + '}').encode())}"
+        for aud in audiences
+    ]
 
 
 def _has_public_jwk(
@@ -251,6 +408,15 @@ def _has_jwks_url(config: VerifyConfig) -> TypeGuard[JWKSUrlVerifyConfig]:
     return "jwks_url" in config
 
 
+def _asymmetric_alg(alg: Any, expected_alg: str | None) -> str | None:
+    """Return alg if a public key may verify it, else None."""
+    if alg not in ASYMMETRIC_VERIFY_ALGS:
+        return None
+    if expected_alg is not None and alg != expected_alg:
+        return None
+    return str(alg)
+
+
 async def _verify_asymmetric_signature(
     header: JwtHeader,
     signing_input: bytes,
@@ -259,16 +425,112 @@ async def _verify_asymmetric_signature(
     *,
     expected_alg: str | None = None,
 ) -> bool:
-    alg = header.get("alg")
-    if alg not in ASYMMETRIC_VERIFY_ALGS:
+    alg = _asymmetric_alg(header.get("alg"), expected_alg)
+    if alg is None:
         return False
-    if expected_alg is not None and alg != expected_alg:
+    backend = get_crypto_backend()
+    key = await _import_verify_key(alg, jwk, backend)
+    return await backend.verify(key, sig, signing_input)
+
+
+def _verify_asymmetric_signature_sync(
+    header: JwtHeader,
+    signing_input: bytes,
+    sig: bytes,
+    jwk: dict[str, Any],
+    *,
+    expected_alg: str | None = None,
+) -> bool:
+    alg = _asymmetric_alg(header.get("alg"), expected_alg)
+    if alg is None:
         return False
+    return NATIVE.verify_sync(_import_verify_key_sync(alg, jwk), sig, signing_input)
+
+
+def _hs512_secret(config: HS512Config) -> bytes:
+    secret = config["secret"]
+    # SECURITY: HS512 requires 64-byte minimum (SHA-512 digest size)
+    if len(secret) < 64:
+        raise ValueError(
+            f"JWT secret too short: {len(secret)} bytes, need >= 64 for HS512"
+        )
+    return secret
+
+
+def _sign_body(
+    payload: JwtPayload,
+    config: SignConfig,
+    iss: str | None,
+    aud: str | list[str] | None,
+    ttl_seconds: int | None,
+) -> dict[str, Any]:
+    return _claims_body(
+        payload,
+        iss or config.get("iss", ""),
+        aud or config.get("aud", ""),
+        ttl_seconds or config.get("ttl_seconds", 900),
+    )
+
+
+class _SigningKey(NamedTuple):
+    """Header and key material of a signing configuration.
+
+    Exactly one of secret (HS512) and private_jwk (EdDSA) is set. Built
+    without any I/O, so the sync and async signing paths share it and differ
+    only in how the key is imported and applied.
+    """
+
+    header: dict[str, Any]
+    secret: bytes | None = None
+    private_jwk: dict[str, Any] | None = None
+
+
+def _config_signing_key(config: SignConfig) -> _SigningKey:
+    if config["alg"] == "HS512":
+        return _SigningKey({"alg": "HS512", "typ": "JWT"}, secret=_hs512_secret(config))
+    return _SigningKey(
+        _eddsa_header(config.get("kid")), private_jwk=config["private_jwk"]
+    )
+
+
+async def _signer(
+    key: _SigningKey, backend: CryptoBackend
+) -> Callable[[bytes], Awaitable[bytes]]:
+    """Import the signing key once and return a signing-input signer."""
+    if key.secret is not None:
+        hmac_key = await _import_hmac_key(key.secret, "sign", backend)
+        return partial(backend.hmac_sign, hmac_key)
+    private_key = await _import_sign_key("EdDSA", key.private_jwk or {}, backend)
+    return partial(backend.sign, private_key)
+
+
+def _signer_sync(key: _SigningKey) -> Callable[[bytes], bytes]:
+    if key.secret is not None:
+        return partial(NATIVE.hmac_sign_sync, _import_hmac_key_sync(key.secret, "sign"))
+    private_key = _import_sign_key_sync("EdDSA", key.private_jwk or {})
+    return partial(NATIVE.sign_sync, private_key)
+
+
+async def _sign_claims(key: _SigningKey, body: dict[str, Any]) -> str:
+    signing_input = _encode_signing_input(key.header, body)
+    sign = await _signer(key, get_crypto_backend())
+    return f"{signing_input}.{_b64url(await sign(signing_input.encode()))}"
 
-    from js import crypto  # noqa: PLC0415
 
-    key, verify_algorithm = await _import_verify_key(alg, jwk)
-    return bool(await crypto.subtle.verify(verify_algorithm, key, sig, signing_input))
+def _sign_claims_sync(key: _SigningKey, body: dict[str, Any]) -> str:
+    signing_input = _encode_signing_input(key.header, body)
+    return f"{signing_input}.{_b64url(_signer_sync(key)(signing_input.encode()))}"
+
+
+async def _sign_claims_for_audiences(
+    key: _SigningKey, body: dict[str, Any], audiences: Sequence[str | list[str]]
+) -> list[str]:
+    sign = await _signer(key, get_crypto_backend())
+    signing_inputs = _audience_signing_inputs(key.header, body, audiences)
+    sigs = await asyncio.gather(*(sign(si.encode()) for si in signing_inputs))
+    return [
+        f"{si}.{_b64url(sig)}" for si, sig in zip(signing_inputs, sigs, strict=True)
+    ]
 
 
 async def sign_with_config(
@@ -313,52 +575,71 @@ async def sign_with_config(
         Signed JWT token string
 
     Raises:
-        ValueError: If secret is too short (< 64 bytes)
-        RuntimeError: If EdDSA signing is attempted (not supported in Python Workers)
+        ValueError: If secret is too short (< 64 bytes) or the private JWK is
+            not an Ed25519 key
+        RuntimeError: If EdDSA signing is attempted on CPython without the
+            optional cryptography dependency
     """
-    iss_val = iss or config.get("iss", "")
-    aud_val = aud or config.get("aud", "")
-    ttl = ttl_seconds or config.get("ttl_seconds", 900)
+    body = _sign_body(payload, config, iss, aud, ttl_seconds)
+    return await _sign_claims(_config_signing_key(config), body)
 
-    now = int(time.time())
-    body = dict(payload)
-    body.setdefault("iss", iss_val)
-    body.setdefault("aud", aud_val)
-    body.setdefault("iat", now)
-    body.setdefault("exp", now + ttl)
 
-    if config["alg"] == "HS512":
-        secret = config["secret"]
-        # SECURITY: HS512 requires 64-byte minimum (SHA-512 digest size)
-        if len(secret) < 64:
-            raise ValueError(
-                f"JWT secret too short: {len(secret)} bytes, need >= 64 for HS512"
-            )
-
-        # Lazy import - only available in Cloudflare Workers/Pyodide runtime
-        from js import crypto  # noqa: PLC0415
-        from pyodide.ffi import to_py  # noqa: PLC0415
-
-        header = {"alg": "HS512", "typ": "JWT"}
-        h = _b64url(json.dumps(header, separators=(",", ":")).encode())
-        p = _b64url(json.dumps(body, separators=(",", ":")).encode())
-        signing_input = f"{h}.{p}".encode()
-
-        key = await crypto.subtle.importKey(
-            "raw",
-            secret,
-            {"name": "HMAC", "hash": "SHA-512"},
-            False,
-            ["sign"],
-        )
-        sig = await crypto.subtle.sign({"name": "HMAC"}, key, signing_input)
+def sign_with_config_sync(
+    payload: JwtPayload,
+    config: SignConfig,
+    *,
+    iss: str | None = None,
+    aud: str | list[str] | None = None,
+    ttl_seconds: int | None = None,
+) -> str:
+    """Synchronous sign_with_config on the native backend.
 
-        return f"{h}.{p}.{_b64url(bytes(to_py(sig)))}"
-    else:
-        # EdDSA mode
-        raise RuntimeError(
-            "EdDSA signing is not supported in Workers Python; produce tokens with the Node gateway"
-        )
+    Runs without an event loop, for sync frameworks (Flask, WSGI) on CPython
+    hosts. Arguments, return value and errors match sign_with_config().
+    """
+    body = _sign_body(payload, config, iss, aud, ttl_seconds)
+    return _sign_claims_sync(_config_signing_key(config), body)
+
+
+async def sign_many_with_config(
+    payload: JwtPayload,
+    config: SignConfig,
+    audiences: Sequence[str | list[str]],
+    *,
+    iss: str | None = None,
+    ttl_seconds: int | None = None,
+) -> list[str]:
+    """Sign one token per audience from the same claims.
+
+    The header and shared claims are serialized once, the key is imported
+    once, and all signatures are computed together. Every token carries the
+    same iat and exp; any aud in payload is replaced per token.
+
+    Example:
+        >>> tokens = await sign_many_with_config(
+        ...     {'sub': 'user123'}, config, ['billing-api', 'search-api']
+        ... )
+
+    Args:
+        payload: Claims shared by every token
+        config: Explicit JWT configuration
+        audiences: Audience (string or list) of each token to mint
+        iss: Optional per-call override for issuer
+        ttl_seconds: Optional per-call override for TTL
+
+    Returns:
+        Signed JWT token strings, one per audience in order
+
+    Raises:
+        ValueError: If secret is too short (< 64 bytes) or the private JWK is
+            not an Ed25519 key
+        RuntimeError: If EdDSA signing is attempted on CPython without the
+            optional cryptography dependency
+    """
+    body = _sign_body(payload, config, iss, None, ttl_seconds)
+    return await _sign_claims_for_audiences(
+        _config_signing_key(config), body, audiences
+    )
 
 
 async def verify_with_config(
@@ -368,6 +649,8 @@ async def verify_with_config(
     iss: str | None = None,
     aud: str | list[str] | None = None,
     leeway: int | None = None,
+    cache: VerifiedTokenCache | None = None,
+    strategy: VerifyStrategy = "signature_first",
 ) -> JwtPayload | None:
     """Verify a JWT token with explicit configuration.
 
@@ -396,84 +679,395 @@ async def verify_with_config(
         iss: Optional per-call override for issuer
         aud: Optional per-call override for audience
         leeway: Optional per-call override for clock skew tolerance
+        cache: Optional VerifiedTokenCache; repeat tokens skip signature
+            verification while their claims are still re-checked, and
+            replayed malformed, forged or expired tokens are rejected early
+        strategy: "signature_first" (default) checks the signature before
+            any claim; "claims_first" rejects on the decoded but unverified
+            exp/nbf/iss/aud claims before key lookup and signature work.
+            Either way a token is only accepted after both checks pass.
 
     Returns:
         Payload if valid, None if invalid
     """
-    iss_val = iss or config.get("iss", "")
-    aud_val = aud or config.get("aud", "")
-    leeway_val = leeway or config.get("leeway", 90)
+    iss_val, aud_val, leeway_val = _claim_targets(config, iss, aud, leeway)
+    plan = _plan_verification(
+        token,
+        cache,
+        partial(_verify_identity, config),
+        iss_val,
+        aud_val,
+        leeway_val,
+        strategy,
+    )
+    if plan.decoded is None:
+        return plan.answer
+    source = _config_key_source(plan.decoded[0], config)
+    result = await _check_signature(plan.decoded, source)
+    return _settle_verification(
+        result, token, cache, plan.cache_key, iss_val, aud_val, leeway_val
+    )
 
-    try:
-        h_b64, p_b64, s_b64 = token.split(".")
-        header = json.loads(_b64url_decode(h_b64))
-        payload: JwtPayload = json.loads(_b64url_decode(p_b64))
-        sig = _b64url_decode(s_b64)
-    except Exception:
-        return None
 
-    if config["alg"] == "HS512":
-        if header.get("alg") != "HS512":
-            return None
+def verify_with_config_sync(
+    token: str,
+    config: VerifyConfig,
+    *,
+    iss: str | None = None,
+    aud: str | list[str] | None = None,
+    leeway: int | None = None,
+    cache: VerifiedTokenCache | None = None,
+    strategy: VerifyStrategy = "signature_first",
+) -> JwtPayload | None:
+    """Synchronous verify_with_config on the native backend.
+
+    Runs without an event loop, for sync frameworks (Flask, WSGI) on CPython
+    hosts. JWKS URLs share the async path's cache; a cache miss downloads the
+    key set inline. Arguments and return value match verify_with_config().
+    """
+    iss_val, aud_val, leeway_val = _claim_targets(config, iss, aud, leeway)
+    plan = _plan_verification(
+        token,
+        cache,
+        partial(_verify_identity, config),
+        iss_val,
+        aud_val,
+        leeway_val,
+        strategy,
+    )
+    if plan.decoded is None:
+        return plan.answer
+    source = _config_key_source(plan.decoded[0], config)
+    result = _check_signature_sync(plan.decoded, source)
+    return _settle_verification(
+        result, token, cache, plan.cache_key, iss_val, aud_val, leeway_val
+    )
 
-        # Lazy import - only available in Cloudflare Workers/Pyodide runtime
-        from js import crypto  # noqa: PLC0415
 
+class _VerifyPlan(NamedTuple):
+    """Outcome of the verification steps that need no key material."""
+
+    decoded: DecodedToken | None  # Set when the signature still needs checking
+    answer: JwtPayload | None  # The final result when decoded is None
+    cache_key: TokenCacheKey | None
+
+
+def _plan_verification(
+    token: str,
+    cache: VerifiedTokenCache | None,
+    identity: Callable[[], tuple[str, ...]],
+    iss: str,
+    aud: str | list[str],
+    leeway: int,
+    strategy: VerifyStrategy,
+) -> _VerifyPlan:
+    """Run every verify entry point's steps before the signature check.
+
+    Answers from the cache (re-checking claims on a hit), rejects malformed
+    tokens and, with claims_first, tokens whose unverified claims fail.
+    Together with _settle_verification() this keeps the sync and async,
+    environment and explicit-config paths identical around the crypto.
+    """
+    cache_key = None
+    if cache is not None:
+        cache_key = cache.key(token, identity())
+        if cache.rejected(cache_key, leeway):
+            return _VerifyPlan(None, None, cache_key)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            answer = cached if _claims_valid(cached, iss, aud, leeway) else None
+            return _VerifyPlan(None, answer, cache_key)
+
+    decoded = _decode_token(token)
+    if decoded is None:
+        _settle_verification("malformed", token, cache, cache_key, iss, aud, leeway)
+        return _VerifyPlan(None, None, cache_key)
+    if strategy == "claims_first" and not _claims_valid(decoded[1], iss, aud, leeway):
+        # Unverified claims may reject a token but never accept one
+        _remember_claims_rejection(decoded[1], cache, cache_key, leeway)
+        return _VerifyPlan(None, None, cache_key)
+    return _VerifyPlan(decoded, None, cache_key)
+
+
+class _KeySource(NamedTuple):
+    """Where the key for a signature check comes from, decided without I/O.
+
+    Exactly one of secret (HS512), jwk and jwks_url is set; the remaining
+    fields are the JWKS lookup options and the algorithm a public key must
+    be used with.
+    """
+
+    secret: bytes | None = None
+    jwk: dict[str, Any] | None = None
+    jwks_url: str | None = None
+    cache_ttl: int | None = None
+    max_stale: int | None = None
+    fetch_timeout: float | None = None
+    expected_alg: str | None = None
+
+
+def _config_key_source(
+    header: JwtHeader, config: VerifyConfig
+) -> _KeySource | RejectReason | None:
+    """Choose the verification key source for a token header.
+
+    Returns:
+        The key source, a RejectReason if the header rules the token out, or
+        None when the config holds no usable key
+    """
+    if config["alg"] == "HS512":
+        if header.get("alg") != "HS512":
+            return "invalid_signature"
         secret = config["secret"]
         # SECURITY: HS512 requires 64-byte minimum (SHA-512 digest size)
         if len(secret) < 64:
             return None
-
-        key = await crypto.subtle.importKey(
-            "raw",
-            secret,
-            {"name": "HMAC", "hash": "SHA-512"},
-            False,
-            ["verify"],
+        return _KeySource(secret=secret)
+    if _has_public_jwk(config):
+        return _KeySource(jwk=config["public_jwk"], expected_alg=config["alg"])
+    if _has_jwks_url(config):
+        return _KeySource(
+            jwks_url=config["jwks_url"],
+            cache_ttl=config.get("cache_ttl"),
+            max_stale=config.get("max_stale"),
+            fetch_timeout=config.get("fetch_timeout"),
+            expected_alg=config["alg"],
         )
-        ok = await crypto.subtle.verify(
-            {"name": "HMAC"}, key, sig, (h_b64 + "." + p_b64).encode()
-        )
-        if not ok:
+    return None
+
+
+async def _resolve_source_jwk(
+    source: _KeySource, kid: str | None
+) -> dict[str, Any] | None:
+    if source.jwks_url is None:
+        return source.jwk
+    return await _resolve_jwk_from_url(
+        source.jwks_url, kid, source.cache_ttl, source.max_stale, source.fetch_timeout
+    )
+
+
+def _resolve_source_jwk_sync(
+    source: _KeySource, kid: str | None
+) -> dict[str, Any] | None:
+    if source.jwks_url is None:
+        return source.jwk
+    return _resolve_jwk_from_url_sync(
+        source.jwks_url, kid, source.cache_ttl, source.max_stale, source.fetch_timeout
+    )
+
+
+async def _check_signature(
+    decoded: DecodedToken, source: _KeySource | RejectReason | None
+) -> JwtPayload | RejectReason | None:
+    """Check a decoded token's signature; claims are not validated.
+
+    Returns:
+        The payload, a RejectReason for deterministic failures (the same token
+        always fails the same way), or None when no key could be resolved
+    """
+    if not isinstance(source, _KeySource):
+        return source
+    header, payload, signing_input, sig = decoded
+    if source.secret is not None:
+        backend = get_crypto_backend()
+        key = await _import_hmac_key(source.secret, "verify", backend)
+        valid = await backend.hmac_verify(key, sig, signing_input)
+    else:
+        jwk = await _resolve_source_jwk(source, header.get("kid"))
+        if not jwk:
             return None
+        valid = await _verify_asymmetric_signature(
+            header, signing_input, sig, jwk, expected_alg=source.expected_alg
+        )
+    return payload if valid else "invalid_signature"
+
+
+def _check_signature_sync(
+    decoded: DecodedToken, source: _KeySource | RejectReason | None
+) -> JwtPayload | RejectReason | None:
+    if not isinstance(source, _KeySource):
+        return source
+    header, payload, signing_input, sig = decoded
+    if source.secret is not None:
+        key = _import_hmac_key_sync(source.secret, "verify")
+        valid = NATIVE.hmac_verify_sync(key, sig, signing_input)
     else:
-        signing_input = (h_b64 + "." + p_b64).encode()
-
-        if _has_public_jwk(config):
-            if not await _verify_asymmetric_signature(
-                header,
-                signing_input,
-                sig,
-                config["public_jwk"],
-                expected_alg=config["alg"],
-            ):
-                return None
-        elif _has_jwks_url(config):
-            jwk = _find_jwk_by_kid(
-                header.get("kid"), await _fetch_jwks_from_url(config["jwks_url"])
-            )
-            if not jwk:
-                return None
-            if not await _verify_asymmetric_signature(
-                header, signing_input, sig, jwk, expected_alg=config["alg"]
-            ):
-                return None
-        else:
+        jwk = _resolve_source_jwk_sync(source, header.get("kid"))
+        if not jwk:
             return None
+        valid = _verify_asymmetric_signature_sync(
+            header, signing_input, sig, jwk, expected_alg=source.expected_alg
+        )
+    return payload if valid else "invalid_signature"
 
-    # Validate claims
-    now = int(time.time())
-    if payload.get("iss") != iss_val:
-        return None
-    if payload.get("aud") != aud_val:
+
+def _settle_verification(
+    result: JwtPayload | RejectReason | None,
+    token: str,
+    cache: VerifiedTokenCache | None,
+    cache_key: TokenCacheKey | None,
+    iss: str,
+    aud: str | list[str],
+    leeway: int,
+) -> JwtPayload | None:
+    """Validate claims of a signature-checked result and record it in cache."""
+    if result is None:
         return None
-    if now > int(payload.get("exp", 0)) + leeway_val:
+    if isinstance(result, str):
+        if cache is not None and cache_key is not None:
+            cache.reject(cache_key, result, leeway)
         return None
-    nbf = int(payload.get("nbf", payload.get("iat", 0)))
-    if now + leeway_val < nbf:
+    if not _claims_valid(result, iss, aud, leeway):
+        _remember_claims_rejection(result, cache, cache_key, leeway)
         return None
+    if cache is not None and cache_key is not None:
+        cache.put(cache_key, token, result, leeway)
+    return result
 
-    return payload
+
+def _remember_claims_rejection(
+    payload: JwtPayload,
+    cache: VerifiedTokenCache | None,
+    cache_key: TokenCacheKey | None,
+    leeway: int,
+) -> None:
+    # Expiry is final; issuer/audience/nbf outcomes depend on the call
+    if cache is not None and cache_key is not None and _is_expired(payload, leeway):
+        cache.reject(cache_key, "expired", leeway)
+
+
+def _claim_targets(
+    config: VerifyConfig,
+    iss: str | None,
+    aud: str | list[str] | None,
+    leeway: int | None,
+) -> tuple[str, str | list[str], int]:
+    """Resolve per-call overrides against the config's iss, aud and leeway."""
+    return (
+        iss or config.get("iss", ""),
+        aud or config.get("aud", ""),
+        leeway or config.get("leeway", 90),
+    )
+
+
+def _verify_identity(config: VerifyConfig) -> tuple[str, ...]:
+    """Identify the key material a config verifies with, for result caching."""
+    if config["alg"] == "HS512":
+        return ("HS512", _secret_fingerprint(config["secret"]).hex())
+    if _has_public_jwk(config):
+        return (config["alg"], "jwk", _jwk_thumbprint(config["public_jwk"]))
+    if _has_jwks_url(config):
+        return (config["alg"], "jwks", config["jwks_url"])
+    return (config["alg"],)
+
+
+def _sign_identity(config: SignConfig) -> tuple[str, ...]:
+    """Identify the key material a config signs with, for minted-token caching."""
+    if config["alg"] == "HS512":
+        return ("HS512", _secret_fingerprint(config["secret"]).hex())
+    return (
+        "EdDSA",
+        _private_jwk_fingerprint(config["private_jwk"]).hex(),
+        config.get("kid") or "",
+    )
+
+
+async def verify_many(
+    tokens: Sequence[str],
+    config: VerifyConfig,
+    *,
+    iss: str | None = None,
+    aud: str | list[str] | None = None,
+    leeway: int | None = None,
+) -> list[BatchVerifyResult]:
+    """Verify a batch of JWT tokens against one configuration.
+
+    Tokens are grouped by their header (alg, kid); each group resolves its
+    JWKS entry and imports its key once, then all signature checks run
+    concurrently. Acceptance rules are exactly those of verify_with_config().
+
+    Example:
+        >>> results = await verify_many(tokens, config)
+        >>> rejected = [r['reason'] for r in results if r['payload'] is None]
+
+    Args:
+        tokens: JWT token strings to verify
+        config: Explicit JWT configuration
+        iss: Optional per-call override for issuer
+        aud: Optional per-call override for audience
+        leeway: Optional per-call override for clock skew tolerance
+
+    Returns:
+        One BatchVerifyResult per token, in input order
+    """
+    iss_val, aud_val, leeway_val = _claim_targets(config, iss, aud, leeway)
+    decoded = [_decode_token(token) for token in tokens]
+    reasons: list[VerifyFailure | None] = [
+        "malformed" if d is None else None for d in decoded
+    ]
+
+    groups: dict[tuple[Any, Any], list[tuple[int, DecodedToken]]] = {}
+    for i, d in enumerate(decoded):
+        if d is not None:
+            groups.setdefault((d[0].get("alg"), d[0].get("kid")), []).append((i, d))
+
+    backend = get_crypto_backend()
+    verifiers = await asyncio.gather(
+        *(_batch_verifier(config, alg, kid, backend) for alg, kid in groups)
+    )
+
+    pending: list[int] = []
+    checks: list[Awaitable[bool]] = []
+    for members, verifier in zip(groups.values(), verifiers, strict=True):
+        for i, (_, _, signing_input, sig) in members:
+            if isinstance(verifier, str):
+                reasons[i] = verifier
+            else:
+                pending.append(i)
+                checks.append(verifier(sig, signing_input))
+
+    for i, valid in zip(pending, await asyncio.gather(*checks), strict=True):
+        if not valid:
+            reasons[i] = "invalid_signature"
+
+    results: list[BatchVerifyResult] = []
+    for d, reason in zip(decoded, reasons, strict=True):
+        if d is not None and reason is None:
+            payload = d[1]
+            if _claims_valid(payload, iss_val, aud_val, leeway_val):
+                results.append({"payload": payload, "reason": None})
+                continue
+            reason = "expired" if _is_expired(payload, leeway_val) else "invalid_claims"
+        results.append({"payload": None, "reason": reason})
+    return results
+
+
+async def _batch_verifier(
+    config: VerifyConfig, alg: Any, kid: Any, backend: CryptoBackend
+) -> Callable[[bytes, bytes], Awaitable[bool]] | VerifyFailure:
+    """Resolve and import the key for one (alg, kid) group of verify_many().
+
+    Returns:
+        A (signature, signing input) checker bound to the imported key, or the
+        reason every token in the group is rejected
+    """
+    source = _config_key_source({"alg": alg, "kid": kid}, config)
+    if source is None:
+        return "unknown_key"
+    if isinstance(source, str):
+        return source
+    if source.secret is not None:
+        key = await _import_hmac_key(source.secret, "verify", backend)
+        return partial(backend.hmac_verify, key)
+
+    public_alg = _asymmetric_alg(alg, source.expected_alg)
+    if public_alg is None:
+        return "invalid_signature"
+    jwk = await _resolve_source_jwk(source, kid)
+    if not jwk:
+        return "unknown_key"
+    key = await _import_verify_key(public_alg, jwk, backend)
+    return partial(backend.verify, key)
 
 
 async def create_token_with_config(
@@ -511,6 +1105,7 @@ async def create_delegated_token_with_config(
     iss: str | None = None,
     aud: str | list[str] | None = None,
     ttl_seconds: int | None = None,
+    cache: DelegatedTokenCache | None = None,
 ) -> str:
     """Create a delegated JWT token with explicit configuration.
 
@@ -538,6 +1133,8 @@ async def create_delegated_token_with_config(
         iss: Optional per-call override for issuer
         aud: Optional per-call override for audience
         ttl_seconds: Optional per-call override for TTL
+        cache: Optional DelegatedTokenCache; a token already minted for the
+            same claims, audience and key is returned until it nears expiry
 
     Returns:
         Signed JWT token string with delegation claim
@@ -570,13 +1167,33 @@ async def create_delegated_token_with_config(
     if "department" in original_payload:
         delegated_claims["department"] = original_payload["department"]
 
-    return await sign_with_config(
-        delegated_claims,  # type: ignore[arg-type]
-        config,
-        iss=iss,
-        aud=aud,
-        ttl_seconds=ttl_seconds,
+    if cache is None:
+        return await sign_with_config(
+            delegated_claims,  # type: ignore[arg-type]
+            config,
+            iss=iss,
+            aud=aud,
+            ttl_seconds=ttl_seconds,
+        )
+
+    cache_key = cache.key(
+        delegated_claims,
+        aud or config.get("aud", ""),
+        iss or config.get("iss", ""),
+        ttl_seconds or config.get("ttl_seconds", 900),
+        _sign_identity(config),
     )
+    token = cache.get(cache_key)
+    if token is None:
+        token = await sign_with_config(
+            delegated_claims,  # type: ignore[arg-type]
+            config,
+            iss=iss,
+            aud=aud,
+            ttl_seconds=ttl_seconds,
+        )
+        cache.put(cache_key, token)
+    return token
 
 
 class AuthzOptsWithConfig(TypedDict, total=False):
@@ -620,11 +1237,14 @@ class AuthUser(TypedDict, total=False):
 async def check_auth_with_config(
     token: str,
     config: VerifyConfig,
-    authz_opts: AuthzOptsWithConfig | None = None,
+    authz_opts: AuthzOptsWithConfig | CompiledPolicy | None = None,
     *,
     iss: str | None = None,
     aud: str | list[str] | None = None,
     leeway: int | None = None,
+    cache: VerifiedTokenCache | None = None,
+    strategy: VerifyStrategy = "signature_first",
+    prescreen: bool = False,
 ) -> AuthUser | None:
     """Verify and authorize a JWT token with explicit configuration.
 
@@ -645,58 +1265,77 @@ async def check_auth_with_config(
     Args:
         token: JWT token string to verify
         config: Explicit JWT configuration
-        authz_opts: Authorization policy requirements
+        authz_opts: Authorization policy requirements, or a CompiledPolicy
+            (see PolicyBuilder.compile()) to skip per-call preparation
         iss: Optional per-call override for issuer
         aud: Optional per-call override for audience
         leeway: Optional per-call override for clock skew tolerance
+        cache: Optional VerifiedTokenCache passed to verify_with_config()
+        strategy: Check order passed to verify_with_config()
+        prescreen: Reject tokens whose unverified permissions and roles cannot
+            satisfy authz_opts before doing any signature work. Tokens that
+            pass are verified and authorized as usual.
 
     Returns:
         AuthUser if valid and authorized, None otherwise
     """
-    payload = await verify_with_config(token, config, iss=iss, aud=aud, leeway=leeway)
+    rules = _compiled_policy(authz_opts)
+    if prescreen and not _prescreen(token, rules):
+        return None
+    payload = await verify_with_config(
+        token,
+        config,
+        iss=iss,
+        aud=aud,
+        leeway=leeway,
+        cache=cache,
+        strategy=strategy,
+    )
     if not payload:
         return None
+    return _authorize(payload, rules)
 
-    opts = authz_opts or {}
-    perms = payload.get("permissions", [])
-    roles = payload.get("roles", [])
-
-    # Check all required permissions
-    if opts.get("require_all_permissions") and not all(
-        p in perms for p in opts["require_all_permissions"]
-    ):
-        return None
 
-    # Check any required permission
-    if opts.get("require_any_permission") and not any(
-        p in perms for p in opts["require_any_permission"]
-    ):
-        return None
+def check_auth_with_config_sync(
+    token: str,
+    config: VerifyConfig,
+    authz_opts: AuthzOptsWithConfig | CompiledPolicy | None = None,
+    *,
+    iss: str | None = None,
+    aud: str | list[str] | None = None,
+    leeway: int | None = None,
+    cache: VerifiedTokenCache | None = None,
+    strategy: VerifyStrategy = "signature_first",
+    prescreen: bool = False,
+) -> AuthUser | None:
+    """Synchronous check_auth_with_config on the native backend.
 
-    # Check all required roles
-    if opts.get("require_roles_all") and not all(
-        r in roles for r in opts["require_roles_all"]
-    ):
+    Runs without an event loop, for sync frameworks (Flask, WSGI) on CPython
+    hosts. Arguments and return value match check_auth_with_config().
+    """
+    rules = _compiled_policy(authz_opts)
+    if prescreen and not _prescreen(token, rules):
         return None
-
-    # Check any required role
-    if opts.get("require_roles_any") and not any(
-        r in roles for r in opts["require_roles_any"]
-    ):
+    payload = verify_with_config_sync(
+        token,
+        config,
+        iss=iss,
+        aud=aud,
+        leeway=leeway,
+        cache=cache,
+        strategy=strategy,
+    )
+    if not payload:
         return None
+    return _authorize(payload, rules)
 
-    # Check custom predicates
-    for pred in opts.get("predicates", []):
-        if not pred(payload):
-            return None
 
-    return {
-        "sub": payload.get("sub"),
-        "permissions": perms,
-        "roles": roles,
-        "jti": payload.get("jti"),
-        "payload": payload,
-    }
+def _compiled_policy(
+    authz_opts: AuthzOptsWithConfig | CompiledPolicy | None,
+) -> CompiledPolicy:
+    if isinstance(authz_opts, CompiledPolicy):
+        return authz_opts
+    return CompiledPolicy.from_options(authz_opts or {})
 
 
 def create_hs512_config(
@@ -843,12 +1482,32 @@ def create_jwks_url_verify_config(
     ttl_seconds: int = 900,
     leeway: int = 90,
     cache_ttl: int | None = None,
+    max_stale: int | None = None,
+    fetch_timeout: float | None = None,
 ) -> JWKSUrlVerifyConfig:
-    """Helper function to create JWKS URL verification config."""
+    """Helper function to create JWKS URL verification config.
+
+    Args:
+        jwks_url: HTTPS URL of the JWKS endpoint
+        iss: Token issuer
+        aud: Token audience (string or list)
+        alg: Expected token algorithm (default: EdDSA)
+        ttl_seconds: Token lifetime in seconds (default: 900 = 15 minutes)
+        leeway: Clock skew tolerance in seconds (default: 90)
+        cache_ttl: Seconds to cache the fetched JWKS (default: 300)
+        max_stale: Seconds past cache_ttl to serve stale keys while refreshing
+            in the background (default: None = always block on refresh)
+        fetch_timeout: Seconds before a JWKS HTTP fetch is abandoned (default: 5)
+
+    Returns:
+        JWKSUrlVerifyConfig
+    """
     return {
         "alg": alg,
         "jwks_url": jwks_url,
         "cache_ttl": cache_ttl,
+        "max_stale": max_stale,
+        "fetch_timeout": fetch_timeout,
         "iss": iss,
         "aud": aud,
         "ttl_seconds": ttl_seconds,
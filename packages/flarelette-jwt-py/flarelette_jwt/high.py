@@ -12,13 +12,16 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any, Protocol, TypedDict
 
-from .sign import sign
-from .verify import verify
+from .authz import CompiledPolicy, PermissionRegistry, _authorize, _prescreen
+from .env import env_config
+from .sign import sign, sign_many
+from .verify import verify, verify_sync
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Sequence
 
     from .env import JwtPayload
+    from .token_cache import DelegatedTokenCache, VerifiedTokenCache
 
 
 class AuthUser(TypedDict, total=False):
@@ -43,7 +46,9 @@ class PolicyBuilder(Protocol):
     Fluent API for composing authorization requirements used by check_auth().
     Chain methods to combine multiple requirements (all must pass for authorization).
     Enables readable, declarative policy definitions that separate authorization
-    logic from business logic.
+    logic from business logic. build() returns keyword arguments for
+    check_auth(); compile() returns an immutable CompiledPolicy to define once
+    and pass to check_auth(policy=...) or check_auth_with_config().
     """
 
     def base(self, **b: Any) -> PolicyBuilder: ...
@@ -53,6 +58,7 @@ class PolicyBuilder(Protocol):
     def roles_any(self, *r: str) -> PolicyBuilder: ...
     def where(self, fn: Callable[[JwtPayload], bool]) -> PolicyBuilder: ...
     def build(self) -> dict[str, Any]: ...
+    def compile(self, registry: PermissionRegistry | None = None) -> CompiledPolicy: ...
 
 
 async def create_token(
@@ -83,6 +89,7 @@ async def create_delegated_token(
     iss: str | None = None,
     aud: str | list[str] | None = None,
     ttl_seconds: int | None = None,
+    cache: DelegatedTokenCache | None = None,
 ) -> str:
     """Create a delegated JWT token following RFC 8693 actor claim pattern.
 
@@ -118,6 +125,8 @@ async def create_delegated_token(
         iss: Optional issuer override (defaults to env JWT_ISS)
         aud: Optional audience override (defaults to env JWT_AUD)
         ttl_seconds: Optional TTL override (defaults to env JWT_TTL_SECONDS)
+        cache: Optional DelegatedTokenCache; a token already minted for the
+            same claims, audience and key is returned until it nears expiry
 
     Returns:
         Signed JWT token string with delegation claim
@@ -126,6 +135,87 @@ async def create_delegated_token(
         - RFC 8693: OAuth 2.0 Token Exchange
         - security.md: Service Delegation Pattern section
     """
+    delegated_claims = _delegated_claims(original_payload, actor_service)
+
+    if cache is None:
+        # Type cast to JwtPayload for type checking - safe because we control the structure
+        return await sign(delegated_claims, iss=iss, aud=aud, ttl_seconds=ttl_seconds)  # type: ignore[arg-type]
+
+    config = env_config()
+    cfg = config.common
+    cache_key = cache.key(
+        delegated_claims,
+        aud or cfg["aud"],
+        iss or cfg["iss"],
+        int(ttl_seconds or cfg["ttl_seconds"]),
+        config.sign_identity,
+    )
+    token = cache.get(cache_key)
+    if token is None:
+        token = await sign(delegated_claims, iss=iss, aud=aud, ttl_seconds=ttl_seconds)  # type: ignore[arg-type]
+        cache.put(cache_key, token)
+    return token
+
+
+async def create_tokens_for_audiences(
+    claims: JwtPayload,
+    audiences: Sequence[str | list[str]],
+    *,
+    iss: str | None = None,
+    ttl_seconds: int | None = None,
+) -> list[str]:
+    """Create one signed JWT token per audience from the same claims.
+
+    Cheaper than calling create_token() per audience: claims are serialized
+    and the key is imported once.
+
+    Args:
+        claims: Claims shared by every token
+        audiences: Audience (string or list) of each token to mint
+        iss: Optional issuer override
+        ttl_seconds: Optional TTL override in seconds
+
+    Returns:
+        Signed JWT token strings, one per audience in order
+    """
+    return await sign_many(claims, audiences, iss=iss, ttl_seconds=ttl_seconds)
+
+
+async def create_delegated_tokens_for_audiences(
+    original_payload: JwtPayload,
+    actor_service: str,
+    audiences: Sequence[str | list[str]],
+    *,
+    iss: str | None = None,
+    ttl_seconds: int | None = None,
+) -> list[str]:
+    """Create one delegated JWT token per downstream audience.
+
+    Same claims as create_delegated_token(), minted for every audience in a
+    single call (see create_tokens_for_audiences()).
+
+    Args:
+        original_payload: The verified JWT payload from external auth (e.g., Auth0)
+        actor_service: Identifier of the service creating these delegated tokens
+        audiences: Audience (string or list) of each token to mint
+        iss: Optional issuer override (defaults to env JWT_ISS)
+        ttl_seconds: Optional TTL override (defaults to env JWT_TTL_SECONDS)
+
+    Returns:
+        Signed JWT token strings with delegation claim, one per audience in order
+    """
+    delegated_claims = _delegated_claims(original_payload, actor_service)
+    return await sign_many(
+        delegated_claims,  # type: ignore[arg-type]
+        audiences,
+        iss=iss,
+        ttl_seconds=ttl_seconds,
+    )
+
+
+def _delegated_claims(
+    original_payload: JwtPayload, actor_service: str
+) -> dict[str, Any]:
     # Preserve original user context and permissions
     delegated_claims: dict[str, Any] = {
         "sub": original_payload.get("sub"),  # Original end user
@@ -159,8 +249,7 @@ async def create_delegated_token(
     if original_payload.get("department"):
         delegated_claims["department"] = original_payload["department"]
 
-    # Type cast to JwtPayload for type checking - safe because we control the structure
-    return await sign(delegated_claims, iss=iss, aud=aud, ttl_seconds=ttl_seconds)  # type: ignore[arg-type]
+    return delegated_claims
 
 
 async def check_auth(
@@ -174,6 +263,9 @@ async def check_auth(
     require_roles_all: list[str] | None = None,
     require_roles_any: list[str] | None = None,
     predicates: list[Callable[[JwtPayload], bool]] | None = None,
+    cache: VerifiedTokenCache | None = None,
+    prescreen: bool = False,
+    policy: CompiledPolicy | None = None,
 ) -> AuthUser | None:
     """Verify and authorize a JWT token with policy enforcement.
 
@@ -187,33 +279,97 @@ async def check_auth(
         require_roles_all: All roles that must be present
         require_roles_any: At least one of these roles must be present
         predicates: Custom validation functions
+        cache: Optional VerifiedTokenCache passed to verify()
+        prescreen: Reject tokens whose unverified permissions and roles cannot
+            satisfy the requirements before doing any signature work. Tokens
+            that pass are verified and authorized as usual.
+        policy: Precompiled policy (see PolicyBuilder.compile()), used instead
+            of the requirement arguments above
 
     Returns:
         AuthUser if valid and authorized, None otherwise
+
+    Raises:
+        ValueError: If both policy and requirement arguments are given
     """
-    payload = await verify(token, iss=iss, aud=aud, leeway=leeway)
-    if not payload:
-        return None
-    perms = payload.get("permissions") or []
-    roles = payload.get("roles") or []
-    if require_all_permissions and not set(require_all_permissions).issubset(perms):
+    rules = _resolve_policy(
+        policy,
+        require_all_permissions,
+        require_any_permission,
+        require_roles_all,
+        require_roles_any,
+        predicates,
+    )
+    if prescreen and not _prescreen(token, rules):
         return None
-    if require_any_permission and not set(require_any_permission).intersection(perms):
+    payload = await verify(token, iss=iss, aud=aud, leeway=leeway, cache=cache)
+    if not payload:
         return None
-    if require_roles_all and not set(require_roles_all).issubset(roles):
+    return _authorize(payload, rules)
+
+
+def check_auth_sync(
+    token: str,
+    *,
+    iss: str | None = None,
+    aud: str | list[str] | None = None,
+    leeway: int | None = None,
+    require_all_permissions: list[str] | None = None,
+    require_any_permission: list[str] | None = None,
+    require_roles_all: list[str] | None = None,
+    require_roles_any: list[str] | None = None,
+    predicates: list[Callable[[JwtPayload], bool]] | None = None,
+    cache: VerifiedTokenCache | None = None,
+    prescreen: bool = False,
+    policy: CompiledPolicy | None = None,
+) -> AuthUser | None:
+    """Synchronous check_auth() on the native backend.
+
+    Runs without an event loop, for sync frameworks (Flask, WSGI) on CPython
+    hosts. Arguments and return value match check_auth().
+    """
+    rules = _resolve_policy(
+        policy,
+        require_all_permissions,
+        require_any_permission,
+        require_roles_all,
+        require_roles_any,
+        predicates,
+    )
+    if prescreen and not _prescreen(token, rules):
         return None
-    if require_roles_any and not set(require_roles_any).intersection(roles):
+    payload = verify_sync(token, iss=iss, aud=aud, leeway=leeway, cache=cache)
+    if not payload:
         return None
-    if predicates:
-        for fn in predicates:
-            if not fn(payload):
-                return None
-    return {
-        "sub": payload.get("sub"),
-        "permissions": perms,
-        "roles": roles,
-        "payload": payload,
-    }
+    return _authorize(payload, rules)
+
+
+def _resolve_policy(
+    policy: CompiledPolicy | None,
+    require_all_permissions: list[str] | None,
+    require_any_permission: list[str] | None,
+    require_roles_all: list[str] | None,
+    require_roles_any: list[str] | None,
+    predicates: list[Callable[[JwtPayload], bool]] | None,
+) -> CompiledPolicy | None:
+    """Return the compiled policy, compiling requirement arguments if given."""
+    if not (
+        require_all_permissions
+        or require_any_permission
+        or require_roles_all
+        or require_roles_any
+        or predicates
+    ):
+        return policy
+    if policy is not None:
+        raise ValueError("Pass either policy or requirement arguments, not both")
+    return CompiledPolicy(
+        require_all_permissions=frozenset(require_all_permissions or ()),
+        require_any_permission=frozenset(require_any_permission or ()),
+        require_roles_all=frozenset(require_roles_all or ()),
+        require_roles_any=frozenset(require_roles_any or ()),
+        predicates=tuple(predicates or ()),
+    )
 
 
 def policy() -> PolicyBuilder:
@@ -257,4 +413,7 @@ def policy() -> PolicyBuilder:
         def build(self) -> dict[str, Any]:
             return opts
 
+        def compile(self, registry: PermissionRegistry | None = None) -> CompiledPolicy:
+            return CompiledPolicy.from_options(opts, registry)
+
     return Builder()
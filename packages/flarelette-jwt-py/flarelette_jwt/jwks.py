@@ -0,0 +1,478 @@
+"""
+JSON Web Key Set (JWKS) Utilities
+
+This module provides functions to fetch and cache JWKS documents from HTTP
+endpoints and to look up keys by key ID (kid). The cache is shared by the
+environment-driven and explicit-config verification paths.
+
+@module jwks
+
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+import time
+from typing import TYPE_CHECKING, Any, TypedDict
+from urllib.error import HTTPError
+from urllib.parse import urlparse
+from urllib.request import Request, urlopen
+
+from .cache import LruCache
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# Default JWKS cache TTL in seconds (matches the TypeScript fetchJwksFromUrl)
+DEFAULT_JWKS_CACHE_TTL = 300
+
+# HTTP fetch limits (match the TypeScript fetchJwksFromUrl)
+DEFAULT_JWKS_FETCH_TIMEOUT = 5.0
+MAX_JWKS_SIZE_BYTES = 100 * 1024
+
+# Minimum seconds between forced refreshes triggered by an unknown kid
+JWKS_REFETCH_INTERVAL = 30
+
+# Seconds a kid missing from a freshly fetched JWKS is remembered as unknown
+JWKS_NEGATIVE_TTL = 60
+UNKNOWN_KID_CACHE_SIZE = 1024
+
+
+class _JwksCacheEntry(TypedDict):
+    """Cached JWKS document for a single URL."""
+
+    keys: list[dict[str, Any]]
+    keys_by_kid: dict[str, dict[str, Any]]  # Index built once per fetch
+    fetched_at: float  # time.monotonic() of the fetch
+    ttl: float  # Seconds the entry is served without refetching
+    etag: str | None  # ETag validator for If-None-Match
+    last_modified: str | None  # Last-Modified validator for If-Modified-Since
+
+
+class _JwksResponse(TypedDict):
+    """Result of a (possibly conditional) JWKS HTTP request."""
+
+    keys: list[dict[str, Any]] | None  # None when the server answered 304
+    etag: str | None
+    last_modified: str | None
+    max_age: int | None  # Cache-Control max-age, if the server sent one
+
+
+# HTTP JWKS cache, keyed by URL
+_jwks_cache: dict[str, _JwksCacheEntry] = {}
+
+_MAX_AGE_RE = re.compile(r"(?:^|,)\s*max-age\s*=\s*\"?(\d+)\"?", re.IGNORECASE)
+
+# In-flight JWKS fetches, keyed by URL. Concurrent cache misses await the same
+# fetch instead of each hitting the JWKS endpoint.
+_jwks_inflight: dict[str, asyncio.Future[_JwksCacheEntry]] = {}
+
+# Negative cache of (url, kid) pairs -> monotonic expiry time
+_unknown_kid_cache: LruCache[tuple[str, str], float] = LruCache(UNKNOWN_KID_CACHE_SIZE)
+
+
+def clear_jwks_cache() -> None:
+    """Clear the HTTP JWKS cache.
+
+    The next verification against each JWKS URL fetches a fresh key set.
+    """
+    _jwks_cache.clear()
+    _unknown_kid_cache.clear()
+
+
+def _validate_jwks_url(url: str) -> None:
+    parsed = urlparse(url)
+    if not parsed.scheme or not parsed.netloc:
+        raise ValueError("JWT_JWKS_URL must be a valid URL")
+    if parsed.scheme == "https":
+        return
+    if parsed.scheme == "http" and parsed.hostname in {"localhost", "127.0.0.1", "::1"}:
+        return
+    raise ValueError("JWT_JWKS_URL must use HTTPS (except localhost for testing)")
+
+
+async def _resolve_jwk_from_url(
+    url: str,
+    kid: str | None,
+    cache_ttl: int | None = None,
+    max_stale: int | None = None,
+    fetch_timeout: float | None = None,
+) -> dict[str, Any] | None:
+    """Look up the JWK for kid in the JWKS at url.
+
+    An unknown kid triggers one forced refresh (key rotation), rate-limited to
+    one per JWKS_REFETCH_INTERVAL per URL. Kids still missing afterwards are
+    remembered for JWKS_NEGATIVE_TTL so repeated tokens with unknown kids
+    never cause further downloads.
+
+    Returns:
+        The matching JWK, or None if the kid is absent
+    """
+    if not kid:
+        return None
+
+    ttl = _effective_ttl(cache_ttl)
+    entry = await _get_jwks_entry(url, cache_ttl, max_stale, fetch_timeout)
+    jwk, refetch = _lookup_jwk(url, kid, entry, ttl)
+    if not refetch:
+        return jwk
+    timeout = _effective_timeout(fetch_timeout)
+    entry = await asyncio.shield(_start_refresh(url, ttl, timeout))
+    return _lookup_after_refetch(url, kid, entry)
+
+
+def _resolve_jwk_from_url_sync(
+    url: str,
+    kid: str | None,
+    cache_ttl: int | None = None,
+    max_stale: int | None = None,
+    fetch_timeout: float | None = None,
+) -> dict[str, Any] | None:
+    """Blocking variant of _resolve_jwk_from_url for the sync verify API.
+
+    Shares the JWKS cache and unknown-kid handling with the async path, but
+    downloads inline with urllib. With ``max_stale`` set, an expired entry is
+    served for up to ``max_stale`` seconds past its TTL if the refresh fails.
+    """
+    if not kid:
+        return None
+
+    _validate_jwks_url(url)
+    ttl = _effective_ttl(cache_ttl)
+    timeout = _effective_timeout(fetch_timeout)
+    entry = _jwks_cache.get(url)
+    if entry is None or _age(entry) >= entry["ttl"]:
+        try:
+            entry = _refresh_jwks_sync(url, ttl, timeout)
+        except (ValueError, OSError):
+            if entry is None or not max_stale:
+                raise
+            if _age(entry) >= entry["ttl"] + max_stale:
+                raise
+
+    jwk, refetch = _lookup_jwk(url, kid, entry, ttl)
+    if not refetch:
+        return jwk
+    return _lookup_after_refetch(url, kid, _refresh_jwks_sync(url, ttl, timeout))
+
+
+def _is_unknown_kid(url: str, kid: str) -> bool:
+    negative_until = _unknown_kid_cache.get((url, kid))
+    return negative_until is not None and time.monotonic() < negative_until
+
+
+def _lookup_jwk(
+    url: str, kid: str, entry: _JwksCacheEntry, ttl: float
+) -> tuple[dict[str, Any] | None, bool]:
+    """Look kid up in a cached key set.
+
+    Returns:
+        The JWK (or None), and whether a forced refetch should be tried
+    """
+    jwk = entry["keys_by_kid"].get(kid)
+    if jwk is not None or _is_unknown_kid(url, kid):
+        return jwk, False
+    return None, _may_refetch(entry, ttl)
+
+
+def _lookup_after_refetch(
+    url: str, kid: str, entry: _JwksCacheEntry
+) -> dict[str, Any] | None:
+    jwk = entry["keys_by_kid"].get(kid)
+    if jwk is None:
+        # Only a forced refetch proves the kid unknown; a lookup that was not
+        # allowed to refetch must not hide a key published since the last one
+        _unknown_kid_cache.set((url, kid), time.monotonic() + JWKS_NEGATIVE_TTL)
+    return jwk
+
+
+def _may_refetch(entry: _JwksCacheEntry, ttl: float) -> bool:
+    # A zero TTL entry was fetched just now; only refetch older key sets
+    return ttl > 0 and _age(entry) >= JWKS_REFETCH_INTERVAL
+
+
+def _age(entry: _JwksCacheEntry) -> float:
+    return time.monotonic() - entry["fetched_at"]
+
+
+def _effective_ttl(cache_ttl: int | None) -> int:
+    return DEFAULT_JWKS_CACHE_TTL if cache_ttl is None else cache_ttl
+
+
+def _effective_timeout(fetch_timeout: float | None) -> float:
+    return DEFAULT_JWKS_FETCH_TIMEOUT if fetch_timeout is None else fetch_timeout
+
+
+async def _get_jwks_entry(
+    url: str,
+    cache_ttl: int | None,
+    max_stale: int | None,
+    fetch_timeout: float | None = None,
+) -> _JwksCacheEntry:
+    """Fetch a JWKS over HTTP, serving from the per-URL cache when fresh.
+
+    With ``max_stale`` set, an expired entry is still served for up to
+    ``max_stale`` seconds past its TTL while a background task refreshes it
+    (stale-while-revalidate). Beyond that, callers block on the refresh.
+
+    Args:
+        url: HTTPS URL of the JWKS endpoint (http allowed for localhost)
+        cache_ttl: Seconds to cache the key set (default: 300, 0 disables caching)
+        max_stale: Seconds past cache_ttl to serve stale keys while refreshing
+        fetch_timeout: Seconds before an HTTP fetch is abandoned (default: 5)
+
+    Returns:
+        Cache entry holding the key list and its kid index
+    """
+    _validate_jwks_url(url)
+
+    ttl = _effective_ttl(cache_ttl)
+    timeout = _effective_timeout(fetch_timeout)
+    cached = _jwks_cache.get(url)
+    if cached is not None:
+        age = _age(cached)
+        if age < cached["ttl"]:
+            return cached
+        if max_stale and age < cached["ttl"] + max_stale:
+            # Serve last-known keys; refresh off the request path
+            _start_refresh(url, ttl, timeout)
+            return cached
+
+    # Shield the shared fetch so one cancelled waiter does not cancel it for all
+    return await asyncio.shield(_start_refresh(url, ttl, timeout))
+
+
+def _start_refresh(
+    url: str, ttl: float, timeout: float
+) -> asyncio.Future[_JwksCacheEntry]:
+    """Start (or join) the single in-flight refresh for url."""
+    pending = _jwks_inflight.get(url)
+    if pending is None:
+        pending = asyncio.ensure_future(_refresh_jwks(url, ttl, timeout))
+        _jwks_inflight[url] = pending
+        pending.add_done_callback(_finish_refresh(url))
+    return pending
+
+
+def _finish_refresh(
+    url: str,
+) -> Callable[[asyncio.Future[_JwksCacheEntry]], None]:
+    def done(future: asyncio.Future[_JwksCacheEntry]) -> None:
+        _jwks_inflight.pop(url, None)
+        # Mark background refresh failures as retrieved; the stale entry stays
+        # cached and the next request past max_stale surfaces the error.
+        if not future.cancelled():
+            future.exception()
+
+    return done
+
+
+async def _refresh_jwks(url: str, ttl: float, timeout: float) -> _JwksCacheEntry:
+    previous = _jwks_cache.get(url) if ttl > 0 else None
+    response = await _download_jwks(url, previous, timeout)
+    return _store_jwks(url, ttl, previous, response)
+
+
+def _refresh_jwks_sync(url: str, ttl: float, timeout: float) -> _JwksCacheEntry:
+    previous = _jwks_cache.get(url) if ttl > 0 else None
+    response = _urlopen_download(url, _request_headers(previous), timeout)
+    return _store_jwks(url, ttl, previous, response)
+
+
+def _store_jwks(
+    url: str,
+    ttl: float,
+    previous: _JwksCacheEntry | None,
+    response: _JwksResponse,
+) -> _JwksCacheEntry:
+    keys = response["keys"]
+    max_age: float | None = response["max_age"]
+    if keys is None:
+        if previous is None:
+            raise ValueError("JWKS HTTP fetch returned 304 without a cached key set")
+        # Not modified: keep the parsed keys and index, extend the entry
+        keys = previous["keys"]
+        keys_by_kid = previous["keys_by_kid"]
+        response["etag"] = response["etag"] or previous["etag"]
+        response["last_modified"] = (
+            response["last_modified"] or previous["last_modified"]
+        )
+        if max_age is None:
+            # A 304 without Cache-Control keeps the stored response's policy
+            max_age = previous["ttl"]
+    else:
+        keys_by_kid = _index_by_kid(keys)
+
+    entry: _JwksCacheEntry = {
+        "keys": keys,
+        "keys_by_kid": keys_by_kid,
+        "fetched_at": time.monotonic(),
+        # The server may shorten the configured TTL, never extend it
+        "ttl": ttl if max_age is None else min(ttl, max_age),
+        "etag": response["etag"],
+        "last_modified": response["last_modified"],
+    }
+    if ttl > 0:
+        _jwks_cache[url] = entry
+    else:
+        _jwks_cache.pop(url, None)
+    return entry
+
+
+def _index_by_kid(keys: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    index: dict[str, dict[str, Any]] = {}
+    for jwk in keys:
+        kid = jwk.get("kid")
+        # SECURITY: kid is only ever used as an exact-match lookup key
+        if isinstance(kid, str) and kid:
+            index.setdefault(kid, jwk)
+    return index
+
+
+def _request_headers(previous: _JwksCacheEntry | None) -> dict[str, str]:
+    headers = {"Accept": "application/json", "User-Agent": "flarelette-jwt-py"}
+    if previous is not None:
+        if previous["etag"]:
+            headers["If-None-Match"] = previous["etag"]
+        if previous["last_modified"]:
+            headers["If-Modified-Since"] = previous["last_modified"]
+    return headers
+
+
+def _parse_max_age(cache_control: str | None) -> int | None:
+    if not cache_control:
+        return None
+    directives = cache_control.lower()
+    # no-cache allows storing but requires revalidation before every use
+    if "no-store" in directives or "no-cache" in directives:
+        return 0
+    match = _MAX_AGE_RE.search(cache_control)
+    return int(match.group(1)) if match else None
+
+
+def _js_fetch_init(headers: dict[str, str], timeout: float) -> Any:
+    """Build a fetch() init object (a plain JS object on Pyodide)."""
+    init: dict[str, Any] = {"method": "GET", "headers": headers}
+    try:
+        from js import AbortSignal, Object  # noqa: PLC0415
+        from pyodide.ffi import to_js  # noqa: PLC0415
+    except ImportError:
+        return init
+    init["signal"] = AbortSignal.timeout(int(timeout * 1000))
+    return to_js(init, dict_converter=Object.fromEntries)
+
+
+def _check_content_length(value: str | None) -> None:
+    if value and value.isdigit() and int(value) > MAX_JWKS_SIZE_BYTES:
+        raise ValueError("JWKS response exceeds size limit (100KB)")
+
+
+async def _download_jwks(
+    url: str, previous: _JwksCacheEntry | None, timeout: float
+) -> _JwksResponse:
+    headers = _request_headers(previous)
+    try:
+        from js import fetch as js_fetch  # noqa: PLC0415
+    except ImportError:
+        js_fetch = None
+
+    if js_fetch is not None:
+        return await _js_download(js_fetch, url, headers, timeout)
+    # urlopen blocks; run it on the default executor so the event loop keeps
+    # serving other requests while the JWKS endpoint responds
+    return await asyncio.to_thread(_urlopen_download, url, headers, timeout)
+
+
+async def _js_download(
+    js_fetch: Any, url: str, headers: dict[str, str], timeout: float
+) -> _JwksResponse:
+    response = await js_fetch(url, _js_fetch_init(headers, timeout))
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    max_age = _parse_max_age(response.headers.get("Cache-Control"))
+    if response.status == 304:
+        return {
+            "keys": None,
+            "etag": etag,
+            "last_modified": last_modified,
+            "max_age": max_age,
+        }
+    if not response.ok:
+        raise ValueError(
+            f"JWKS HTTP fetch returned {response.status}: {response.statusText}"
+        )
+    _check_content_length(response.headers.get("Content-Length"))
+    body = await _js_read_body(response)
+    return {
+        "keys": _parse_jwks_keys(body.decode("utf-8")),
+        "etag": etag,
+        "last_modified": last_modified,
+        "max_age": max_age,
+    }
+
+
+async def _js_read_body(response: Any) -> bytes:
+    """Read a fetch() body chunk by chunk, stopping once it exceeds the limit.
+
+    Content-Length is optional (e.g. chunked responses), so the limit is
+    enforced on the bytes actually received rather than after buffering.
+    """
+    if response.body is None:
+        return b""
+    reader = response.body.getReader()
+    chunks: list[bytes] = []
+    size = 0
+    while True:
+        result = await reader.read()
+        if result.done:
+            return b"".join(chunks)
+        chunk = result.value.to_bytes()
+        size += len(chunk)
+        if size > MAX_JWKS_SIZE_BYTES:
+            await reader.cancel()
+            raise ValueError("JWKS response exceeds size limit (100KB)")
+        chunks.append(chunk)
+
+
+def _urlopen_download(
+    url: str, headers: dict[str, str], timeout: float
+) -> _JwksResponse:
+    try:
+        with urlopen(  # noqa: S310
+            Request(url, headers=headers), timeout=timeout
+        ) as response:
+            status = getattr(response, "status", response.getcode())
+            if status < 200 or status >= 300:
+                raise ValueError(f"JWKS HTTP fetch returned {status}")
+            _check_content_length(response.headers.get("Content-Length"))
+            # Read at most one byte past the limit instead of the whole body
+            body = response.read(MAX_JWKS_SIZE_BYTES + 1)
+            if len(body) > MAX_JWKS_SIZE_BYTES:
+                raise ValueError("JWKS response exceeds size limit (100KB)")
+            return {
+                "keys": _parse_jwks_keys(body.decode("utf-8")),
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "max_age": _parse_max_age(response.headers.get("Cache-Control")),
+            }
+    except HTTPError as e:
+        if e.code != 304:
+            raise ValueError(f"JWKS HTTP fetch returned {e.code}") from e
+        return {
+            "keys": None,
+            "etag": e.headers.get("ETag"),
+            "last_modified": e.headers.get("Last-Modified"),
+            "max_age": _parse_max_age(e.headers.get("Cache-Control")),
+        }
+    except TimeoutError as e:
+        raise ValueError(f"JWKS HTTP fetch timed out after {timeout}s") from e
+
+
+def _parse_jwks_keys(text: str) -> list[dict[str, Any]]:
+    data = json.loads(text)
+    keys = data.get("keys")
+    if not isinstance(keys, list):
+        raise ValueError("Invalid JWKS response: missing keys array")
+    return keys
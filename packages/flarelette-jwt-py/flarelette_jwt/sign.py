@@ -10,16 +10,22 @@ It supports custom claims and configuration overrides.
 
 from __future__ import annotations
 
-import base64
-import json
-import time
+from typing import TYPE_CHECKING, Any
 
-# NOTE: 'js' module imported lazily inside functions - only available in Cloudflare Workers
-from .env import AlgType, JwtPayload, common, get_hs_secret_bytes, mode
+from .env import env_config
+from .explicit import (
+    _claims_body,
+    _eddsa_header,
+    _sign_claims,
+    _sign_claims_for_audiences,
+    _sign_claims_sync,
+    _SigningKey,
+)
 
+if TYPE_CHECKING:
+    from collections.abc import Sequence
 
-def _b64url(b: bytes) -> str:
-    return base64.urlsafe_b64encode(b).decode("utf-8").rstrip("=")
+    from .env import EnvConfig, JwtPayload
 
 
 async def sign(
@@ -41,40 +47,78 @@ async def sign(
         Signed JWT token string
 
     Raises:
-        RuntimeError: If EdDSA signing is attempted (not supported in Python)
+        RuntimeError: If EdDSA mode has no private key configured, or runs on
+            CPython without the optional cryptography dependency
     """
-    m: AlgType = mode("producer")
-    cfg = common()
-    iss = iss or cfg["iss"]
-    aud = aud or cfg["aud"]
-    ttl = int(ttl_seconds or cfg["ttl_seconds"])
-    now = int(time.time())
-    body = dict(payload)
-    body.setdefault("iss", iss)
-    body.setdefault("aud", aud)
-    body.setdefault("iat", now)
-    body.setdefault("exp", now + ttl)
-
-    if m == "HS512":
-        # Lazy import - only available in Cloudflare Workers/Pyodide runtime
-        from js import crypto  # noqa: PLC0415
-        from pyodide.ffi import to_py  # noqa: PLC0415
-
-        header = {"alg": "HS512", "typ": "JWT"}
-        h = _b64url(json.dumps(header, separators=(",", ":")).encode())
-        p = _b64url(json.dumps(body, separators=(",", ":")).encode())
-        signing_input = f"{h}.{p}".encode()
-        key = await crypto.subtle.importKey(
-            "raw",
-            get_hs_secret_bytes(),
-            {"name": "HMAC", "hash": "SHA-512"},
-            False,
-            ["sign"],
-        )
-        sig = await crypto.subtle.sign({"name": "HMAC"}, key, signing_input)
-
-        return f"{h}.{p}.{_b64url(bytes(to_py(sig)))}"
-    else:
-        raise RuntimeError(
-            "EdDSA signing is not supported in Workers Python; produce tokens with the Node gateway"
-        )
+    config = env_config()
+    body = _claims_from_env(payload, config, iss, aud, ttl_seconds)
+    return await _sign_claims(_env_signing_key(config), body)
+
+
+def sign_sync(
+    payload: JwtPayload,
+    *,
+    iss: str | None = None,
+    aud: str | list[str] | None = None,
+    ttl_seconds: int | None = None,
+) -> str:
+    """Synchronous sign() on the native backend.
+
+    Runs without an event loop, for sync frameworks (Flask, WSGI) on CPython
+    hosts. Arguments, return value and errors match sign().
+    """
+    config = env_config()
+    body = _claims_from_env(payload, config, iss, aud, ttl_seconds)
+    return _sign_claims_sync(_env_signing_key(config), body)
+
+
+async def sign_many(
+    payload: JwtPayload,
+    audiences: Sequence[str | list[str]],
+    *,
+    iss: str | None = None,
+    ttl_seconds: int | None = None,
+) -> list[str]:
+    """Sign one token per audience from the same claims.
+
+    Serializes the header and shared claims once and imports the key once;
+    see sign_many_with_config().
+
+    Args:
+        payload: Claims shared by every token
+        audiences: Audience (string or list) of each token to mint
+        iss: Optional issuer override
+        ttl_seconds: Optional TTL override in seconds
+
+    Returns:
+        Signed JWT token strings, one per audience in order
+
+    Raises:
+        RuntimeError: If EdDSA mode has no private key configured, or runs on
+            CPython without the optional cryptography dependency
+    """
+    config = env_config()
+    body = _claims_from_env(payload, config, iss, None, ttl_seconds)
+    return await _sign_claims_for_audiences(_env_signing_key(config), body, audiences)
+
+
+def _claims_from_env(
+    payload: JwtPayload,
+    config: EnvConfig,
+    iss: str | None,
+    aud: str | list[str] | None,
+    ttl_seconds: int | None,
+) -> dict[str, Any]:
+    cfg = config.common
+    return _claims_body(
+        payload,
+        iss or cfg["iss"],
+        aud or cfg["aud"],
+        int(ttl_seconds or cfg["ttl_seconds"]),
+    )
+
+
+def _env_signing_key(config: EnvConfig) -> _SigningKey:
+    if config.mode("producer") == "HS512":
+        return _SigningKey({"alg": "HS512", "typ": "JWT"}, secret=config.hs_secret)
+    return _SigningKey(_eddsa_header(config.kid), private_jwk=config.private_jwk)
@@ -0,0 +1,166 @@
+"""
+Precompiled Token Templates
+
+This module provides TokenTemplate, which mints many tokens that share most
+of their claims. The header segment and the fixed claims are encoded once;
+minting serializes and base64-encodes only iat, exp and the per-token claims.
+
+@module template
+
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import time
+from typing import TYPE_CHECKING, Any
+
+from .backend import NATIVE, get_crypto_backend
+from .explicit import (
+    _b64url,
+    _eddsa_header,
+    _hs512_secret,
+    _import_hmac_key,
+    _import_hmac_key_sync,
+    _import_sign_key,
+    _import_sign_key_sync,
+)
+
+if TYPE_CHECKING:
+    from .env import JwtPayload
+    from .explicit import SignConfig
+
+_JSON_SEPARATORS = (",", ":")
+
+
+class TokenTemplate:
+    """Mints tokens from a fixed claim set plus a few per-token claims.
+
+    The fixed claims (including iss and aud) are serialized into a JSON prefix
+    padded with whitespace to a multiple of 3 bytes, so its base64url form
+    can be computed once and concatenated with the encoding of the varying
+    tail. On the native backend the HS512 state after the constant part of
+    the signing input is also kept, so each token hashes only its tail.
+
+    Tokens are byte-for-byte different from sign_with_config() output (claim
+    order and padding whitespace) but carry the same claims.
+
+    Example:
+        >>> template = TokenTemplate(config, {'permissions': ['read:data']})
+        >>> token = await template.mint({'sub': 'user123'})
+
+    Attributes:
+        ttl_seconds: Lifetime of minted tokens
+    """
+
+    def __init__(
+        self,
+        config: SignConfig,
+        claims: JwtPayload | None = None,
+        *,
+        iss: str | None = None,
+        aud: str | list[str] | None = None,
+        ttl_seconds: int | None = None,
+    ) -> None:
+        """Precompute the encoded header and fixed claims.
+
+        Args:
+            config: Explicit JWT configuration
+            claims: Claims shared by every minted token; iat and exp are
+                always set per token and are ignored here
+            iss: Optional override for issuer
+            aud: Optional override for audience
+            ttl_seconds: Optional override for TTL
+
+        Raises:
+            ValueError: If the HS512 secret is too short (< 64 bytes)
+        """
+        self.ttl_seconds = ttl_seconds or config.get("ttl_seconds", 900)
+
+        self._secret: bytes | None = None
+        self._private_jwk: dict[str, Any] | None = None
+        if config["alg"] == "HS512":
+            self._secret = _hs512_secret(config)
+            header: dict[str, Any] = {"alg": "HS512", "typ": "JWT"}
+        else:
+            self._private_jwk = config["private_jwk"]
+            header = _eddsa_header(config.get("kid"))
+
+        fixed: dict[str, Any] = {
+            k: v for k, v in (claims or {}).items() if k not in ("iat", "exp")
+        }
+        fixed.setdefault("iss", iss or config.get("iss", ""))
+        fixed.setdefault("aud", aud or config.get("aud", ""))
+        self._fixed_names = frozenset(fixed)
+
+        # '{"iss":...,"aud":...,' padded so the base64 of the prefix never
+        # spills into the encoding of the per-token tail
+        prefix = json.dumps(fixed, separators=_JSON_SEPARATORS)[:-1] + ","
+        prefix += " " * (-len(prefix.encode()) % 3)
+        h = _b64url(json.dumps(header, separators=_JSON_SEPARATORS).encode())
+        p = base64.urlsafe_b64encode(prefix.encode()).decode("utf-8")
+        self._head = f"{h}.{p}"
+        self._native_state: Any = None
+
+    async def mint(self, claims: JwtPayload | None = None) -> str:
+        """Sign a token with the fixed claims plus claims.
+
+        Args:
+            claims: Per-token claims (e.g. sub, jti); must not repeat a fixed
+                claim
+
+        Returns:
+            Signed JWT token string
+
+        Raises:
+            ValueError: If claims repeats a fixed claim
+            RuntimeError: If EdDSA signing is attempted on CPython without the
+                optional cryptography dependency
+        """
+        signing_input = self._head + self._tail(claims)
+        backend = get_crypto_backend()
+        if self._private_jwk is not None:
+            key = await _import_sign_key("EdDSA", self._private_jwk, backend)
+            sig = await backend.sign(key, signing_input.encode())
+        elif backend is NATIVE:
+            sig = self._native_hmac(signing_input)
+        else:
+            key = await _import_hmac_key(self._secret or b"", "sign", backend)
+            sig = await backend.hmac_sign(key, signing_input.encode())
+        return f"{signing_input}.{_b64url(sig)}"
+
+    def mint_sync(self, claims: JwtPayload | None = None) -> str:
+        """Synchronous mint() on the native backend.
+
+        Arguments, return value and errors match mint().
+        """
+        signing_input = self._head + self._tail(claims)
+        if self._private_jwk is not None:
+            key = _import_sign_key_sync("EdDSA", self._private_jwk)
+            sig = NATIVE.sign_sync(key, signing_input.encode())
+        else:
+            sig = self._native_hmac(signing_input)
+        return f"{signing_input}.{_b64url(sig)}"
+
+    def _tail(self, claims: JwtPayload | None) -> str:
+        """Encode iat, exp and the per-token claims closing the payload."""
+        if claims and not self._fixed_names.isdisjoint(claims):
+            repeated = sorted(self._fixed_names.intersection(claims))
+            raise ValueError(f"Claims already fixed by the template: {repeated}")
+        now = int(time.time())
+        body: dict[str, Any] = {"iat": now, "exp": now + self.ttl_seconds}
+        if claims:
+            body.update(claims)
+        tail = json.dumps(body, separators=_JSON_SEPARATORS)[1:]
+        return _b64url(tail.encode())
+
+    def _native_hmac(self, signing_input: str) -> bytes:
+        """HS512 over signing_input, resuming after the precomputed head."""
+        if self._native_state is None:
+            state = _import_hmac_key_sync(self._secret or b"", "sign").copy()
+            state.update(self._head.encode())
+            self._native_state = state
+        return NATIVE.hmac_sign_sync(
+            self._native_state, signing_input[len(self._head) :].encode()
+        )
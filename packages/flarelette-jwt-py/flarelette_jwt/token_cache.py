@@ -0,0 +1,279 @@
+"""
+Verified-Token Result and Minted-Token Caches
+
+This module provides an opt-in cache of verified token payloads. Clients
+typically reuse one bearer token for many requests; with a cache passed to
+verify() (or verify_with_config(), check_auth(), ...) repeat presentations
+skip decoding, key import and signature verification. Time-based and
+issuer/audience claims are still re-checked on every hit.
+
+The same cache briefly remembers deterministic rejections (malformed tokens,
+bad signatures, expired tokens), so a replayed forged or expired token is
+turned away with a dictionary lookup instead of another verification.
+
+DelegatedTokenCache is the producer-side counterpart: it keeps minted
+delegated tokens so a gateway re-signs only when a token nears expiry.
+
+@module token_cache
+
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Literal, NamedTuple
+
+from .cache import LruCache
+from .util import is_expiring_soon, parse
+
+if TYPE_CHECKING:
+    from .env import JwtPayload
+
+DEFAULT_TOKEN_CACHE_ENTRIES = 1024
+DEFAULT_TOKEN_CACHE_BYTES = 1024 * 1024
+DEFAULT_REJECTION_CACHE_ENTRIES = 256
+DEFAULT_REJECTION_TTL = 30.0
+DEFAULT_DELEGATED_CACHE_ENTRIES = 1024
+DEFAULT_REFRESH_WINDOW = 60
+
+# Rejections that depend only on the token and the verifying key material,
+# so every later presentation of the same token fails the same way
+RejectReason = Literal["malformed", "invalid_signature", "expired"]
+
+# Cache key: (SHA-256 of the token, identity of the verifying key material)
+TokenCacheKey = tuple[bytes, tuple[Any, ...]]
+
+
+class _Entry(NamedTuple):
+    payload: str  # JSON text, decoded into a fresh object on every hit
+    expires_at: float  # exp + leeway; the entry is never served past this
+    size: int
+
+
+class _Rejection(NamedTuple):
+    reason: RejectReason
+    until: float  # time.monotonic() after which the rejection is forgotten
+    leeway: int  # Leeway an "expired" verdict was reached with
+
+
+class VerifiedTokenCache:
+    """LRU cache of verified payloads, bounded by entry count and bytes.
+
+    Entries are keyed by a SHA-256 digest of the full token plus the identity
+    of the key material that verified it, so the same token checked against a
+    different secret or key is never served from the cache. An entry lives at
+    most until the token's ``exp`` plus the leeway it was verified with.
+    Entry size is measured by token length, which bounds the decoded payload.
+
+    Rejected tokens are remembered separately, in a small LRU with a short
+    TTL, together with the reason they failed. Issuer, audience and
+    not-before failures are never remembered since they depend on the call.
+
+    Attributes:
+        max_entries: Maximum number of cached tokens
+        max_bytes: Maximum total size of cached tokens
+        max_rejections: Maximum number of remembered rejections
+        rejection_ttl: Seconds a rejection is remembered (0 disables)
+        hits: Lookups answered from the cache
+        misses: Lookups that required full verification
+        rejection_hits: Tokens turned away by a remembered rejection
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_TOKEN_CACHE_ENTRIES,
+        max_bytes: int = DEFAULT_TOKEN_CACHE_BYTES,
+        *,
+        max_rejections: int = DEFAULT_REJECTION_CACHE_ENTRIES,
+        rejection_ttl: float = DEFAULT_REJECTION_TTL,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be >= 1")
+        if max_rejections < 1:
+            raise ValueError("max_rejections must be >= 1")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_rejections = max_rejections
+        self.rejection_ttl = rejection_ttl
+        self.hits = 0
+        self.misses = 0
+        self.rejection_hits = 0
+        self._bytes = 0
+        self._entries: OrderedDict[TokenCacheKey, _Entry] = OrderedDict()
+        self._rejections: OrderedDict[TokenCacheKey, _Rejection] = OrderedDict()
+        # The sync verify API may share one cache across WSGI worker threads
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of the cached tokens."""
+        return self._bytes
+
+    @staticmethod
+    def key(token: str, identity: tuple[Any, ...]) -> TokenCacheKey:
+        """Build the cache key for a token verified under identity."""
+        return hashlib.sha256(token.encode()).digest(), identity
+
+    def get(self, key: TokenCacheKey) -> JwtPayload | None:
+        """Return a fresh copy of the cached payload, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if time.time() > entry.expires_at:
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        # Callers may mutate the returned payload, nested claims included, so
+        # each hit gets its own decoded object and the cached text stays intact
+        payload: JwtPayload = json.loads(entry.payload)
+        return payload
+
+    def put(
+        self, key: TokenCacheKey, token: str, payload: JwtPayload, leeway: int
+    ) -> None:
+        """Cache a verified payload until its exp plus leeway."""
+        expires_at = int(payload.get("exp", 0)) + leeway
+        size = len(token)
+        if size > self.max_bytes or time.time() > expires_at:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(json.dumps(payload), expires_at, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+
+    def rejected(self, key: TokenCacheKey, leeway: int) -> RejectReason | None:
+        """Return the remembered rejection reason for key, if any.
+
+        An "expired" verdict only applies to calls whose leeway is no larger
+        than the one it was reached with.
+        """
+        if not self._rejections:
+            return None
+        with self._lock:
+            rejection = self._rejections.get(key)
+            if rejection is None:
+                return None
+            if time.monotonic() >= rejection.until:
+                del self._rejections[key]
+                return None
+            if rejection.reason == "expired" and leeway > rejection.leeway:
+                return None
+            self.rejection_hits += 1
+            return rejection.reason
+
+    def reject(self, key: TokenCacheKey, reason: RejectReason, leeway: int) -> None:
+        """Remember that the token for key failed verification for reason."""
+        if self.rejection_ttl <= 0:
+            return
+        with self._lock:
+            self._rejections[key] = _Rejection(
+                reason, time.monotonic() + self.rejection_ttl, leeway
+            )
+            self._rejections.move_to_end(key)
+            while len(self._rejections) > self.max_rejections:
+                self._rejections.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries and rejections and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._rejections.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.rejection_hits = 0
+
+    def _remove(self, key: TokenCacheKey) -> None:
+        self._bytes -= self._entries.pop(key).size
+
+
+class DelegatedTokenCache:
+    """LRU cache of minted delegated tokens, with refresh-ahead.
+
+    Entries are keyed by a SHA-256 digest of the complete delegated claim set
+    (subject, permissions, roles, actor chain and preserved context fields),
+    the target audience, issuer and TTL, and the identity of the signing key.
+    A cached token is served until it is within refresh_window seconds of
+    expiry, after which the next call mints a replacement.
+
+    Attributes:
+        max_entries: Maximum number of cached tokens
+        refresh_window: Seconds before exp at which a token is re-minted
+        hits: Calls answered with a cached token
+        misses: Calls that minted a new token
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_DELEGATED_CACHE_ENTRIES,
+        *,
+        refresh_window: int = DEFAULT_REFRESH_WINDOW,
+    ) -> None:
+        if refresh_window < 0:
+            raise ValueError("refresh_window must be >= 0")
+        self.refresh_window = refresh_window
+        self.hits = 0
+        self.misses = 0
+        self._tokens: LruCache[bytes, tuple[str, JwtPayload]] = LruCache(max_entries)
+        self._lock = threading.Lock()
+
+    @property
+    def max_entries(self) -> int:
+        """Maximum number of cached tokens."""
+        return self._tokens.max_entries
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    @staticmethod
+    def key(claims: dict[str, Any], *scope: Any) -> bytes:
+        """Build the cache key for claims minted under scope.
+
+        Args:
+            claims: Delegated claims, before iss/aud/iat/exp are added
+            scope: Audience, issuer, TTL and signing key identity
+        """
+        canonical = json.dumps(
+            [claims, scope], sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.sha256(canonical.encode()).digest()
+
+    def get(self, key: bytes) -> str | None:
+        """Return the cached token unless it is missing or expiring soon."""
+        with self._lock:
+            entry = self._tokens.get(key)
+            if entry is None or is_expiring_soon(entry[1], self.refresh_window):
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: bytes, token: str) -> None:
+        """Cache a freshly minted token."""
+        payload = parse(token)["payload"]
+        with self._lock:
+            self._tokens.set(key, (token, payload))
+
+    def clear(self) -> None:
+        """Remove all tokens and reset the counters."""
+        with self._lock:
+            self._tokens.clear()
+            self.hits = 0
+            self.misses = 0
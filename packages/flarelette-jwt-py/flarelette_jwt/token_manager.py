@@ -0,0 +1,219 @@
+"""
+Service Token Manager
+
+This module provides TokenManager, which holds a current service token per
+(audience, claims) pair for outbound calls. Tokens are re-minted off the
+request path shortly before they expire, so callers only wait on signing for
+the very first token of each pair (or after the held one has expired).
+Held tokens are kept in an LRU bounded by max_entries.
+
+@module token_manager
+
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from .cache import LruCache
+from .explicit import sign_with_config
+from .sign import sign
+from .util import is_expiring_soon, parse
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .env import JwtPayload
+    from .explicit import SignConfig
+
+DEFAULT_REFRESH_WINDOW = 60
+DEFAULT_TOKEN_MANAGER_ENTRIES = 256
+
+
+class _Held(NamedTuple):
+    token: str
+    payload: JwtPayload
+
+
+class TokenManager:
+    """Holds current outbound service tokens and refreshes them ahead of expiry.
+
+    Tokens are minted with sign_with_config() when a config is given and with
+    the environment-based sign() otherwise. A token within refresh_window
+    seconds of expiry is still handed out while a background task mints its
+    replacement; concurrent refreshes of the same pair share one task.
+    clear() also voids mints already in flight: they sign again instead of
+    returning or holding a token minted before the call.
+
+    Example:
+        >>> manager = TokenManager({'sub': 'billing-service'})
+        >>> token = await manager.get('search-api')
+        >>> headers = {'Authorization': f'Bearer {token}'}
+
+    Attributes:
+        max_entries: Maximum number of held (audience, claims) tokens
+        refresh_window: Seconds before exp at which a token is re-minted
+    """
+
+    def __init__(
+        self,
+        claims: JwtPayload | None = None,
+        *,
+        config: SignConfig | None = None,
+        iss: str | None = None,
+        ttl_seconds: int | None = None,
+        refresh_window: int = DEFAULT_REFRESH_WINDOW,
+        max_entries: int = DEFAULT_TOKEN_MANAGER_ENTRIES,
+    ) -> None:
+        """Create a manager minting tokens from claims.
+
+        Args:
+            claims: Base claims of every token; per-call claims extend them
+            config: Explicit signing configuration (default: environment)
+            iss: Optional issuer override
+            ttl_seconds: Optional TTL override in seconds
+            refresh_window: Seconds before exp at which a token is re-minted
+            max_entries: Maximum number of held tokens; the least recently
+                used is dropped beyond it
+        """
+        if refresh_window < 0:
+            raise ValueError("refresh_window must be >= 0")
+        self.refresh_window = refresh_window
+        self._claims: dict[str, Any] = dict(claims or {})
+        self._config = config
+        self._iss = iss
+        self._ttl_seconds = ttl_seconds
+        self._held: LruCache[bytes, _Held] = LruCache(max_entries)
+        # Not bounded: every entry is a running mint, removed when it finishes
+        self._inflight: dict[bytes, asyncio.Future[str]] = {}
+        # Bumped by clear(); a mint started under an older generation re-signs
+        self._generation = 0
+
+    @property
+    def max_entries(self) -> int:
+        """Maximum number of held tokens."""
+        return self._held.max_entries
+
+    def __len__(self) -> int:
+        return len(self._held)
+
+    async def get(self, aud: str | list[str], claims: JwtPayload | None = None) -> str:
+        """Return the current token for aud, minting one only if none is usable.
+
+        Args:
+            aud: Audience of the token
+            claims: Optional claims added to the manager's base claims
+
+        Returns:
+            Signed JWT token string
+        """
+        token = self.current(aud, claims)
+        if token is not None:
+            return token
+        return await self.refresh(aud, claims)
+
+    def current(
+        self, aud: str | list[str], claims: JwtPayload | None = None
+    ) -> str | None:
+        """Return the held token for aud without ever waiting on signing.
+
+        Schedules a background refresh when the token is within the refresh
+        window and an event loop is running.
+
+        Args:
+            aud: Audience of the token
+            claims: Optional claims added to the manager's base claims
+
+        Returns:
+            The held token, or None if there is none or it has expired
+        """
+        key = self._key(aud, claims)
+        held = self._held.get(key)
+        if held is None or time.time() >= int(held.payload.get("exp", 0)):
+            return None
+        if is_expiring_soon(held.payload, self.refresh_window):
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return held.token
+            self._start_refresh(key, aud, claims)
+        return held.token
+
+    async def refresh(
+        self, aud: str | list[str], claims: JwtPayload | None = None
+    ) -> str:
+        """Mint a new token for aud now, joining any refresh already running.
+
+        Args:
+            aud: Audience of the token
+            claims: Optional claims added to the manager's base claims
+
+        Returns:
+            The newly minted token
+        """
+        key = self._key(aud, claims)
+        # Shield the shared mint so one cancelled waiter does not cancel it for all
+        return await asyncio.shield(self._start_refresh(key, aud, claims))
+
+    def clear(self) -> None:
+        """Drop all held tokens, e.g. after rotating the signing key.
+
+        Mints still in flight sign again once they finish, so neither their
+        waiters nor the held tokens see a token from before the call.
+        """
+        self._generation += 1
+        self._held.clear()
+
+    def _key(self, aud: str | list[str], claims: JwtPayload | None) -> bytes:
+        canonical = json.dumps(
+            [aud, claims or {}], sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.sha256(canonical.encode()).digest()
+
+    def _start_refresh(
+        self, key: bytes, aud: str | list[str], claims: JwtPayload | None
+    ) -> asyncio.Future[str]:
+        """Start (or join) the single in-flight mint for key."""
+        pending = self._inflight.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._mint(key, aud, claims))
+            self._inflight[key] = pending
+            pending.add_done_callback(self._finish_refresh(key))
+        return pending
+
+    def _finish_refresh(self, key: bytes) -> Callable[[asyncio.Future[str]], None]:
+        def done(future: asyncio.Future[str]) -> None:
+            self._inflight.pop(key, None)
+            # Mark background failures as retrieved; the held token stays in
+            # use and the first caller after it expires surfaces the error.
+            if not future.cancelled():
+                future.exception()
+
+        return done
+
+    async def _mint(
+        self, key: bytes, aud: str | list[str], claims: JwtPayload | None
+    ) -> str:
+        payload: Any = {**self._claims, **(claims or {})}
+        while True:
+            generation = self._generation
+            if self._config is not None:
+                token = await sign_with_config(
+                    payload,
+                    self._config,
+                    iss=self._iss,
+                    aud=aud,
+                    ttl_seconds=self._ttl_seconds,
+                )
+            else:
+                token = await sign(
+                    payload, iss=self._iss, aud=aud, ttl_seconds=self._ttl_seconds
+                )
+            if generation == self._generation:
+                break
+        self._held.set(key, _Held(token, parse(token)["payload"]))
+        return token
@@ -10,30 +10,20 @@ It includes support for audience and issuer validation, as well as clock skew to
 
 from __future__ import annotations
 
-import base64
-import json
-import time
-
-# NOTE: 'js' module imported lazily inside function - only available in Cloudflare Workers
-from .env import (
-    AlgType,
-    JwtHeader,
-    JwtPayload,
-    common,
-    get_hs_secret_bytes,
-    get_jwks_url,
-    get_public_jwk_string,
-    mode,
-)
+from typing import TYPE_CHECKING
+
+from .env import env_config
 from .explicit import (
-    _fetch_jwks_from_url,
-    _find_jwk_by_kid,
-    _verify_asymmetric_signature,
+    _check_signature,
+    _check_signature_sync,
+    _KeySource,
+    _plan_verification,
+    _settle_verification,
 )
 
-
-def _b64url_decode(s: str) -> bytes:
-    return base64.urlsafe_b64decode(s + "=" * (-len(s) % 4))
+if TYPE_CHECKING:
+    from .env import EnvConfig, JwtHeader, JwtPayload
+    from .token_cache import RejectReason, VerifiedTokenCache
 
 
 async def verify(
@@ -42,6 +32,7 @@ async def verify(
     iss: str | None = None,
     aud: str | list[str] | None = None,
     leeway: int | None = None,
+    cache: VerifiedTokenCache | None = None,
 ) -> JwtPayload | None:
     """Verify a JWT token with HS512 or EdDSA algorithm.
 
@@ -50,67 +41,89 @@ async def verify(
         iss: Optional issuer override
         aud: Optional audience override (string or list)
         leeway: Optional clock skew tolerance override in seconds
+        cache: Optional VerifiedTokenCache; repeat tokens skip signature
+            verification while their claims are still re-checked, and
+            replayed malformed, forged or expired tokens are rejected early
 
     Returns:
         Decoded payload if valid, None otherwise
     """
-    m: AlgType = mode("consumer")
-    cfg = common()
-    iss = iss or cfg["iss"]
-    aud = aud or cfg["aud"]
-    leeway = int(leeway or cfg["leeway"])
-
-    try:
-        h_b64, p_b64, s_b64 = token.split(".")
-        header: JwtHeader = json.loads(_b64url_decode(h_b64))
-        payload: JwtPayload = json.loads(_b64url_decode(p_b64))
-        sig = _b64url_decode(s_b64)
-    except Exception:
-        return None
+    config = env_config()
+    iss_val, aud_val, leeway_val = _claim_targets(config, iss, aud, leeway)
+    plan = _plan_verification(
+        token,
+        cache,
+        lambda: config.verify_identity,
+        iss_val,
+        aud_val,
+        leeway_val,
+        "signature_first",
+    )
+    if plan.decoded is None:
+        return plan.answer
+    source = _env_key_source(plan.decoded[0], config)
+    result = await _check_signature(plan.decoded, source)
+    return _settle_verification(
+        result, token, cache, plan.cache_key, iss_val, aud_val, leeway_val
+    )
+
+
+def verify_sync(
+    token: str,
+    *,
+    iss: str | None = None,
+    aud: str | list[str] | None = None,
+    leeway: int | None = None,
+    cache: VerifiedTokenCache | None = None,
+) -> JwtPayload | None:
+    """Synchronous verify() on the native backend.
 
-    if m == "HS512":
+    Runs without an event loop, for sync frameworks (Flask, WSGI) on CPython
+    hosts. Arguments and return value match verify().
+    """
+    config = env_config()
+    iss_val, aud_val, leeway_val = _claim_targets(config, iss, aud, leeway)
+    plan = _plan_verification(
+        token,
+        cache,
+        lambda: config.verify_identity,
+        iss_val,
+        aud_val,
+        leeway_val,
+        "signature_first",
+    )
+    if plan.decoded is None:
+        return plan.answer
+    source = _env_key_source(plan.decoded[0], config)
+    result = _check_signature_sync(plan.decoded, source)
+    return _settle_verification(
+        result, token, cache, plan.cache_key, iss_val, aud_val, leeway_val
+    )
+
+
+def _env_key_source(
+    header: JwtHeader, config: EnvConfig
+) -> _KeySource | RejectReason | None:
+    """Choose the verification key source configured by the environment."""
+    if config.mode("consumer") == "HS512":
         if header.get("alg") != "HS512":
-            return None
-        # Lazy import - only available in Cloudflare Workers/Pyodide runtime
-        from js import crypto  # noqa: PLC0415
-
-        key = await crypto.subtle.importKey(
-            "raw",
-            get_hs_secret_bytes(),
-            {"name": "HMAC", "hash": "SHA-512"},
-            False,
-            ["verify"],
-        )
-        ok = await crypto.subtle.verify(
-            {"name": "HMAC"}, key, sig, (h_b64 + "." + p_b64).encode()
-        )
-        if not ok:
-            return None
-    else:
-        signing_input = (h_b64 + "." + p_b64).encode()
-        jwk_str = get_public_jwk_string()
-        if jwk_str:
-            jwk = json.loads(jwk_str)
-        else:
-            jwks_url = get_jwks_url()
-            if not jwks_url:
-                return None
-            jwk = _find_jwk_by_kid(
-                header.get("kid"), await _fetch_jwks_from_url(jwks_url)
-            )
-        if not jwk:
-            return None
-        if not await _verify_asymmetric_signature(header, signing_input, sig, jwk):
-            return None
-
-    now = int(time.time())
-    if payload.get("iss") != iss:
-        return None
-    if payload.get("aud") != aud:
-        return None
-    if now > int(payload.get("exp", 0)) + int(leeway):
-        return None
-    nbf = int(payload.get("nbf", payload.get("iat", 0)))
-    if now + int(leeway) < nbf:
+            return "invalid_signature"
+        return _KeySource(secret=config.hs_secret)
+    jwk = config.public_jwk
+    if jwk:
+        return _KeySource(jwk=jwk)
+    jwks_url = config.jwks_url
+    if not jwks_url:
         return None
-    return payload
+    return _KeySource(jwks_url=jwks_url, cache_ttl=config.jwks_cache_ttl)
+
+
+def _claim_targets(
+    config: EnvConfig,
+    iss: str | None,
+    aud: str | list[str] | None,
+    leeway: int | None,
+) -> tuple[str, str | list[str], int]:
+    """Resolve per-call overrides against the environment's iss, aud and leeway."""
+    cfg = config.common
+    return iss or cfg["iss"], aud or cfg["aud"], int(leeway or cfg["leeway"])
@@ -0,0 +1,55 @@
+"""Shared pytest fixtures."""
+
+from __future__ import annotations
+
+import sys
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from flarelette_jwt import clear_key_cache, refresh_env_config
+from flarelette_jwt.backend import NATIVE
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+@pytest.fixture(autouse=True)
+def _env_snapshot() -> Iterator[None]:
+    """Compile the environment snapshot before and after every test.
+
+    env_config() only re-reads the environment on refresh, so a test starts
+    from the current environment and leaves no snapshot of its own behind.
+    Tests that change JWT_* variables mid-test call refresh_env_config().
+    """
+    refresh_env_config()
+    yield
+    refresh_env_config()
+
+
+@pytest.fixture
+def native_runtime(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    """Run on the native backend (no `js` module) with empty key caches.
+
+    Modules testing CPython-only behavior apply it to every test with
+    ``pytestmark = pytest.mark.usefixtures("native_runtime")``.
+    """
+    monkeypatch.delitem(sys.modules, "js", raising=False)
+    clear_key_cache()
+    yield
+    clear_key_cache()
+
+
+@pytest.fixture
+def hmac_verifications(
+    native_runtime: None, monkeypatch: pytest.MonkeyPatch
+) -> list[bytes]:
+    """Record the signing input of every native HS512 signature check."""
+    verified: list[bytes] = []
+    original = NATIVE.hmac_verify_sync
+
+    def counting_verify(key: Any, sig: bytes, data: bytes) -> bool:
+        verified.append(data)
+        return original(key, sig, data)
+
+    monkeypatch.setattr(NATIVE, "hmac_verify_sync", counting_verify)
+    return verified
@@ -0,0 +1,123 @@
+"""Tests for compiled authorization policies."""
+
+from __future__ import annotations
+
+import dataclasses
+from typing import Any
+
+import pytest
+from flarelette_jwt import (
+    CompiledPolicy,
+    PermissionRegistry,
+    check_auth_sync,
+    policy,
+    refresh_env_config,
+    sign_sync,
+)
+from flarelette_jwt.explicit import (
+    check_auth_with_config_sync,
+    create_hs512_config,
+    sign_with_config_sync,
+)
+
+_CONFIG = create_hs512_config(b"k" * 64, iss="issuer", aud="aud")
+
+pytestmark = pytest.mark.usefixtures("native_runtime")
+
+
+def test_compile_freezes_requirements_and_orders_checks() -> None:
+    compiled = (
+        policy()
+        .need_all("read", "write", "list")
+        .need_any("admin")
+        .roles_any("ops", "dev")
+        .where(lambda p: p.get("sub") == "u1")
+        .compile()
+    )
+
+    assert compiled.require_all_permissions == frozenset({"read", "write", "list"})
+    assert [c[2] for c in compiled._checks] == [
+        frozenset({"admin"}),
+        frozenset({"ops", "dev"}),
+        frozenset({"read", "write", "list"}),
+    ]
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        compiled.require_roles_any = frozenset()  # type: ignore[misc]
+
+
+@pytest.mark.parametrize(
+    ("claims", "allowed"),
+    [
+        ({"sub": "u1", "permissions": ["read", "admin"], "roles": ["ops"]}, True),
+        ({"sub": "u1", "permissions": ["read"], "roles": ["ops"]}, False),
+        ({"sub": "u1", "permissions": ["read", "admin"]}, False),
+        ({"sub": "u2", "permissions": ["read", "admin"], "roles": ["ops"]}, False),
+    ],
+)
+def test_compiled_policy_matches_option_dict(claims: Any, allowed: bool) -> None:
+    builder = (
+        policy()
+        .need_all("read")
+        .need_any("admin", "editor")
+        .roles_any("ops")
+        .where(lambda p: p.get("sub") == "u1")
+    )
+    compiled = builder.compile()
+    bitset = builder.compile(registry=PermissionRegistry(permissions=["read"]))
+    token = sign_with_config_sync(claims, _CONFIG)
+
+    with_dict = check_auth_with_config_sync(token, _CONFIG, builder.build())  # type: ignore[arg-type]
+    with_compiled = check_auth_with_config_sync(token, _CONFIG, compiled)
+
+    assert (with_dict is not None) is allowed
+    assert with_compiled == with_dict
+    assert compiled.allows(claims) is allowed
+    assert bitset.allows(claims) is allowed
+    assert check_auth_with_config_sync(token, _CONFIG, bitset) == with_dict
+
+
+def test_check_auth_accepts_compiled_policy(monkeypatch: pytest.MonkeyPatch) -> None:
+    for name in ("JWT_PUBLIC_JWK", "JWT_PRIVATE_JWK", "JWT_JWKS_URL"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("JWT_SECRET", "cw" * 43)
+    monkeypatch.setenv("JWT_ISS", "issuer")
+    monkeypatch.setenv("JWT_AUD", "aud")
+    refresh_env_config()
+    admin = policy().roles_any("admin").compile()
+    token = sign_sync({"sub": "u1", "roles": ["admin"]})
+
+    assert check_auth_sync(token, policy=admin, prescreen=True) is not None
+    assert (
+        check_auth_sync(
+            token, policy=CompiledPolicy(require_roles_all=frozenset({"x"}))
+        )
+        is None
+    )
+    with pytest.raises(ValueError, match="not both"):
+        check_auth_sync(token, policy=admin, require_roles_any=["admin"])
+
+
+def test_registry_assigns_stable_bits_and_refreshes_memo() -> None:
+    registry = PermissionRegistry(permissions=["read", "write"], roles=["admin"])
+    payload: Any = {"permissions": ["read", "delete", "unknown"], "roles": ["admin"]}
+
+    assert registry.mask("permissions", payload["permissions"]) == 0b01
+    deleters = policy().need_all("delete").compile(registry=registry)
+
+    assert registry.bits("permissions", ["delete"]) == 0b100
+    assert registry.mask("permissions", payload["permissions"]) == 0b101
+    assert deleters.allows(payload)
+    assert not deleters.allows({"permissions": ["read", "write"]})
+    assert policy().roles_any("admin", "ops").compile(registry=registry).allows(payload)
+    assert len(registry) == 5  # read, write, delete; admin, ops
+
+
+@pytest.mark.parametrize("permissions", [[[1]], [{}], 5, True, "read"])
+def test_registry_rejects_malformed_claims_without_raising(permissions: Any) -> None:
+    registry = PermissionRegistry(permissions=["read"])
+    readers = policy().need_all("read").compile(registry=registry)
+
+    assert registry.mask("permissions", permissions) == 0
+    assert not readers.allows({"permissions": permissions})
+    token = sign_with_config_sync({"sub": "u1", "permissions": permissions}, _CONFIG)
+    assert check_auth_with_config_sync(token, _CONFIG, readers, prescreen=True) is None
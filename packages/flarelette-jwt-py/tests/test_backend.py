@@ -0,0 +1,246 @@
+"""Tests for the native (CPython) crypto backend.
+
+These tests run with the `js` module removed so that verification goes through
+the `cryptography`-based native backend, using real keys and signatures. They
+are skipped when the optional `cryptography` dependency is not installed.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import time
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec, padding, rsa
+from cryptography.hazmat.primitives.asymmetric.ed25519 import (
+    Ed25519PrivateKey,
+)
+from cryptography.hazmat.primitives.asymmetric.utils import (
+    decode_dss_signature,
+)
+from flarelette_jwt import refresh_env_config, sign_sync
+from flarelette_jwt.backend import NATIVE
+from flarelette_jwt.explicit import (
+    check_auth_with_config_sync,
+    create_eddsa_sign_config,
+    create_eddsa_verify_config,
+    create_es512_verify_config,
+    create_hs512_config,
+    sign_many_with_config,
+    sign_with_config,
+    sign_with_config_sync,
+    verify_with_config,
+    verify_with_config_sync,
+)
+from flarelette_jwt.util import parse
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode("utf-8").rstrip("=")
+
+
+def _int_b64url(value: int, size: int | None = None) -> str:
+    size = size or (value.bit_length() + 7) // 8
+    return _b64url(value.to_bytes(size, "big"))
+
+
+_ES_PARAMS: dict[str, tuple[ec.EllipticCurve, hashes.HashAlgorithm, str, int]] = {
+    "ES256": (ec.SECP256R1(), hashes.SHA256(), "P-256", 32),
+    "ES384": (ec.SECP384R1(), hashes.SHA384(), "P-384", 48),
+    "ES512": (ec.SECP521R1(), hashes.SHA512(), "P-521", 66),
+}
+
+_RS_HASHES: dict[str, hashes.HashAlgorithm] = {
+    "RS256": hashes.SHA256(),
+    "RS384": hashes.SHA384(),
+    "RS512": hashes.SHA512(),
+}
+
+
+def _ed25519_private_jwk() -> tuple[dict[str, Any], dict[str, Any]]:
+    """Return (private JWK, public JWK) for a fresh Ed25519 key."""
+    key = Ed25519PrivateKey.generate()
+    public = {
+        "kty": "OKP",
+        "crv": "Ed25519",
+        "x": _b64url(key.public_key().public_bytes_raw()),
+    }
+    return {**public, "d": _b64url(key.private_bytes_raw())}, public
+
+
+def _keypair(alg: str) -> tuple[dict[str, Any], Callable[[bytes], bytes]]:
+    """Return (public JWK, JOSE signer) for the given algorithm."""
+    if alg == "EdDSA":
+        ed_key = Ed25519PrivateKey.generate()
+        raw = ed_key.public_key().public_bytes_raw()
+        return {"kty": "OKP", "crv": "Ed25519", "x": _b64url(raw)}, ed_key.sign
+
+    if alg in _RS_HASHES:
+        rsa_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        numbers = rsa_key.public_key().public_numbers()
+        jwk = {"kty": "RSA", "n": _int_b64url(numbers.n), "e": _int_b64url(numbers.e)}
+        return jwk, lambda data: rsa_key.sign(data, padding.PKCS1v15(), _RS_HASHES[alg])
+
+    curve, hash_alg, crv, size = _ES_PARAMS[alg]
+    ec_key = ec.generate_private_key(curve)
+    point = ec_key.public_key().public_numbers()
+    jwk = {
+        "kty": "EC",
+        "crv": crv,
+        "x": _int_b64url(point.x, size),
+        "y": _int_b64url(point.y, size),
+    }
+
+    def sign_raw(data: bytes) -> bytes:
+        r, s = decode_dss_signature(ec_key.sign(data, ec.ECDSA(hash_alg)))
+        return r.to_bytes(size, "big") + s.to_bytes(size, "big")
+
+    return jwk, sign_raw
+
+
+def _signed_token(alg: str, sign: Callable[[bytes], bytes], **claims: Any) -> str:
+    now = int(time.time())
+    payload = {"iss": "issuer", "aud": "aud", "sub": "u1", "exp": now + 60, **claims}
+    h = _b64url(json.dumps({"alg": alg, "typ": "JWT"}).encode())
+    p = _b64url(json.dumps(payload).encode())
+    return f"{h}.{p}.{_b64url(sign(f'{h}.{p}'.encode()))}"
+
+
+pytestmark = pytest.mark.usefixtures("native_runtime")
+
+
+@pytest.mark.parametrize(
+    "alg", ["EdDSA", "ES256", "ES384", "ES512", "RS256", "RS384", "RS512"]
+)
+def test_native_verify_accepts_valid_and_rejects_tampered(alg: str) -> None:
+    jwk, sign = _keypair(alg)
+    key = NATIVE.import_verify_key_sync(alg, jwk)
+    sig = sign(b"header.payload")
+
+    assert NATIVE.verify_sync(key, sig, b"header.payload")
+    assert not NATIVE.verify_sync(key, sig, b"header.payload2")
+    assert not NATIVE.verify_sync(key, sig[:-1], b"header.payload")
+
+
+def test_native_ecdsa_rejects_curve_mismatch() -> None:
+    jwk, _ = _keypair("ES256")
+
+    with pytest.raises(ValueError, match="P-521"):
+        NATIVE.import_verify_key_sync("ES512", jwk)
+
+
+@pytest.mark.asyncio
+async def test_verify_with_config_uses_native_eddsa() -> None:
+    jwk, sign = _keypair("EdDSA")
+    config = create_eddsa_verify_config(jwk, iss="issuer", aud="aud")
+
+    payload = await verify_with_config(_signed_token("EdDSA", sign), config)
+
+    assert payload is not None
+    assert payload["sub"] == "u1"
+    _, other_sign = _keypair("EdDSA")
+    assert await verify_with_config(_signed_token("EdDSA", other_sign), config) is None
+
+
+@pytest.mark.asyncio
+async def test_verify_with_config_uses_native_es512() -> None:
+    jwk, sign = _keypair("ES512")
+    config = create_es512_verify_config(jwk, iss="issuer", aud="aud")
+
+    assert await verify_with_config(_signed_token("ES512", sign), config) is not None
+
+
+def test_sync_verify_with_config_asymmetric() -> None:
+    jwk, sign_eddsa = _keypair("EdDSA")
+    config = create_eddsa_verify_config(jwk, iss="issuer", aud="aud")
+
+    assert verify_with_config_sync(_signed_token("EdDSA", sign_eddsa), config)
+    expired = _signed_token("EdDSA", sign_eddsa, exp=int(time.time()) - 600)
+    assert verify_with_config_sync(expired, config) is None
+
+
+@pytest.mark.asyncio
+async def test_eddsa_sign_with_config_native() -> None:
+    private_jwk, public_jwk = _ed25519_private_jwk()
+    sign_config = create_eddsa_sign_config(
+        private_jwk, iss="issuer", aud="aud", kid="ed-1"
+    )
+    verify_config = create_eddsa_verify_config(public_jwk, iss="issuer", aud="aud")
+
+    token = await sign_with_config({"sub": "u1"}, sign_config)
+
+    assert parse(token)["header"] == {"alg": "EdDSA", "typ": "JWT", "kid": "ed-1"}
+    assert await verify_with_config(token, verify_config) is not None
+    assert verify_with_config_sync(
+        sign_with_config_sync({"sub": "u2"}, sign_config), verify_config
+    )
+
+
+def test_eddsa_sign_from_env_key_file(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    private_jwk, public_jwk = _ed25519_private_jwk()
+    key_file = tmp_path / "private.jwk"
+    key_file.write_text(json.dumps(private_jwk))
+    monkeypatch.delenv("JWT_PRIVATE_JWK", raising=False)
+    monkeypatch.setenv("JWT_PRIVATE_JWK_PATH", str(key_file))
+    monkeypatch.setenv("JWT_KID", "ed-env")
+    monkeypatch.setenv("JWT_ISS", "issuer")
+    monkeypatch.setenv("JWT_AUD", "aud")
+    refresh_env_config()
+
+    token = sign_sync({"sub": "u1"})
+
+    assert parse(token)["header"]["kid"] == "ed-env"
+    verify_config = create_eddsa_verify_config(public_jwk, iss="issuer", aud="aud")
+    assert verify_with_config_sync(token, verify_config) is not None
+
+
+def test_eddsa_sign_rejects_non_ed25519_key() -> None:
+    jwk, _ = _keypair("ES256")
+    config = create_eddsa_sign_config({**jwk, "d": "AA"}, iss="issuer", aud="aud")
+
+    with pytest.raises(ValueError, match="Ed25519"):
+        sign_with_config_sync({"sub": "u1"}, config)
+
+
+def test_claims_first_rejects_forged_token_with_valid_claims() -> None:
+    jwk, _ = _keypair("EdDSA")
+    _, forger = _keypair("EdDSA")
+    config = create_eddsa_verify_config(jwk, iss="issuer", aud="aud")
+    forged = _signed_token("EdDSA", forger)
+
+    assert verify_with_config_sync(forged, config, strategy="claims_first") is None
+    assert (
+        check_auth_with_config_sync(forged, config, {}, strategy="claims_first") is None
+    )
+
+
+@pytest.mark.asyncio
+async def test_sign_many_with_config_splices_each_audience() -> None:
+    private_jwk, public_jwk = _ed25519_private_jwk()
+    sign_config = create_eddsa_sign_config(
+        private_jwk, iss="issuer", aud="default", kid="ed-1"
+    )
+    verify_config = create_eddsa_verify_config(public_jwk, iss="issuer", aud="a")
+
+    tokens = await sign_many_with_config(
+        {"sub": "u1", "aud": "ignored"}, sign_config, ["a", "b"]
+    )
+
+    assert [parse(t)["payload"]["aud"] for t in tokens] == ["a", "b"]
+    assert verify_with_config_sync(tokens[0], verify_config) is not None
+    assert verify_with_config_sync(tokens[1], verify_config, aud="b") is not None
+    assert verify_with_config_sync(tokens[1], verify_config) is None
+    hs512 = create_hs512_config(b"k" * 64, iss="issuer", aud="a")
+    assert await sign_many_with_config({}, hs512, []) == []
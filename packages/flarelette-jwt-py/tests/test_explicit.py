@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import base64
 import json
 import os
@@ -9,22 +10,32 @@ import types
 from typing import TYPE_CHECKING, Any, cast
 
 import pytest
+from flarelette_jwt import jwks, refresh_env_config
+from flarelette_jwt.backend import WEBCRYPTO
 from flarelette_jwt.explicit import (
+    _jwk_thumbprint,
+    check_auth_with_config,
+    clear_key_cache,
     create_es512_verify_config,
+    create_hs512_config,
     create_jwks_url_verify_config,
+    verify_many,
     verify_with_config,
 )
+from flarelette_jwt.jwks import clear_jwks_cache
 from flarelette_jwt.verify import verify
 
 if TYPE_CHECKING:
     from collections.abc import Iterator
 
+    from flarelette_jwt.explicit import AuthzOptsWithConfig
+
 
 def _b64url(data: bytes) -> str:
     return base64.urlsafe_b64encode(data).decode("utf-8").rstrip("=")
 
 
-def _make_token(header: dict[str, Any], payload: dict[str, Any]) -> str:
+def _make_token(header: Any, payload: Any) -> str:
     return ".".join(
         [
             _b64url(json.dumps(header, separators=(",", ":")).encode("utf-8")),
@@ -34,15 +45,64 @@ def _make_token(header: dict[str, Any], payload: dict[str, Any]) -> str:
     )
 
 
-class _FakeResponse:
-    def __init__(self, body: str) -> None:
-        self.ok = True
-        self.status = 200
-        self.statusText = "OK"
-        self._body = body
+class _FakeHeaders:
+    def __init__(self, headers: dict[str, str] | None = None) -> None:
+        self._headers = {k.lower(): v for k, v in (headers or {}).items()}
+
+    def get(self, name: str) -> str | None:
+        return self._headers.get(name.lower())
+
+
+class _FakeChunk:
+    """A Uint8Array proxy as returned by ReadableStreamDefaultReader.read()."""
+
+    def __init__(self, data: bytes) -> None:
+        self._data = data
+
+    def to_bytes(self) -> bytes:
+        return self._data
+
+
+class _FakeReader:
+    def __init__(self, chunks: list[bytes]) -> None:
+        self._chunks = chunks
+        self.reads = 0
+        self.cancelled = False
 
-    async def text(self) -> str:
-        return self._body
+    async def read(self) -> types.SimpleNamespace:
+        if self.reads == len(self._chunks):
+            return types.SimpleNamespace(done=True, value=None)
+        self.reads += 1
+        return types.SimpleNamespace(
+            done=False, value=_FakeChunk(self._chunks[self.reads - 1])
+        )
+
+    async def cancel(self) -> None:
+        self.cancelled = True
+
+
+class _FakeStream:
+    def __init__(self, data: bytes, chunk_size: int) -> None:
+        chunks = [data[i : i + chunk_size] for i in range(0, len(data), chunk_size)]
+        self.reader = _FakeReader(chunks)
+
+    def getReader(self) -> _FakeReader:
+        return self.reader
+
+
+class _FakeResponse:
+    def __init__(
+        self,
+        body: str,
+        status: int = 200,
+        headers: dict[str, str] | None = None,
+        chunk_size: int = 4096,
+    ) -> None:
+        self.ok = 200 <= status < 300
+        self.status = status
+        self.statusText = "OK" if self.ok else "Not Modified"
+        self.headers = _FakeHeaders(headers)
+        self.body = _FakeStream(body.encode("utf-8"), chunk_size) if body else None
 
 
 class _FakeSubtle:
@@ -80,9 +140,13 @@ class _FakeFetch:
     def __init__(self, body: str) -> None:
         self.body = body
         self.urls: list[str] = []
+        self.inits: list[dict[str, Any] | None] = []
 
-    async def __call__(self, url: str) -> _FakeResponse:
+    async def __call__(
+        self, url: str, init: dict[str, Any] | None = None
+    ) -> _FakeResponse:
         self.urls.append(url)
+        self.inits.append(init)
         return _FakeResponse(self.body)
 
 
@@ -111,6 +175,39 @@ def _install_runtime(
     return subtle, fetch
 
 
+class _JsObject:
+    """Stands in for the plain object built by JS Object.fromEntries()."""
+
+    def __init__(self, entries: Any) -> None:
+        self.entries = dict(entries)
+
+
+def _install_js_objects(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Make to_js() build _JsObject for dicts only when asked to."""
+
+    def to_js(value: Any, dict_converter: Any = None) -> Any:
+        if isinstance(value, dict) and dict_converter is not None:
+            return dict_converter(value.items())
+        return value  # A JS Map: importKey() ignores its entries
+
+    monkeypatch.setattr(
+        sys.modules["js"],
+        "Object",
+        types.SimpleNamespace(fromEntries=_JsObject),
+        raising=False,
+    )
+    monkeypatch.setattr(sys.modules["pyodide.ffi"], "to_js", to_js)
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches() -> Iterator[None]:
+    clear_key_cache()
+    clear_jwks_cache()
+    yield
+    clear_key_cache()
+    clear_jwks_cache()
+
+
 @pytest.fixture(autouse=True)
 def _clear_env() -> Iterator[None]:
     keys = [
@@ -120,6 +217,7 @@ def _clear_env() -> Iterator[None]:
         "JWT_PUBLIC_JWK_NAME",
         "JWT_JWKS_URL",
         "JWT_JWKS_URL_NAME",
+        "JWT_JWKS_CACHE_TTL_SECONDS",
         "JWT_ISS",
         "JWT_AUD",
         "JWT_LEEWAY",
@@ -128,6 +226,7 @@ def _clear_env() -> Iterator[None]:
     previous = {key: os.environ.get(key) for key in keys}
     for key in keys:
         os.environ.pop(key, None)
+    refresh_env_config()
 
     yield
 
@@ -230,6 +329,7 @@ async def test_verify_supports_env_inline_es512(
     )
     os.environ["JWT_ISS"] = "issuer"
     os.environ["JWT_AUD"] = "audience"
+    refresh_env_config()
 
     now = int(time.time())
     token = _make_token(
@@ -261,6 +361,7 @@ async def test_verify_supports_env_jwks_rs256(monkeypatch: pytest.MonkeyPatch) -
     os.environ["JWT_JWKS_URL"] = "https://issuer.example/.well-known/jwks.json"
     os.environ["JWT_ISS"] = "issuer"
     os.environ["JWT_AUD"] = "audience"
+    refresh_env_config()
 
     now = int(time.time())
     token = _make_token(
@@ -281,3 +382,610 @@ async def test_verify_supports_env_jwks_rs256(monkeypatch: pytest.MonkeyPatch) -
     assert fetch is not None
     assert fetch.urls == ["https://issuer.example/.well-known/jwks.json"]
     assert subtle.import_calls[0][2]["hash"] == "SHA-256"
+
+
+@pytest.mark.asyncio
+async def test_verify_with_config_reuses_imported_hmac_key(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    subtle, _ = _install_runtime(monkeypatch)
+    now = int(time.time())
+    token = _make_token(
+        {"alg": "HS512", "typ": "JWT"},
+        {"sub": "hs", "iss": "issuer", "aud": "audience", "iat": now, "exp": now + 60},
+    )
+    config = create_hs512_config(b"k" * 64, iss="issuer", aud="audience")
+
+    assert await verify_with_config(token, config) is not None
+    assert await verify_with_config(token, config) is not None
+    assert len(subtle.import_calls) == 1
+    assert subtle.import_calls[0][4] == ["verify"]
+
+    clear_key_cache()
+    assert await verify_with_config(token, config) is not None
+    assert len(subtle.import_calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_verify_with_config_reuses_imported_public_key(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    subtle, fetch = _install_runtime(
+        monkeypatch,
+        jwks_keys=[
+            {"kid": "rsa-key", "kty": "RSA", "alg": "RS256", "n": "abc", "e": "AQAB"}
+        ],
+    )
+    now = int(time.time())
+    token = _make_token(
+        {"alg": "RS256", "kid": "rsa-key"},
+        {"sub": "rs", "iss": "issuer", "aud": "audience", "iat": now, "exp": now + 60},
+    )
+    config = create_jwks_url_verify_config(
+        "https://issuer.example/.well-known/jwks.json",
+        iss="issuer",
+        aud="audience",
+        alg="RS256",
+    )
+
+    for _ in range(3):
+        assert await verify_with_config(token, config) is not None
+
+    assert len(subtle.import_calls) == 1
+    assert len(subtle.verify_calls) == 3
+
+
+def test_jwk_thumbprint_matches_rfc7638_example() -> None:
+    # RFC 7638 section 3.1 example key
+    jwk = {
+        "kty": "RSA",
+        "n": "0vx7agoebGcQSuuPiLJXZptN9nndrQmbXEps2aiAFbWhM78LhWx4cbbfAAtVT86zwu1RK7aPFFxuhDR1L6tSoc_BJECPebWKRXjBZCiFV4n3oknjhMstn64tZ_2W-5JsGY4Hc5n9yBXArwl93lqt7_RN5w6Cf0h4QyQ5v-65YGjQR0_FDW2QvzqY368QQMicAtaSqzs8KJZgnYb9c7d0zgdAZHzu6qMQvRL5hajrn1n91CbOpbISD08qNLyrdkt-bFTWhAI4vMQFh6WeZu0fM4lFd2NcRwr3XPksINHaQ-G_xBniIqbw0Ls1jF44-csFCur-kEgU8awapJzKnqDKgw",
+        "e": "AQAB",
+        "alg": "RS256",
+        "kid": "2011-04-29",
+    }
+
+    assert _jwk_thumbprint(jwk) == "NzbLsXh8uDCcd-6MNwXF4W_7noWXFZAfHkxZsRGC9Xs"
+
+
+def _rs256_token(sub: str) -> str:
+    now = int(time.time())
+    return _make_token(
+        {"alg": "RS256", "kid": "rsa-key"},
+        {"sub": sub, "iss": "issuer", "aud": "audience", "iat": now, "exp": now + 60},
+    )
+
+
+_RSA_JWKS = [{"kid": "rsa-key", "kty": "RSA", "alg": "RS256", "n": "abc", "e": "AQAB"}]
+_JWKS_URL = "https://issuer.example/.well-known/jwks.json"
+
+
+@pytest.mark.asyncio
+async def test_verify_with_config_caches_jwks_per_url(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    _, fetch = _install_runtime(monkeypatch, jwks_keys=_RSA_JWKS)
+    config = create_jwks_url_verify_config(
+        _JWKS_URL, iss="issuer", aud="audience", alg="RS256"
+    )
+
+    assert await verify_with_config(_rs256_token("a"), config) is not None
+    assert await verify_with_config(_rs256_token("b"), config) is not None
+
+    assert fetch is not None
+    assert fetch.urls == [_JWKS_URL]
+
+
+@pytest.mark.asyncio
+async def test_verify_with_config_cache_ttl_zero_disables_jwks_cache(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    _, fetch = _install_runtime(monkeypatch, jwks_keys=_RSA_JWKS)
+    config = create_jwks_url_verify_config(
+        _JWKS_URL, iss="issuer", aud="audience", alg="RS256", cache_ttl=0
+    )
+
+    assert await verify_with_config(_rs256_token("a"), config) is not None
+    assert await verify_with_config(_rs256_token("b"), config) is not None
+
+    assert fetch is not None
+    assert fetch.urls == [_JWKS_URL, _JWKS_URL]
+
+
+@pytest.mark.asyncio
+async def test_verify_shares_jwks_cache_with_explicit_config(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    _, fetch = _install_runtime(monkeypatch, jwks_keys=_RSA_JWKS)
+    os.environ["JWT_JWKS_URL"] = _JWKS_URL
+    os.environ["JWT_ISS"] = "issuer"
+    os.environ["JWT_AUD"] = "audience"
+    refresh_env_config()
+    config = create_jwks_url_verify_config(
+        _JWKS_URL, iss="issuer", aud="audience", alg="RS256"
+    )
+
+    assert await verify_with_config(_rs256_token("a"), config) is not None
+    assert await verify(_rs256_token("b")) is not None
+
+    assert fetch is not None
+    assert fetch.urls == [_JWKS_URL]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_jwks_misses_share_one_fetch(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    _, fetch = _install_runtime(monkeypatch, jwks_keys=_RSA_JWKS)
+    assert fetch is not None
+    release = asyncio.Event()
+    original_call = fetch.__call__
+
+    async def gated_fetch(
+        url: str, init: dict[str, Any] | None = None
+    ) -> _FakeResponse:
+        await release.wait()
+        return await original_call(url, init)
+
+    monkeypatch.setattr(sys.modules["js"], "fetch", gated_fetch)
+    config = create_jwks_url_verify_config(
+        _JWKS_URL, iss="issuer", aud="audience", alg="RS256"
+    )
+
+    waiters = asyncio.gather(
+        *(verify_with_config(_rs256_token(str(i)), config) for i in range(5))
+    )
+    await asyncio.sleep(0)
+    release.set()
+    results = await waiters
+
+    assert all(result is not None for result in results)
+    assert fetch.urls == [_JWKS_URL]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_jwks_misses_share_fetch_error(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    _install_runtime(monkeypatch, jwks_keys=_RSA_JWKS)
+    calls: list[str] = []
+
+    async def failing_fetch(
+        url: str, init: dict[str, Any] | None = None
+    ) -> _FakeResponse:
+        calls.append(url)
+        await asyncio.sleep(0)
+        raise ValueError("JWKS endpoint unavailable")
+
+    monkeypatch.setattr(sys.modules["js"], "fetch", failing_fetch)
+    config = create_jwks_url_verify_config(
+        _JWKS_URL, iss="issuer", aud="audience", alg="RS256"
+    )
+
+    results = await asyncio.gather(
+        *(verify_with_config(_rs256_token(str(i)), config) for i in range(3)),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert calls == [_JWKS_URL]
+
+
+@pytest.mark.asyncio
+async def test_stale_jwks_served_while_refreshing_in_background(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    _, fetch = _install_runtime(monkeypatch, jwks_keys=_RSA_JWKS)
+    assert fetch is not None
+    config = create_jwks_url_verify_config(
+        _JWKS_URL, iss="issuer", aud="audience", alg="RS256", max_stale=600
+    )
+    assert await verify_with_config(_rs256_token("a"), config) is not None
+
+    # Expire the entry (TTL 300s) but stay within max_stale
+    jwks._jwks_cache[_JWKS_URL]["fetched_at"] -= 400
+    release = asyncio.Event()
+    original_call = fetch.__call__
+
+    async def gated_fetch(
+        url: str, init: dict[str, Any] | None = None
+    ) -> _FakeResponse:
+        await release.wait()
+        return await original_call(url, init)
+
+    monkeypatch.setattr(sys.modules["js"], "fetch", gated_fetch)
+
+    # Served immediately from the stale entry while the refresh is blocked
+    assert await verify_with_config(_rs256_token("b"), config) is not None
+    assert _JWKS_URL in jwks._jwks_inflight
+
+    release.set()
+    await jwks._jwks_inflight[_JWKS_URL]
+    assert fetch.urls == [_JWKS_URL, _JWKS_URL]
+    assert time.monotonic() - jwks._jwks_cache[_JWKS_URL]["fetched_at"] < 300
+
+
+@pytest.mark.asyncio
+async def test_jwks_past_max_stale_blocks_on_refresh(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    _, fetch = _install_runtime(monkeypatch, jwks_keys=_RSA_JWKS)
+    assert fetch is not None
+    config = create_jwks_url_verify_config(
+        _JWKS_URL, iss="issuer", aud="audience", alg="RS256", max_stale=60
+    )
+    assert await verify_with_config(_rs256_token("a"), config) is not None
+
+    jwks._jwks_cache[_JWKS_URL]["fetched_at"] -= 400
+
+    assert await verify_with_config(_rs256_token("b"), config) is not None
+    assert fetch.urls == [_JWKS_URL, _JWKS_URL]
+    assert not jwks._jwks_inflight
+
+
+@pytest.mark.asyncio
+async def test_jwks_revalidation_uses_validators_and_honors_304(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    _install_runtime(monkeypatch, jwks_keys=_RSA_JWKS)
+    body = json.dumps({"keys": _RSA_JWKS})
+    requests: list[dict[str, str]] = []
+
+    async def conditional_fetch(url: str, init: dict[str, Any]) -> _FakeResponse:
+        requests.append(init["headers"])
+        if init["headers"].get("If-None-Match") == '"v1"':
+            return _FakeResponse(
+                "", status=304, headers={"Cache-Control": "max-age=120"}
+            )
+        return _FakeResponse(
+            body,
+            headers={
+                "ETag": '"v1"',
+                "Last-Modified": "Wed, 01 Oct 2025 00:00:00 GMT",
+                "Cache-Control": "public, max-age=60",
+            },
+        )
+
+    monkeypatch.setattr(sys.modules["js"], "fetch", conditional_fetch)
+    config = create_jwks_url_verify_config(
+        _JWKS_URL, iss="issuer", aud="audience", alg="RS256"
+    )
+
+    assert await verify_with_config(_rs256_token("a"), config) is not None
+    entry = jwks._jwks_cache[_JWKS_URL]
+    assert entry["ttl"] == 60
+    assert "If-None-Match" not in requests[0]
+
+    # The 304 carries an empty body, so this only passes if it is not re-parsed
+    entry["fetched_at"] -= 61
+    assert await verify_with_config(_rs256_token("b"), config) is not None
+
+    assert requests[1]["If-None-Match"] == '"v1"'
+    assert requests[1]["If-Modified-Since"] == "Wed, 01 Oct 2025 00:00:00 GMT"
+    assert entry is not jwks._jwks_cache[_JWKS_URL]
+    assert jwks._jwks_cache[_JWKS_URL]["ttl"] == 120
+    assert jwks._jwks_cache[_JWKS_URL]["etag"] == '"v1"'
+
+
+@pytest.mark.asyncio
+async def test_unknown_kid_forces_one_rate_limited_refresh(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    _, fetch = _install_runtime(monkeypatch, jwks_keys=_RSA_JWKS)
+    assert fetch is not None
+    config = create_jwks_url_verify_config(
+        _JWKS_URL, iss="issuer", aud="audience", alg="RS256"
+    )
+    assert await verify_with_config(_rs256_token("a"), config) is not None
+
+    # Key rotation: the IdP publishes a new kid after our fetch
+    jwks._jwks_cache[_JWKS_URL]["fetched_at"] -= jwks.JWKS_REFETCH_INTERVAL
+    fetch.body = json.dumps({"keys": [*_RSA_JWKS, {**_RSA_JWKS[0], "kid": "rotated"}]})
+    now = int(time.time())
+    rotated = _make_token(
+        {"alg": "RS256", "kid": "rotated"},
+        {"sub": "r", "iss": "issuer", "aud": "audience", "iat": now, "exp": now + 60},
+    )
+    assert await verify_with_config(rotated, config) is not None
+    assert len(fetch.urls) == 2
+
+    # Random kids never refetch within the rate limit, and such misses are
+    # not remembered since the key set may have changed since the last fetch
+    sprayed = [
+        _make_token(
+            {"alg": "RS256", "kid": f"random-{i % 2}"},
+            {"sub": "x", "iss": "issuer", "aud": "audience", "exp": now + 60},
+        )
+        for i in range(5)
+    ]
+    for token in sprayed:
+        assert await verify_with_config(token, config) is None
+    assert len(fetch.urls) == 2
+    assert (_JWKS_URL, "random-0") not in jwks._unknown_kid_cache
+
+    # Once a forced refetch still lacks a kid, it is remembered as unknown
+    jwks._jwks_cache[_JWKS_URL]["fetched_at"] -= jwks.JWKS_REFETCH_INTERVAL
+    for token in sprayed:
+        assert await verify_with_config(token, config) is None
+    assert len(fetch.urls) == 3
+    assert (_JWKS_URL, "random-0") in jwks._unknown_kid_cache
+
+
+@pytest.mark.asyncio
+async def test_claims_first_rejects_expired_token_without_crypto(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    subtle, fetch = _install_runtime(monkeypatch, jwks_keys=_RSA_JWKS)
+    config = create_jwks_url_verify_config(
+        _JWKS_URL, iss="issuer", aud="audience", alg="RS256"
+    )
+    now = int(time.time())
+    expired = _make_token(
+        {"alg": "RS256", "kid": "rsa-key"},
+        {"sub": "a", "iss": "issuer", "aud": "audience", "exp": now - 600},
+    )
+
+    assert await verify_with_config(expired, config, strategy="claims_first") is None
+    assert fetch is not None
+    assert fetch.urls == []
+    assert subtle.verify_calls == []
+
+    assert await verify_with_config(expired, config) is None
+    assert fetch.urls == [_JWKS_URL]
+
+
+@pytest.mark.asyncio
+async def test_claims_first_still_verifies_signature(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    subtle, _ = _install_runtime(monkeypatch, jwks_keys=_RSA_JWKS)
+    config = create_jwks_url_verify_config(
+        _JWKS_URL, iss="issuer", aud="audience", alg="RS256"
+    )
+
+    payload = await verify_with_config(
+        _rs256_token("a"), config, strategy="claims_first"
+    )
+
+    assert payload is not None
+    assert len(subtle.verify_calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_prescreen_rejects_underprivileged_token_without_crypto(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    subtle, fetch = _install_runtime(monkeypatch, jwks_keys=_RSA_JWKS)
+    config = create_jwks_url_verify_config(
+        _JWKS_URL, iss="issuer", aud="audience", alg="RS256"
+    )
+    now = int(time.time())
+    claims = {"iss": "issuer", "aud": "audience", "exp": now + 60}
+    header = {"alg": "RS256", "kid": "rsa-key"}
+    reader = _make_token(header, {**claims, "sub": "a", "roles": ["reader"]})
+    admin = _make_token(header, {**claims, "sub": "b", "roles": ["admin"]})
+    opts: AuthzOptsWithConfig = {"require_roles_any": ["admin"]}
+
+    assert await check_auth_with_config(reader, config, opts, prescreen=True) is None
+    assert fetch is not None
+    assert fetch.urls == []
+    assert subtle.verify_calls == []
+
+    user = await check_auth_with_config(admin, config, opts, prescreen=True)
+    assert user is not None
+    assert user["sub"] == "b"
+    assert len(subtle.verify_calls) == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("prescreen", [True, False])
+@pytest.mark.parametrize("roles", [5, True, [{}], "admin", [["admin"]]])
+async def test_malformed_role_claims_fail_without_raising(
+    monkeypatch: pytest.MonkeyPatch, roles: Any, prescreen: bool
+) -> None:
+    _install_runtime(monkeypatch, jwks_keys=_RSA_JWKS)
+    config = create_jwks_url_verify_config(
+        _JWKS_URL, iss="issuer", aud="audience", alg="RS256"
+    )
+    claims = {"iss": "issuer", "aud": "audience", "exp": int(time.time()) + 60}
+    token = _make_token(
+        {"alg": "RS256", "kid": "rsa-key"}, {**claims, "sub": "a", "roles": roles}
+    )
+    opts: AuthzOptsWithConfig = {"require_roles_any": ["admin"]}
+
+    assert (
+        await check_auth_with_config(token, config, opts, prescreen=prescreen) is None
+    )
+
+
+@pytest.mark.asyncio
+async def test_verify_many_imports_each_key_once(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    subtle, fetch = _install_runtime(monkeypatch, jwks_keys=_RSA_JWKS)
+    config = create_jwks_url_verify_config(
+        _JWKS_URL, iss="issuer", aud="audience", alg="RS256"
+    )
+    now = int(time.time())
+    expired = _make_token(
+        {"alg": "RS256", "kid": "rsa-key"},
+        {"sub": "x", "iss": "issuer", "aud": "audience", "exp": now - 600},
+    )
+    wrong_alg = _make_token({"alg": "HS512"}, {"sub": "y"})
+    unknown_kid = _make_token({"alg": "RS256", "kid": "other"}, {"sub": "z"})
+    tokens = [_rs256_token("a"), "garbage", expired, wrong_alg, unknown_kid]
+    tokens.append(_rs256_token("b"))
+
+    results = await verify_many(tokens, config)
+
+    assert [r["reason"] for r in results] == [
+        None,
+        "malformed",
+        "expired",
+        "invalid_signature",
+        "unknown_key",
+        None,
+    ]
+    assert [(r["payload"] or {}).get("sub") for r in results] == [
+        "a",
+        None,
+        None,
+        None,
+        None,
+        "b",
+    ]
+    assert len(subtle.import_calls) == 1
+    assert len(subtle.verify_calls) == 3
+    assert fetch is not None
+    assert fetch.urls == [_JWKS_URL]
+
+
+@pytest.mark.asyncio
+async def test_verify_many_reports_bad_headers_per_token(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    _install_runtime(monkeypatch, jwks_keys=_RSA_JWKS)
+    config = create_jwks_url_verify_config(
+        _JWKS_URL, iss="issuer", aud="audience", alg="RS256"
+    )
+    tokens = [
+        _make_token({"alg": "HS512", "kid": [1]}, {"sub": "x"}),
+        _make_token([1], {"sub": "y"}),
+        _make_token({"alg": {"a": 1}}, {"sub": "z"}),
+        _rs256_token("a"),
+    ]
+
+    results = await verify_many(tokens, config)
+
+    assert [r["reason"] for r in results] == [
+        "malformed",
+        "malformed",
+        "malformed",
+        None,
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("strategy", ["claims_first", "signature_first"])
+@pytest.mark.parametrize(
+    "payload",
+    [
+        1,
+        [1],
+        "claims",
+        {"iss": "issuer", "aud": "audience", "exp": "abc"},
+        {"iss": "issuer", "aud": "audience", "exp": 9999999999, "nbf": [1]},
+    ],
+)
+async def test_garbage_claims_are_rejected_without_raising(
+    monkeypatch: pytest.MonkeyPatch, payload: Any, strategy: Any
+) -> None:
+    # The fake runtime accepts every signature, so only claim handling rejects
+    _install_runtime(monkeypatch, jwks_keys=_RSA_JWKS)
+    config = create_jwks_url_verify_config(
+        _JWKS_URL, iss="issuer", aud="audience", alg="RS256"
+    )
+    token = _make_token({"alg": "RS256", "kid": "rsa-key"}, payload)
+
+    assert await verify_with_config(token, config, strategy=strategy) is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("strategy", ["claims_first", "signature_first"])
+@pytest.mark.parametrize(
+    "claims",
+    [
+        '"exp":1e400',
+        '"exp":Infinity',
+        '"exp":-Infinity',
+        '"exp":NaN',
+        '"exp":9999999999,"nbf":1e400',
+    ],
+)
+async def test_non_finite_time_claims_are_rejected_without_raising(
+    monkeypatch: pytest.MonkeyPatch, claims: str, strategy: Any
+) -> None:
+    _install_runtime(monkeypatch, jwks_keys=_RSA_JWKS)
+    config = create_jwks_url_verify_config(
+        _JWKS_URL, iss="issuer", aud="audience", alg="RS256"
+    )
+    header = _make_token({"alg": "RS256", "kid": "rsa-key"}, {}).split(".")[0]
+    payload = _b64url(f'{{"iss":"issuer","aud":"audience",{claims}}}'.encode())
+    token = f"{header}.{payload}.{_b64url(b'signature')}"
+
+    assert await verify_with_config(token, config, strategy=strategy) is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("alg", "jwk"),
+    [
+        ("RS256", {"kty": "RSA", "n": "abc", "e": "AQAB"}),
+        ("ES512", {"kty": "EC", "crv": "P-521", "x": "x", "y": "y"}),
+    ],
+)
+async def test_webcrypto_imports_verify_jwks_as_plain_objects(
+    monkeypatch: pytest.MonkeyPatch, alg: str, jwk: dict[str, Any]
+) -> None:
+    subtle, _ = _install_runtime(monkeypatch)
+    _install_js_objects(monkeypatch)
+
+    await WEBCRYPTO.import_verify_key(alg, jwk)
+
+    key_data = subtle.import_calls[0][1]
+    assert isinstance(key_data, _JsObject)
+    assert key_data.entries == jwk
+
+
+@pytest.mark.asyncio
+async def test_webcrypto_imports_eddsa_private_jwk_as_plain_object(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    subtle, _ = _install_runtime(monkeypatch)
+    _install_js_objects(monkeypatch)
+    jwk = {"kty": "OKP", "crv": "Ed25519", "x": "eA", "d": "ZA"}
+
+    await WEBCRYPTO.import_sign_key("EdDSA", jwk)
+
+    key_data = subtle.import_calls[0][1]
+    assert isinstance(key_data, _JsObject)
+    assert key_data.entries == jwk
+
+
+@pytest.mark.asyncio
+async def test_webcrypto_rejects_eddsa_private_jwk_without_x(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    subtle, _ = _install_runtime(monkeypatch)
+
+    with pytest.raises(ValueError, match="d and x"):
+        await WEBCRYPTO.import_sign_key(
+            "EdDSA", {"kty": "OKP", "crv": "Ed25519", "d": "ZA"}
+        )
+    assert subtle.import_calls == []
+
+
+@pytest.mark.asyncio
+async def test_chunked_jwks_response_stops_reading_past_size_limit(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    _install_runtime(monkeypatch)
+    # No Content-Length, as with a chunked response; several times the limit
+    body = json.dumps(
+        {"keys": _RSA_JWKS, "padding": "x" * 4 * jwks.MAX_JWKS_SIZE_BYTES}
+    )
+    chunk_size = 16 * 1024
+    response = _FakeResponse(body, chunk_size=chunk_size)
+
+    async def oversized_fetch(url: str, init: Any = None) -> _FakeResponse:
+        return response
+
+    monkeypatch.setattr(sys.modules["js"], "fetch", oversized_fetch, raising=False)
+
+    with pytest.raises(ValueError, match="size limit"):
+        await jwks._download_jwks(_JWKS_URL, None, 5.0)
+
+    assert response.body is not None
+    reader = response.body.reader
+    assert reader.cancelled
+    assert reader.reads == jwks.MAX_JWKS_SIZE_BYTES // chunk_size + 1
@@ -0,0 +1,212 @@
+"""Tests for HTTP JWKS fetching on the urlopen (non-Workers) path.
+
+These tests run a local HTTP server so the real urllib transport is exercised,
+including conditional requests, the response size cap and the fetch timeout.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from flarelette_jwt import jwks
+from flarelette_jwt.jwks import clear_jwks_cache
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+_KEYS = [{"kid": "k1", "kty": "OKP", "crv": "Ed25519", "x": "abc"}]
+
+
+class _JwksServer:
+    def __init__(self) -> None:
+        self.body = json.dumps({"keys": _KEYS}).encode()
+        self.delay = 0.0
+        self.etag = '"v1"'
+        self.cache_control: str | None = None
+        self.requests: list[dict[str, str]] = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802
+                server.requests.append(dict(self.headers.items()))
+                time.sleep(server.delay)
+                if self.headers.get("If-None-Match") == server.etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("ETag", server.etag)
+                if server.cache_control is not None:
+                    self.send_header("Cache-Control", server.cache_control)
+                self.end_headers()
+                self.wfile.write(server.body)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._httpd.server_port}/jwks.json"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def server(monkeypatch: pytest.MonkeyPatch) -> Iterator[_JwksServer]:
+    # Force the urlopen fallback even if another test module mocked `js`
+    monkeypatch.delitem(sys.modules, "js", raising=False)
+    clear_jwks_cache()
+    srv = _JwksServer()
+    yield srv
+    srv.close()
+    clear_jwks_cache()
+
+
+@pytest.mark.asyncio
+async def test_urlopen_fetch_caches_and_revalidates(server: _JwksServer) -> None:
+    assert await jwks._resolve_jwk_from_url(server.url, "k1") == _KEYS[0]
+    assert await jwks._resolve_jwk_from_url(server.url, "k1") == _KEYS[0]
+    assert len(server.requests) == 1
+    assert server.requests[0]["User-Agent"] == "flarelette-jwt-py"
+
+    jwks._jwks_cache[server.url]["fetched_at"] -= 301
+    assert await jwks._resolve_jwk_from_url(server.url, "k1") == _KEYS[0]
+    assert server.requests[1]["If-None-Match"] == '"v1"'
+
+
+@pytest.mark.asyncio
+async def test_urlopen_fetch_does_not_block_event_loop(server: _JwksServer) -> None:
+    server.delay = 0.3
+    ticks = 0
+
+    async def ticker() -> None:
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.ensure_future(ticker())
+    try:
+        assert await jwks._resolve_jwk_from_url(server.url, "k1") is not None
+    finally:
+        task.cancel()
+
+    assert ticks >= 10
+
+
+@pytest.mark.asyncio
+async def test_urlopen_fetch_enforces_size_limit(server: _JwksServer) -> None:
+    server.body = json.dumps(
+        {"keys": _KEYS, "padding": "x" * jwks.MAX_JWKS_SIZE_BYTES}
+    ).encode()
+
+    with pytest.raises(ValueError, match="size limit"):
+        await jwks._resolve_jwk_from_url(server.url, "k1")
+
+
+@pytest.mark.asyncio
+async def test_urlopen_fetch_times_out(server: _JwksServer) -> None:
+    server.delay = 1.0
+
+    with pytest.raises(ValueError, match="timed out"):
+        await jwks._resolve_jwk_from_url(server.url, "k1", fetch_timeout=0.2)
+
+
+def test_sync_resolution_shares_cache_and_serves_stale(server: _JwksServer) -> None:
+    assert jwks._resolve_jwk_from_url_sync(server.url, "k1") == _KEYS[0]
+    assert jwks._resolve_jwk_from_url_sync(server.url, "k1") == _KEYS[0]
+    assert len(server.requests) == 1
+
+    # Past the TTL with the endpoint down, max_stale keeps the last key set
+    jwks._jwks_cache[server.url]["fetched_at"] -= 301
+    server.close()
+    with pytest.raises(OSError):
+        jwks._resolve_jwk_from_url_sync(server.url, "k1", fetch_timeout=0.5)
+    assert (
+        jwks._resolve_jwk_from_url_sync(
+            server.url, "k1", max_stale=60, fetch_timeout=0.5
+        )
+        == _KEYS[0]
+    )
+
+
+def _rotate(server: _JwksServer, *kids: str) -> None:
+    keys = [{**_KEYS[0], "kid": kid} for kid in kids]
+    server.body = json.dumps({"keys": keys}).encode()
+    server.etag = f'"{"-".join(kids)}"'
+
+
+def _age_entry(url: str, seconds: float) -> None:
+    jwks._jwks_cache[url]["fetched_at"] -= seconds
+
+
+@pytest.mark.asyncio
+async def test_rotated_kid_found_once_refetch_is_allowed(server: _JwksServer) -> None:
+    assert await jwks._resolve_jwk_from_url(server.url, "k1") is not None
+    _rotate(server, "k1", "k2")
+
+    # Within the refetch interval the new kid cannot be looked up yet...
+    assert await jwks._resolve_jwk_from_url(server.url, "k2") is None
+    assert len(server.requests) == 1
+
+    # ...but that miss is not remembered, so the next allowed refetch finds it
+    _age_entry(server.url, jwks.JWKS_REFETCH_INTERVAL)
+    found = await jwks._resolve_jwk_from_url(server.url, "k2")
+    assert found is not None
+    assert found["kid"] == "k2"
+    assert len(server.requests) == 2
+
+    # A kid still missing after a forced refetch is remembered
+    _age_entry(server.url, jwks.JWKS_REFETCH_INTERVAL)
+    assert await jwks._resolve_jwk_from_url(server.url, "k3") is None
+    _age_entry(server.url, jwks.JWKS_REFETCH_INTERVAL)
+    assert await jwks._resolve_jwk_from_url(server.url, "k3") is None
+    assert len(server.requests) == 3
+
+
+def test_sync_rotated_kid_found_once_refetch_is_allowed(server: _JwksServer) -> None:
+    assert jwks._resolve_jwk_from_url_sync(server.url, "k1") is not None
+    _rotate(server, "k1", "k2")
+
+    assert jwks._resolve_jwk_from_url_sync(server.url, "k2") is None
+    _age_entry(server.url, jwks.JWKS_REFETCH_INTERVAL)
+    assert jwks._resolve_jwk_from_url_sync(server.url, "k2") is not None
+    assert len(server.requests) == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("cache_control", "expected_ttl"),
+    [("max-age=86400", 300), ("public, max-age=60", 60), (None, 300)],
+)
+async def test_server_max_age_only_shortens_configured_ttl(
+    server: _JwksServer, cache_control: str | None, expected_ttl: int
+) -> None:
+    server.cache_control = cache_control
+
+    assert await jwks._resolve_jwk_from_url(server.url, "k1") is not None
+    assert jwks._jwks_cache[server.url]["ttl"] == expected_ttl
+
+
+@pytest.mark.parametrize("cache_control", ["no-cache", "no-store", "max-age=0"])
+def test_no_cache_revalidates_every_lookup(
+    server: _JwksServer, cache_control: str
+) -> None:
+    server.cache_control = cache_control
+
+    for _ in range(3):
+        assert jwks._resolve_jwk_from_url_sync(server.url, "k1") == _KEYS[0]
+
+    assert len(server.requests) == 3
+    assert [r.get("If-None-Match") for r in server.requests] == [None, '"v1"', '"v1"']
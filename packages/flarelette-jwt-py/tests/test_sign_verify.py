@@ -233,3 +233,60 @@ class TestConfigurationLogic:
 
         result = env.get_hs_secret_bytes()
         assert len(result) == 64
+
+    def test_env_config_is_reused_while_environment_unchanged(self) -> None:
+        """Compiled config (and decoded secret) should be reused across calls."""
+        import base64
+
+        env = _load_env_module()
+        os.environ["JWT_SECRET"] = (
+            base64.urlsafe_b64encode(b"a" * 64).rstrip(b"=").decode()
+        )
+        os.environ["JWT_ISS"] = "test-issuer"
+
+        first = env.env_config()
+        assert env.env_config() is first
+        assert env.get_hs_secret_bytes() is env.get_hs_secret_bytes()
+
+        # The snapshot is only replaced by an explicit refresh
+        os.environ["JWT_ISS"] = "other-issuer"
+        assert env.env_config() is first
+        second = env.refresh_env_config()
+        assert env.env_config() is second
+        assert second is not first
+        assert env.common()["iss"] == "other-issuer"
+
+    def test_env_config_tracks_indirect_secret_target(self) -> None:
+        """Refreshing should pick up the variable named by JWT_SECRET_NAME."""
+        import base64
+
+        env = _load_env_module()
+        os.environ["JWT_SECRET_NAME"] = "MY_SECRET"
+        os.environ["MY_SECRET"] = base64.urlsafe_b64encode(b"a" * 64).decode()
+
+        assert env.get_hs_secret_bytes() == b"a" * 64
+        os.environ["MY_SECRET"] = base64.urlsafe_b64encode(b"b" * 64).decode()
+        env.refresh_env_config()
+        assert env.get_hs_secret_bytes() == b"b" * 64
+        del os.environ["MY_SECRET"]
+
+    def test_common_returns_copy_of_compiled_config(self) -> None:
+        """Mutating common() output must not leak into later calls."""
+        env = _load_env_module()
+
+        env.common()["iss"] = "mutated"
+        assert env.common()["iss"] == ""
+
+    def test_apply_env_bindings_swaps_compiled_config(self) -> None:
+        """apply_env_bindings should recompile when JWT variables change."""
+        # The package attribute is the env module the adapters were bound to,
+        # even after _load_env_module() replaced the sys.modules entry
+        from flarelette_jwt import adapters, env
+
+        before = env.env_config()
+        adapters.apply_env_bindings({"JWT_ISS": "bound-issuer", "JWT_LEEWAY": "30"})
+
+        after = env.env_config()
+        assert after is not before
+        assert after.common["iss"] == "bound-issuer"
+        assert after.common["leeway"] == 30
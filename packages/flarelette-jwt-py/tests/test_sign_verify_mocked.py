@@ -6,8 +6,11 @@ to test the actual sign/verify logic without requiring Pyodide.
 
 from __future__ import annotations
 
+import asyncio
 import base64
+import json
 import os
+import sys
 from typing import TYPE_CHECKING, cast
 
 import pytest
@@ -23,7 +26,19 @@ from .mock_js import install_js_mock, uninstall_js_mock
 install_js_mock()
 
 # Now we can import the actual modules
-from flarelette_jwt import create_token, sign, verify  # noqa: E402
+from flarelette_jwt import (  # noqa: E402
+    clear_key_cache,
+    create_delegated_tokens_for_audiences,
+    create_token,
+    get_crypto_backend,
+    parse,
+    refresh_env_config,
+    set_crypto_backend,
+    sign,
+    verify,
+)
+from flarelette_jwt.adapters import env_bindings  # noqa: E402
+from flarelette_jwt.backend import NATIVE, WEBCRYPTO  # noqa: E402
 
 
 class TestSignVerifyWithMock:
@@ -50,9 +65,14 @@ class TestSignVerifyWithMock:
             if key in os.environ:
                 del os.environ[key]
 
+        clear_key_cache()
+        refresh_env_config()
+
         yield
 
         # Cleanup
+        clear_key_cache()
+        set_crypto_backend(None)
         for key in list(os.environ.keys()):
             if key.startswith("JWT_"):
                 del os.environ[key]
@@ -170,6 +190,147 @@ class TestSignVerifyWithMock:
             assert verified["sub"] == payload["sub"]
             assert verified["roles"] == payload["roles"]
 
+    @pytest.mark.asyncio
+    async def test_env_bindings_override_os_environ_in_scope(self) -> None:
+        """Bound Worker env values should win over os.environ within the scope."""
+        with env_bindings({"JWT_ISS": "bound-issuer"}):
+            token = await sign(cast("JwtPayload", {"sub": "123"}))
+            verified = await verify(token)
+
+        assert verified is not None
+        assert verified["iss"] == "bound-issuer"
+        assert os.environ["JWT_ISS"] == "test-issuer"
+        # Outside the scope the process environment applies again
+        assert await verify(token) is None
+
+    @pytest.mark.asyncio
+    async def test_env_bindings_are_isolated_between_tasks(self) -> None:
+        """Concurrent requests with different bindings should not interfere."""
+
+        async def handle(issuer: str) -> str | None:
+            with env_bindings({"JWT_ISS": issuer}):
+                token = await sign(cast("JwtPayload", {"sub": issuer}))
+                await asyncio.sleep(0)
+                verified = await verify(token)
+                return verified.get("iss") if verified else None
+
+        results = await asyncio.gather(*(handle(f"issuer-{i}") for i in range(4)))
+
+        assert results == [f"issuer-{i}" for i in range(4)]
+
+    def test_env_config_snapshot_is_not_reread_per_call(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """env_config() reuses snapshots, compiling once per bound mapping."""
+        from flarelette_jwt import env
+
+        reads: list[int] = []
+        original = env._read_env
+
+        def counting_read() -> dict[str, str | None]:
+            reads.append(1)
+            return original()
+
+        monkeypatch.setattr(env, "_read_env", counting_read)
+        unbound = env.env_config()
+        bound = {"JWT_ISS": "bound-issuer"}
+        with env_bindings(bound):
+            first = env.env_config()
+            assert env.env_config() is first
+        with env_bindings(bound):
+            assert env.env_config() is first
+        with env_bindings(dict(bound)):
+            assert env.env_config() is not first
+
+        assert env.env_config() is unbound
+        assert first.common["iss"] == "bound-issuer"
+        assert len(reads) == 2
+
+    def test_backend_selection_follows_runtime(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """WebCrypto is used when `js` is present, the native backend otherwise."""
+        assert get_crypto_backend() is WEBCRYPTO
+
+        monkeypatch.delitem(sys.modules, "js")
+        assert get_crypto_backend() is NATIVE
+
+        set_crypto_backend(WEBCRYPTO)
+        assert get_crypto_backend() is WEBCRYPTO
+
+    @pytest.mark.asyncio
+    async def test_native_backend_round_trip(self) -> None:
+        """HS512 tokens should sign and verify with the native backend."""
+        set_crypto_backend(NATIVE)
+
+        token = await sign(cast("JwtPayload", {"sub": "native"}))
+        verified = await verify(token)
+
+        assert verified is not None
+        assert verified["sub"] == "native"
+        assert await verify(token[:-2] + "AA") is None
+
+    @pytest.mark.asyncio
+    async def test_native_and_webcrypto_signatures_match(self) -> None:
+        """Tokens from one backend should verify with the other."""
+        set_crypto_backend(NATIVE)
+        native_token = await sign(cast("JwtPayload", {"sub": "x", "iat": 1}))
+
+        set_crypto_backend(WEBCRYPTO)
+        webcrypto_token = await sign(cast("JwtPayload", {"sub": "x", "iat": 1}))
+        assert await verify(native_token) is not None
+
+        set_crypto_backend(NATIVE)
+        assert await verify(webcrypto_token) is not None
+
+    @pytest.mark.asyncio
+    async def test_eddsa_sign_uses_webcrypto_with_cached_key(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """EdDSA tokens should be signed via WebCrypto Ed25519 with kid set."""
+        jwk = {"kty": "OKP", "crv": "Ed25519", "x": "eA", "d": "ZA"}
+        monkeypatch.setenv("JWT_PRIVATE_JWK", json.dumps(jwk))
+        monkeypatch.setenv("JWT_KID", "ed-1")
+        refresh_env_config()
+        import_calls: list[str] = []
+        subtle = sys.modules["js"].crypto.subtle
+        original_import = subtle.importKey
+
+        async def counting_import(fmt: str, *args: object) -> object:
+            import_calls.append(fmt)
+            return await original_import(fmt, *args)
+
+        monkeypatch.setattr(subtle, "importKey", counting_import)
+
+        first = await sign(cast("JwtPayload", {"sub": "1"}))
+        await sign(cast("JwtPayload", {"sub": "2"}))
+
+        assert parse(first)["header"] == {"alg": "EdDSA", "typ": "JWT", "kid": "ed-1"}
+        assert base64.urlsafe_b64decode(first.split(".")[2] + "==").startswith(
+            b"mock-ed25519-signature"
+        )
+        assert import_calls == ["jwk"]
+
+    @pytest.mark.asyncio
+    async def test_delegated_tokens_for_audiences(self) -> None:
+        """One delegated token per audience, sharing claims and timestamps."""
+        original = cast("JwtPayload", {"sub": "user", "permissions": ["read"]})
+
+        tokens = await create_delegated_tokens_for_audiences(
+            original, "gateway", ["billing", ["search", "index"]]
+        )
+
+        assert len(tokens) == 2
+        billing = await verify(tokens[0], aud="billing")
+        search = await verify(tokens[1], aud=["search", "index"])
+        assert billing is not None
+        assert search is not None
+        assert billing["act"] == {"sub": "gateway"}
+        assert billing["permissions"] == ["read"]
+        assert {k: v for k, v in billing.items() if k != "aud"} == {
+            k: v for k, v in search.items() if k != "aud"
+        }
+
 
 @pytest.fixture(scope="module", autouse=True)
 def cleanup_js_mock() -> Generator[None, None, None]:
@@ -0,0 +1,136 @@
+"""Tests for the synchronous API on the native (CPython) HS512 backend.
+
+These tests run with the `js` module removed and need no optional
+dependencies; asymmetric algorithms are covered in test_backend.py.
+"""
+
+from __future__ import annotations
+
+import base64
+from typing import Any
+
+import pytest
+from flarelette_jwt import (
+    check_auth_sync,
+    refresh_env_config,
+    sign,
+    sign_sync,
+    verify_sync,
+)
+from flarelette_jwt.backend import NATIVE, get_crypto_backend
+from flarelette_jwt.explicit import (
+    check_auth_with_config_sync,
+    create_hs512_config,
+    sign_with_config_sync,
+    verify_many,
+    verify_with_config,
+    verify_with_config_sync,
+)
+
+pytestmark = pytest.mark.usefixtures("native_runtime")
+
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode("utf-8").rstrip("=")
+
+
+def test_native_backend_selected_without_js() -> None:
+    assert get_crypto_backend() is NATIVE
+
+
+@pytest.fixture
+def hs512_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    for name in ("JWT_PUBLIC_JWK", "JWT_PRIVATE_JWK", "JWT_JWKS_URL"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("JWT_SECRET", _b64url(b"s" * 64))
+    monkeypatch.setenv("JWT_ISS", "issuer")
+    monkeypatch.setenv("JWT_AUD", "aud")
+    refresh_env_config()
+
+
+@pytest.mark.usefixtures("hs512_env")
+def test_sync_sign_verify_round_trip() -> None:
+    token = sign_sync({"sub": "u1", "permissions": ["read"]})
+
+    payload = verify_sync(token)
+    assert payload is not None
+    assert payload["sub"] == "u1"
+    assert verify_sync(token, aud="other") is None
+
+    user = check_auth_sync(token, require_all_permissions=["read"])
+    assert user is not None
+    assert user["sub"] == "u1"
+    assert check_auth_sync(token, require_all_permissions=["write"]) is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("hs512_env")
+async def test_sync_verify_accepts_async_signed_token() -> None:
+    token = await sign({"sub": "u1"})
+
+    assert verify_sync(token) is not None
+
+
+def test_sync_with_config_round_trip() -> None:
+    config = create_hs512_config(b"k" * 64, iss="issuer", aud="aud")
+    token = sign_with_config_sync({"sub": "u1", "roles": ["admin"]}, config)
+
+    assert verify_with_config_sync(token, config) is not None
+    user = check_auth_with_config_sync(token, config, {"require_roles_any": ["admin"]})
+    assert user is not None
+    assert user["sub"] == "u1"
+
+
+@pytest.mark.usefixtures("hs512_env")
+def test_check_auth_sync_prescreen_skips_signature_check(
+    hmac_verifications: list[bytes],
+) -> None:
+    token = sign_sync({"sub": "u1", "permissions": ["read"]})
+    verified = hmac_verifications
+
+    assert (
+        check_auth_sync(token, require_all_permissions=["write"], prescreen=True)
+        is None
+    )
+    assert verified == []
+    assert check_auth_sync(token, require_all_permissions=["read"], prescreen=True)
+    assert len(verified) == 1
+    # Predicates are never pre-screened; they only see verified payloads
+    assert check_auth_sync(token, predicates=[lambda _: False], prescreen=True) is None
+    assert len(verified) == 2
+
+
+@pytest.mark.usefixtures("hs512_env")
+@pytest.mark.parametrize("prescreen", [True, False])
+@pytest.mark.parametrize("permissions", [5, True, [{}], "read"])
+def test_check_auth_sync_rejects_malformed_permissions(
+    permissions: Any, prescreen: bool
+) -> None:
+    token = sign_sync({"sub": "u1", "permissions": permissions})
+
+    assert (
+        check_auth_sync(token, require_all_permissions=["read"], prescreen=prescreen)
+        is None
+    )
+    user = check_auth_sync(token, prescreen=prescreen)
+    assert user is not None
+    assert user["permissions"] == []
+
+
+@pytest.mark.asyncio
+async def test_verify_many_matches_single_verification() -> None:
+    config = create_hs512_config(b"k" * 64, iss="issuer", aud="aud")
+    tokens = [sign_with_config_sync({"sub": f"u{i}"}, config) for i in range(4)]
+    tokens[1] = tokens[1][:-4] + ("AAAA" if not tokens[1].endswith("AAAA") else "BBBB")
+    tokens[2] = sign_with_config_sync({"sub": "u2"}, config, aud="other")
+
+    results = await verify_many(tokens, config)
+
+    assert [r["reason"] for r in results] == [
+        None,
+        "invalid_signature",
+        "invalid_claims",
+        None,
+    ]
+    for token, result in zip(tokens, results, strict=True):
+        assert result["payload"] == await verify_with_config(token, config)
@@ -0,0 +1,47 @@
+"""Tests for precompiled token templates on the native backend."""
+
+from __future__ import annotations
+
+import pytest
+from flarelette_jwt import TokenTemplate
+from flarelette_jwt.explicit import create_hs512_config, verify_with_config_sync
+from flarelette_jwt.util import parse
+
+_CONFIG = create_hs512_config(b"k" * 64, iss="issuer", aud="aud", ttl_seconds=60)
+
+pytestmark = pytest.mark.usefixtures("native_runtime")
+
+
+@pytest.mark.parametrize("fixed_len", range(3))
+def test_minted_tokens_verify_for_any_prefix_length(fixed_len: int) -> None:
+    permissions = ["read" + "!" * fixed_len]
+    template = TokenTemplate(_CONFIG, {"permissions": permissions})
+
+    for sub in ("u1", "user-22"):
+        token = template.mint_sync({"sub": sub})
+        payload = verify_with_config_sync(token, _CONFIG)
+        assert payload is not None
+        assert payload["sub"] == sub
+        assert payload["permissions"] == permissions
+        assert payload["exp"] - payload["iat"] == 60
+
+
+@pytest.mark.asyncio
+async def test_async_mint_matches_sync_claims() -> None:
+    template = TokenTemplate(_CONFIG, {"iat": 1, "roles": ["svc"]}, aud="other")
+
+    token = await template.mint({"sub": "u1"})
+
+    claims = parse(token)["payload"]
+    assert claims["aud"] == "other"
+    assert claims["iat"] != 1
+    assert verify_with_config_sync(token, _CONFIG, aud="other") is not None
+
+
+def test_rejects_claims_fixed_by_template() -> None:
+    template = TokenTemplate(_CONFIG, {"sub": "fixed"})
+
+    with pytest.raises(ValueError, match="sub"):
+        template.mint_sync({"sub": "other"})
+    with pytest.raises(ValueError, match="too short"):
+        TokenTemplate({"alg": "HS512", "secret": b"short"})
@@ -0,0 +1,237 @@
+"""Tests for the opt-in verified-token result cache."""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+import pytest
+from flarelette_jwt import (
+    DelegatedTokenCache,
+    VerifiedTokenCache,
+    check_auth_sync,
+    create_delegated_token,
+    refresh_env_config,
+    sign_sync,
+    verify_sync,
+)
+from flarelette_jwt import token_cache as token_cache_module
+from flarelette_jwt import util as util_module
+from flarelette_jwt.explicit import (
+    create_delegated_token_with_config,
+    create_hs512_config,
+    sign_with_config_sync,
+    verify_with_config,
+)
+
+_CONFIG = create_hs512_config(b"k" * 64, iss="issuer", aud="aud", leeway=10)
+
+pytestmark = pytest.mark.usefixtures("native_runtime")
+
+
+@pytest.mark.asyncio
+async def test_hit_skips_signature_verification(
+    hmac_verifications: list[bytes],
+) -> None:
+    cache = VerifiedTokenCache()
+    token = sign_with_config_sync({"sub": "u1"}, _CONFIG)
+
+    first = await verify_with_config(token, _CONFIG, cache=cache)
+    second = await verify_with_config(token, _CONFIG, cache=cache)
+
+    assert first == second
+    assert first is not None
+    assert len(hmac_verifications) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_hit_rechecks_claims_and_returns_copy() -> None:
+    cache = VerifiedTokenCache()
+    token = sign_with_config_sync({"sub": "u1"}, _CONFIG)
+    payload = await verify_with_config(token, _CONFIG, cache=cache)
+    assert payload is not None
+    payload["sub"] = "mutated"
+
+    assert await verify_with_config(token, _CONFIG, aud="other", cache=cache) is None
+    cached = await verify_with_config(token, _CONFIG, cache=cache)
+    assert cached is not None
+    assert cached["sub"] == "u1"
+
+
+@pytest.mark.asyncio
+async def test_nested_mutation_never_reaches_the_cache() -> None:
+    cache = VerifiedTokenCache()
+    token = sign_with_config_sync(
+        {"sub": "u1", "permissions": ["read"], "act": {"sub": "gateway"}}, _CONFIG
+    )
+    for _ in range(2):
+        payload = await verify_with_config(token, _CONFIG, cache=cache)
+        assert payload is not None
+        assert payload["permissions"] == ["read"]
+        assert payload["act"] == {"sub": "gateway"}
+        payload["permissions"].append("admin")
+        payload["act"]["sub"] = "attacker"
+
+    assert cache.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_entry_never_outlives_exp_plus_leeway(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    cache = VerifiedTokenCache()
+    now = int(time.time())
+    token = sign_with_config_sync({"sub": "u1", "exp": now + 5}, _CONFIG)
+    assert await verify_with_config(token, _CONFIG, cache=cache) is not None
+
+    monkeypatch.setattr(token_cache_module.time, "time", lambda: now + 16)
+
+    assert len(cache) == 1
+    assert await verify_with_config(token, _CONFIG, cache=cache) is None
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_different_key_material_never_shares_entries() -> None:
+    cache = VerifiedTokenCache()
+    token = sign_with_config_sync({"sub": "u1"}, _CONFIG)
+    other = create_hs512_config(b"o" * 64, iss="issuer", aud="aud")
+
+    assert await verify_with_config(token, _CONFIG, cache=cache) is not None
+    assert await verify_with_config(token, other, cache=cache) is None
+
+
+def test_bounded_by_entries_and_bytes() -> None:
+    tokens = [sign_with_config_sync({"sub": f"u{i}"}, _CONFIG) for i in range(3)]
+    payload: Any = {"exp": int(time.time()) + 60}
+
+    by_count = VerifiedTokenCache(max_entries=2)
+    for token in tokens:
+        by_count.put(by_count.key(token, ()), token, payload, 0)
+    assert len(by_count) == 2
+    assert by_count.get(by_count.key(tokens[0], ())) is None
+
+    by_bytes = VerifiedTokenCache(max_bytes=len(tokens[0]) + len(tokens[1]))
+    for token in tokens:
+        by_bytes.put(by_bytes.key(token, ()), token, payload, 0)
+    assert len(by_bytes) == 2
+    assert by_bytes.size_bytes <= by_bytes.max_bytes
+
+
+def test_env_and_check_auth_sync_use_cache(
+    monkeypatch: pytest.MonkeyPatch, hmac_verifications: list[bytes]
+) -> None:
+    for name in ("JWT_PUBLIC_JWK", "JWT_PRIVATE_JWK", "JWT_JWKS_URL"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("JWT_SECRET", "cw" * 43)
+    monkeypatch.setenv("JWT_ISS", "issuer")
+    monkeypatch.setenv("JWT_AUD", "aud")
+    refresh_env_config()
+    cache = VerifiedTokenCache()
+    token = sign_sync({"sub": "u1", "permissions": ["read"]})
+
+    assert verify_sync(token, cache=cache) is not None
+    assert check_auth_sync(token, require_all_permissions=["read"], cache=cache)
+    assert len(hmac_verifications) == 1
+    assert cache.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_replayed_forged_token_is_rejected_from_cache(
+    hmac_verifications: list[bytes],
+) -> None:
+    cache = VerifiedTokenCache()
+    token = sign_with_config_sync({"sub": "u1"}, _CONFIG)
+    forged = token[:-4] + ("AAAA" if not token.endswith("AAAA") else "BBBB")
+
+    for _ in range(3):
+        assert await verify_with_config(forged, _CONFIG, cache=cache) is None
+
+    assert len(hmac_verifications) == 1
+    assert cache.rejection_hits == 2
+    assert await verify_with_config("not-a-token", _CONFIG, cache=cache) is None
+    assert await verify_with_config("not-a-token", _CONFIG, cache=cache) is None
+    assert cache.rejection_hits == 3
+
+
+@pytest.mark.asyncio
+async def test_only_deterministic_rejections_are_remembered(
+    hmac_verifications: list[bytes],
+) -> None:
+    cache = VerifiedTokenCache()
+    expired = sign_with_config_sync(
+        {"sub": "u1", "exp": int(time.time()) - 60}, _CONFIG
+    )
+    valid = sign_with_config_sync({"sub": "u1"}, _CONFIG)
+
+    assert await verify_with_config(expired, _CONFIG, cache=cache) is None
+    assert await verify_with_config(expired, _CONFIG, cache=cache) is None
+    assert cache.rejection_hits == 1
+    # A larger leeway may accept the token, so the verdict does not apply
+    assert await verify_with_config(expired, _CONFIG, leeway=120, cache=cache)
+
+    assert await verify_with_config(valid, _CONFIG, aud="other", cache=cache) is None
+    assert await verify_with_config(valid, _CONFIG, cache=cache) is not None
+    assert cache.rejection_hits == 1
+
+
+@pytest.mark.asyncio
+async def test_rejections_expire_after_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = VerifiedTokenCache(rejection_ttl=5)
+    key = cache.key("bad", ())
+    cache.reject(key, "invalid_signature", 0)
+    assert cache.rejected(key, 0) == "invalid_signature"
+
+    now = time.monotonic()
+    monkeypatch.setattr(token_cache_module.time, "monotonic", lambda: now + 6)
+
+    assert cache.rejected(key, 0) is None
+
+
+@pytest.mark.asyncio
+async def test_delegated_tokens_reused_until_refresh_window(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    cache = DelegatedTokenCache(refresh_window=60)
+    user: Any = {"sub": "u1", "permissions": ["read"]}
+
+    async def mint(payload: Any, aud: str = "svc-a") -> str:
+        return await create_delegated_token_with_config(
+            payload, "gateway", _CONFIG, aud=aud, ttl_seconds=120, cache=cache
+        )
+
+    token = await mint(user)
+    assert await mint(dict(user)) == token
+    assert await mint(user, aud="svc-b") != token
+    assert await mint({**user, "permissions": ["read", "write"]}) != token
+    assert (cache.hits, cache.misses) == (1, 3)
+
+    now = time.time()
+    monkeypatch.setattr(util_module.time, "time", lambda: now + 61)
+    await mint(user)
+    assert cache.misses == 4
+
+
+@pytest.mark.asyncio
+async def test_env_delegated_token_cache_tracks_signing_key(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    for name in ("JWT_PUBLIC_JWK", "JWT_PRIVATE_JWK", "JWT_JWKS_URL"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("JWT_SECRET", "cw" * 43)
+    monkeypatch.setenv("JWT_ISS", "issuer")
+    monkeypatch.setenv("JWT_AUD", "aud")
+    refresh_env_config()
+    cache = DelegatedTokenCache()
+    user: Any = {"sub": "u1", "roles": ["admin"]}
+
+    token = await create_delegated_token(user, "gateway", cache=cache)
+    assert await create_delegated_token(user, "gateway", cache=cache) == token
+    assert await create_delegated_token(user, "other-actor", cache=cache) != token
+
+    monkeypatch.setenv("JWT_SECRET", "dw" * 43)
+    refresh_env_config()
+    rotated = await create_delegated_token(user, "gateway", cache=cache)
+    assert rotated != token
+    assert verify_sync(rotated) is not None
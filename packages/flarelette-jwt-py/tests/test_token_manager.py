@@ -0,0 +1,151 @@
+"""Tests for the outbound service token manager."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+import pytest
+from flarelette_jwt import TokenManager
+from flarelette_jwt import explicit as explicit_module
+from flarelette_jwt import token_manager as token_manager_module
+from flarelette_jwt.explicit import create_hs512_config, verify_with_config_sync
+
+_CONFIG = create_hs512_config(b"k" * 64, iss="issuer", aud="aud", ttl_seconds=120)
+
+pytestmark = pytest.mark.usefixtures("native_runtime")
+
+
+@pytest.fixture
+def minted(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Record the audience of every token the manager mints."""
+    minted: list[str] = []
+    original = token_manager_module.sign_with_config
+
+    async def counting_sign(payload: Any, config: Any, **kwargs: Any) -> str:
+        await asyncio.sleep(0)
+        minted.append(kwargs["aud"])
+        return await original(payload, config, **kwargs)
+
+    monkeypatch.setattr(token_manager_module, "sign_with_config", counting_sign)
+    return minted
+
+
+def _advance(monkeypatch: pytest.MonkeyPatch, seconds: float) -> None:
+    now = time.time() + seconds
+    monkeypatch.setattr(token_manager_module.time, "time", lambda: now)
+    monkeypatch.setattr(explicit_module.time, "time", lambda: now)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_first_calls_share_one_mint(
+    minted: list[str],
+) -> None:
+    manager = TokenManager({"sub": "svc"}, config=_CONFIG)
+
+    tokens = await asyncio.gather(*(manager.get("api") for _ in range(5)))
+
+    assert len(set(tokens)) == 1
+    assert minted == ["api"]
+    assert verify_with_config_sync(tokens[0], _CONFIG, aud="api") is not None
+    assert manager.current("api") == tokens[0]
+    assert manager.current("other") is None
+
+
+@pytest.mark.asyncio
+async def test_expiring_token_is_served_while_refreshing(
+    monkeypatch: pytest.MonkeyPatch, minted: list[str]
+) -> None:
+    manager = TokenManager({"sub": "svc"}, config=_CONFIG, refresh_window=60)
+    first = await manager.get("api")
+
+    _advance(monkeypatch, 70)
+    assert manager.current("api") == first
+    assert manager.current("api") == first
+    await asyncio.sleep(0.01)
+
+    assert minted == ["api", "api"]
+    refreshed = manager.current("api")
+    assert refreshed is not None
+    assert refreshed != first
+
+
+@pytest.mark.asyncio
+async def test_expired_token_is_never_served(
+    monkeypatch: pytest.MonkeyPatch, minted: list[str]
+) -> None:
+    manager = TokenManager(config=_CONFIG)
+    first = await manager.get("api", {"sub": "job-1"})
+
+    _advance(monkeypatch, 121)
+
+    assert manager.current("api", {"sub": "job-1"}) is None
+    assert await manager.get("api", {"sub": "job-1"}) != first
+    assert len(minted) == 2
+
+
+@pytest.mark.asyncio
+async def test_held_tokens_are_bounded_by_max_entries(minted: list[str]) -> None:
+    manager = TokenManager({"sub": "svc"}, config=_CONFIG, max_entries=2)
+
+    await manager.get("a")
+    await manager.get("b")
+    await manager.get("c")
+
+    assert len(manager) == 2
+    assert manager.current("a") is None
+    assert manager.current("c") is not None
+    await manager.get("a")
+    assert minted == ["a", "b", "c", "a"]
+
+
+@pytest.mark.asyncio
+async def test_mints_in_flight_are_shared_beyond_max_entries(
+    minted: list[str],
+) -> None:
+    manager = TokenManager({"sub": "svc"}, config=_CONFIG, max_entries=1)
+
+    tokens = await asyncio.gather(*(manager.get(aud) for aud in "abab"))
+
+    assert sorted(minted) == ["a", "b"]
+    assert tokens[0] == tokens[2]
+    assert tokens[1] == tokens[3]
+
+
+def test_max_entries_must_be_positive() -> None:
+    with pytest.raises(ValueError, match="max_entries"):
+        TokenManager(config=_CONFIG, max_entries=0)
+
+
+@pytest.mark.asyncio
+async def test_clear_voids_mints_in_flight(monkeypatch: pytest.MonkeyPatch) -> None:
+    signed: list[str] = []
+    started = asyncio.Event()
+    release = asyncio.Event()
+    original = token_manager_module.sign_with_config
+
+    async def gated_sign(payload: Any, config: Any, **kwargs: Any) -> str:
+        token = await original(payload, config, **kwargs)
+        signed.append(token)
+        started.set()
+        await release.wait()
+        return token
+
+    monkeypatch.setattr(token_manager_module, "sign_with_config", gated_sign)
+    manager = TokenManager({"sub": "svc"}, config=_CONFIG)
+    pending = asyncio.ensure_future(manager.get("api"))
+    await started.wait()
+
+    # Rotate the key while the first mint is suspended, then clear
+    rotated = create_hs512_config(b"n" * 64, iss="issuer", aud="aud", ttl_seconds=120)
+    manager._config = rotated
+    manager.clear()
+    release.set()
+    token = await pending
+
+    assert len(signed) == 2
+    assert token == signed[1]
+    assert verify_with_config_sync(token, rotated, aud="api") is not None
+    assert verify_with_config_sync(signed[0], rotated, aud="api") is None
+    assert manager.current("api") == token